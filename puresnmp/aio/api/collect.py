@@ -0,0 +1,48 @@
+'''
+Asynchronous version of :py:func:`puresnmp.api.collect.collect`.
+'''
+from __future__ import unicode_literals
+from typing import TYPE_CHECKING
+
+from . import raw
+from ...api.collect import (
+    MAX_VARBINDS,
+    CollectPlan,
+    _bulk_message,
+    _bulk_response,
+    _get_message,
+    _get_response,
+)
+from ...exc import TooBig
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import
+    from ...api.collect import CollectResult, CollectSpec
+
+
+async def collect(ip, community, spec, port=161, timeout=6,
+                  max_varbinds=MAX_VARBINDS):
+    # type: (str, str, CollectSpec, int, int, int) -> CollectResult
+    '''
+    Fetches the values described by *spec* with as few requests as possible
+    and returns a :py:class:`~puresnmp.api.collect.CollectResult`.
+
+    See :py:func:`puresnmp.api.collect.collect` for details.
+    '''
+    plan = CollectPlan(spec, max_varbinds)
+    request = plan.next_round()
+    while request:
+        response = await raw.send(ip, port, _bulk_message(community, request),
+                                  timeout=timeout)
+        try:
+            scalars, repeating = _bulk_response(response, request)
+        except TooBig:
+            plan.too_big()
+        else:
+            plan.feed(request, scalars, repeating)
+        request = plan.next_round()
+    for oids in plan.fallback():
+        response = await raw.send(ip, port, _get_message(community, oids),
+                                  timeout=timeout)
+        plan.feed_fallback(oids, _get_response(response))
+    return plan.result()
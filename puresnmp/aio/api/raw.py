@@ -1,36 +1,62 @@
 from __future__ import unicode_literals
 from collections import OrderedDict
+from ipaddress import ip_address
 from typing import TYPE_CHECKING
+import asyncio
 import logging
 import sys
 
 from ...x690.types import (
-    Integer,
     ObjectIdentifier,
-    OctetString,
-    Sequence,
-    Type,
+    Type,  # NOQA (must be here for type detection)
+)
+from ...x690.util import tablify
+from ...columnar import (
+    ColumnarTable,  # NOQA (must be here for type detection)
+    TableDecoder,
+)
+from ...exc import (
+    FaultySNMPImplementation,
+    NoSuchOID,
+    Timeout,
+    TooBig,
 )
-from ...x690.util import to_bytes, tablify
-from ...exc import SnmpError, NoSuchOID
 from ...pdu import (
     BulkGetRequest,
     GetNextRequest,
     GetRequest,
+    MessageTemplate,  # NOQA (must be here for type detection)
     SetRequest,
     VarBind,
+    encode_message,
+    message_prefix,
 )
-from ...const import Version
 from ..transport import send, get_request_id
+# The encoding and decoding of the messages is shared with the synchronous API
+from ...api.raw import (  # pylint: disable=unused-import
+    _bulkget_oids,
+    _bulkget_response,
+    _multiget_response,
+    _multigetnext_response,
+    _multiset_response,
+    _set_varbinds,
+    compile_get,  # NOQA (part of this API)
+)
+from ..tuning import TUNER
 from ...util import (
     BulkResult,  # NOQA (must be here for type detection)
+    OIDTrie,
     get_unfinished_walk_oids,
     group_varbinds,
+    split_walk_ranges,
+    to_oid,
 )
 
 if TYPE_CHECKING:  # pragma: no cover
     # pylint: disable=unused-import, invalid-name, ungrouped-imports
-    from typing import Any, Callable, Dict, Generator, List, Tuple, Union, Set
+    from typing import (Any, AsyncIterator, Callable, Dict, Generator, List,
+                        Optional, Tuple, Union, Set)
+    from ..tuning import Tuner
 
 try:
     unicode  # type: Callable[[Any], str]
@@ -58,8 +84,9 @@ async def get(ip, community, oid, port=161, timeout=6):
     return (await multiget(ip, community, [oid], port, timeout=timeout))[0]
 
 
-async def multiget(ip, community, oids, port=161, timeout=6):
-    # type: ( str, str, List[str], int, int ) -> List[Type]
+async def multiget(ip, community, oids, port=161, timeout=6,
+                   pythonize=False):
+    # type: ( str, str, List[str], int, int, bool ) -> List[Type]
     """
     A coroutine that executes an SNMP GET request with multiple OIDs and
     returns a list of pure Python objects. The order of the output items is
@@ -69,24 +96,28 @@ async def multiget(ip, community, oids, port=161, timeout=6):
 
         >>> await multiget('192.168.1.1', 'private', ['1.2.3.4', '1.2.3.5'])
         ['non-functional example', 'second value']
-    """
 
-    parsed_oids = [OID(oid) for oid in oids]
+    If *pythonize* is true, the values are decoded directly into pure Python
+    objects (see :py:func:`puresnmp.pdu.decode_python_varbinds`).
+    """
 
-    packet = Sequence(
-        Integer(Version.V2C),
-        OctetString(community),
-        GetRequest(get_request_id(), *parsed_oids)
-    )
+    parsed_oids = [to_oid(oid) for oid in oids]
+    request = GetRequest(get_request_id(), *parsed_oids)
+    packet = encode_message(request, message_prefix(community))
+    response = await send(ip, port, packet, timeout=timeout)
+    return _multiget_response(response, oids, pythonize)
 
-    response = await send(ip, port, to_bytes(packet), timeout=timeout)
-    raw_response = Sequence.from_bytes(response)
 
-    output = [value for _, value in raw_response[2].varbinds]
-    if len(output) != len(oids):
-        raise SnmpError('Unexpected response. Expected %d varbind, '
-                        'but got %d!' % (len(oids), len(output)))
-    return output
+async def multiget_compiled(ip, template, port=161, timeout=6,
+                            pythonize=False):
+    # type: (str, MessageTemplate, int, int, bool) -> List[Type]
+    """
+    Same as :py:func:`~.multiget` but sends a request prepared by
+    :py:func:`~.compile_get`. Only the request-id is filled in.
+    """
+    packet = template.render(get_request_id())
+    response = await send(ip, port, packet, timeout=timeout)
+    return _multiget_response(response, template.oids, pythonize)
 
 
 async def getnext(ip, community, oid, port=161, timeout=6):
@@ -103,8 +134,9 @@ async def getnext(ip, community, oid, port=161, timeout=6):
     return (await multigetnext(ip, community, [oid], port, timeout=timeout))[0]
 
 
-async def multigetnext(ip, community, oids, port=161, timeout=6):
-    # type: (str, str, List[str], int, int) -> List[VarBind]
+async def multigetnext(ip, community, oids, port=161, timeout=6,
+                       pythonize=False):
+    # type: (str, str, List[str], int, int, bool) -> List[VarBind]
     """
     A coroutine that sends a single multi-oid GETNEXT request.
 
@@ -118,26 +150,19 @@ async def multigetnext(ip, community, oids, port=161, timeout=6):
             VarBind(ObjectIdentifier(1, 2, 3, 0), 'non-functional example'),
             VarBind(ObjectIdentifier(1, 2, 4, 0), 'second value')
         ]
+
+    If *pythonize* is true, the values are decoded directly into pure Python
+    objects (see :py:func:`puresnmp.pdu.decode_python_varbinds`).
     """
     request = GetNextRequest(get_request_id(), *oids)
-    packet = Sequence(
-        Integer(Version.V2C),
-        OctetString(community),
-        request
-    )
-    response = await send(ip, port, to_bytes(packet), timeout=timeout)
-    raw_response = Sequence.from_bytes(response)
-    response_object = raw_response[2]
-    if len(response_object.varbinds) != len(oids):
-        raise SnmpError(
-            'Invalid response! Expected exactly %d varbind, '
-            'but got %d' % (len(oids), len(response_object.varbinds)))
-    output = [VarBind(oid, value) for oid, value in response_object.varbinds]
-    return output
-
-
-async def walk(ip, community, oid, port=161, timeout=6):
-    # type: (str, str, str, int, int) -> Generator[VarBind, None, None]
+    packet = encode_message(request, message_prefix(community))
+    response = await send(ip, port, packet, timeout=timeout)
+    return _multigetnext_response(response, oids, pythonize)
+
+
+async def walk(ip, community, oid, port=161, timeout=6,
+               fetcher=multigetnext, read_ahead=0):
+    # type: (str, str, str, int, int, Callable[[str, str, List[str], int, int], List[VarBind]], int) -> Generator[VarBind, None, None]
     """
     Executes a sequence of SNMP GETNEXT requests and returns an async_generator
     over :py:class:`~puresnmp.pdu.VarBind` instances.
@@ -145,6 +170,8 @@ async def walk(ip, community, oid, port=161, timeout=6):
     The generator stops when hitting an OID which is *not* a sub-node of the
     given start OID or at the end of the tree (whichever comes first).
 
+    *fetcher* and *read_ahead* are passed on to :py:func:`~.multiwalk`.
+
     Example::
 
         >>> walk('127.0.0.1', 'private', '1.3.6.1.2.1.1')
@@ -162,14 +189,15 @@ async def walk(ip, community, oid, port=161, timeout=6):
          VarBind(oid=ObjectIdentifier((1, 3, 6, 1, 2, 1, 3, 1, 1, 3, 24, 1, 172, 17, 0, 1)), value=64, b'\\xac\\x11\\x00\\x01')]
     """
 
-    gen = multiwalk(ip, community, [oid], port, timeout=timeout)
+    gen = multiwalk(ip, community, [oid], port, timeout=timeout,
+                    fetcher=fetcher, read_ahead=read_ahead)
     async for varbind in gen:
         yield varbind
 
 
 async def multiwalk(ip, community, oids,
-                    port=161, timeout=6, fetcher=multigetnext):
-    # type: (str, str, List[str], int, int, Callable[[str, str, List[str], int, int], List[VarBind]]) -> Generator[VarBind, None, None]
+                    port=161, timeout=6, fetcher=multigetnext, read_ahead=0):
+    # type: (str, str, List[str], int, int, Callable[[str, str, List[str], int, int], List[VarBind]], int) -> Generator[VarBind, None, None]
     """
     Executes a sequence of SNMP GETNEXT requests and returns an async_generator
     over :py:class:`~puresnmp.pdu.VarBind` instances.
@@ -177,29 +205,57 @@ async def multiwalk(ip, community, oids,
     This is the same as :py:func:`~.walk` except that it is capable of
     iterating over multiple OIDs at the same time.
 
+    By default, the next request is only sent once the consumer has taken
+    all values of the previous response from the generator. With a positive
+    *read_ahead*, the requests are sent from a separate task as soon as the
+    previous response has arrived, so the network round trips overlap with
+    the work of the consumer. Up to *read_ahead* responses are buffered
+    before the task waits for the consumer.
+
     Example::
 
         >>> multiwalk('127.0.0.1', 'private',
         ...           ['1.3.6.1.2.1.1', '1.3.6.1.4.1.1'])
         <async_generator object multiwalk at 0x7fa2f775cf68>
     """
+    batches = _walk_batches(ip, community, oids, port, timeout, fetcher)
+    if read_ahead > 0:
+        batches = _read_ahead(batches, read_ahead)
+    try:
+        async for batch in batches:
+            for varbind in batch:
+                yield varbind
+    finally:
+        # Stops the producer task right away if the consumer ends early.
+        await batches.aclose()
+
+
+async def _walk_batches(ip, community, oids, port, timeout, fetcher):
+    # type: (str, str, List[str], int, int, Callable[[str, str, List[str], int, int], List[VarBind]]) -> Generator[List[VarBind], None, None]
+    """
+    Executes the requests of :py:func:`~.multiwalk` and generates the new
+    varbinds of each response as one list.
+    """
     LOG.debug('Walking on %d OIDs using %s', len(oids), fetcher.__name__)
 
     varbinds = await fetcher(ip, community, oids, port, timeout)
-    requested_oids = [OID(oid) for oid in oids]
+    requested_oids = [to_oid(oid) for oid in oids]
+    requested_index = OIDTrie(requested_oids)
     grouped_oids = group_varbinds(varbinds, requested_oids)
     unfinished_oids = get_unfinished_walk_oids(grouped_oids)
     LOG.debug('%d of %d OIDs need to be continued',
               len(unfinished_oids),
               len(oids))
     yielded = _set([])  # type: ignore
-    for var in group_varbinds(varbinds, requested_oids).values():
+    batch = []
+    for var in sorted(grouped_oids.values()):
         for varbind in var:
-            containment = [varbind.oid in _ for _ in requested_oids]
-            if not any(containment) or varbind.oid in yielded:  # type: ignore
+            if (not requested_index.prefixes(varbind.oid) or
+                    varbind.oid in yielded):  # type: ignore
                 continue
             yielded.add(varbind.oid)  # type: ignore
-            yield varbind
+            batch.append(varbind)
+    yield batch
 
     # As long as we have unfinished OIDs, we need to continue the walk for
     # those.
@@ -207,7 +263,7 @@ async def multiwalk(ip, community, oids,
         next_fetches = [_[1].value.oid for _ in unfinished_oids]
         try:
             varbinds = await fetcher(ip, community,
-                                     [unicode(_) for _ in next_fetches],
+                                     next_fetches,
                                      port,
                                      timeout)
         except NoSuchOID:
@@ -220,13 +276,50 @@ async def multiwalk(ip, community, oids,
         LOG.debug('%d of %d OIDs need to be continued',
                   len(unfinished_oids),
                   len(oids))
-        for var in group_varbinds(varbinds, next_fetches).values():
+        batch = []
+        for var in sorted(grouped_oids.values()):
             for varbind in var:
-                containment = [varbind.oid in _ for _ in requested_oids]
-                if not any(containment) or varbind.oid in yielded:  # type: ignore
+                if (not requested_index.prefixes(varbind.oid) or
+                        varbind.oid in yielded):  # type: ignore
                     continue
                 yielded.add(varbind.oid)  # type: ignore
-                yield varbind
+                batch.append(varbind)
+        yield batch
+
+
+async def _read_ahead(batches, size):
+    # type: (AsyncIterator[List[VarBind]], int) -> Generator[List[VarBind], None, None]
+    """
+    Takes the items of *batches* in a separate task and generates them. At
+    most *size* items are taken ahead of the consumer. Exceptions raised by
+    *batches* are re-raised in the consumer.
+    """
+    buffer = asyncio.Queue(size)  # type: asyncio.Queue
+
+    async def produce():
+        # type: () -> None
+        try:
+            async for batch in batches:
+                await buffer.put((batch, None))
+        except Exception as exc:  # pylint: disable=broad-except
+            await buffer.put((None, exc))
+        else:
+            await buffer.put((None, None))
+        finally:
+            await batches.aclose()
+
+    task = asyncio.ensure_future(produce())
+    try:
+        while True:
+            batch, exc = await buffer.get()
+            if exc is not None:
+                raise exc
+            if batch is None:
+                return
+            yield batch
+    finally:
+        task.cancel()
+        await asyncio.wait([task])
 
 
 async def set(ip, community, oid, value, port=161, timeout=6):  # pylint: disable=redefined-builtin
@@ -263,27 +356,33 @@ async def multiset(ip, community, mappings, port=161, timeout=6):
         {'1.2.3': b'foo', '2.3.4': b'bar'}
     """
 
-    if any([not isinstance(v, Type) for k, v in mappings]):
-        raise TypeError('SNMP requires typing information. The value for a '
-                        '"set" request must be an instance of "Type"!')
+    request = SetRequest(get_request_id(), _set_varbinds(mappings))
+    packet = encode_message(request, message_prefix(community))
+    response = await send(ip, port, packet, timeout=timeout)
+    return _multiset_response(response, mappings)
 
-    binds = [VarBind(OID(k), v)
-             for k, v in mappings]
 
-    request = SetRequest(get_request_id(), binds)
-    packet = Sequence(Integer(Version.V2C),
-                      OctetString(community),
-                      request)
-    response = await send(ip, port, to_bytes(packet), timeout=timeout)
-    raw_response = Sequence.from_bytes(response)
-    output = {
-        unicode(oid): value
-        for oid, value in raw_response[2].varbinds
-    }
-    if len(output) != len(mappings):
-        raise SnmpError('Unexpected response. Expected %d varbinds, '
-                        'but got %d!' % (len(mappings), len(output)))
-    return output
+async def _bulkget_varbinds(ip, community, scalar_oids, repeating_oids,
+                            max_list_size, port, timeout, pythonize=False):
+    # type: (str, str, List[Union[str, ObjectIdentifier]], List[Union[str, ObjectIdentifier]], int, int, int) -> Tuple[List[VarBind], List[VarBind]]
+    """
+    Executes a GetBulk request and returns the scalar and repeating varbinds
+    as two lists of :py:class:`~puresnmp.pdu.VarBind` instances (without
+    converting the OIDs to strings).
+
+    If *pythonize* is true, the values are decoded directly into pure Python
+    objects (see :py:func:`puresnmp.pdu.decode_python_varbinds`).
+
+    See :py:func:`~.bulkget` for details about the arguments.
+    """
+
+    non_repeaters, oids = _bulkget_oids(scalar_oids, repeating_oids)
+    request = BulkGetRequest(get_request_id(), non_repeaters, max_list_size,
+                             *oids)
+    packet = encode_message(request, message_prefix(community))
+    response = await send(ip, port, packet, timeout=timeout)
+    return _bulkget_response(response, non_repeaters, max_list_size, oids,
+                             pythonize)
 
 
 async def bulkget(ip, community, scalar_oids, repeating_oids, max_list_size=1,
@@ -352,40 +451,9 @@ async def bulkget(ip, community, scalar_oids, repeating_oids, max_list_size=1,
                 ('1.3.6.1.2.1.5.10.0', b'\x00')]))
     """
 
-    scalar_oids = scalar_oids or []  # protect against empty values
-    repeating_oids = repeating_oids or []  # protect against empty values
-
-    oids = [
-        OID(oid) for oid in scalar_oids
-    ] + [
-        OID(oid) for oid in repeating_oids
-    ]
-
-    non_repeaters = len(scalar_oids)
-
-    packet = Sequence(
-        Integer(Version.V2C),
-        OctetString(community),
-        BulkGetRequest(get_request_id(), non_repeaters, max_list_size, *oids)
-    )
-
-    response = await send(ip, port, to_bytes(packet), timeout=timeout)
-    raw_response = Sequence.from_bytes(response)
-
-    # See RFC=3416 for details of the following calculation
-    n = min(non_repeaters, len(oids))
-    m = max_list_size
-    r = max(len(oids) - n, 0)  # pylint: disable=invalid-name
-    expected_max_varbinds = n + (m * r)
-
-    if len(raw_response[2].varbinds) > expected_max_varbinds:
-        raise SnmpError('Unexpected response. Expected no more than %d '
-                        'varbinds, but got %d!' % (
-                            expected_max_varbinds, len(oids)))
-
-    # cut off the scalar OIDs from the listing(s)
-    scalar_tmp = raw_response[2].varbinds[0:len(scalar_oids)]
-    repeating_tmp = raw_response[2].varbinds[len(scalar_oids):]
+    scalar_tmp, repeating_tmp = await _bulkget_varbinds(
+        ip, community, scalar_oids, repeating_oids, max_list_size,
+        port, timeout)
 
     # prepare output for scalar OIDs
     scalar_out = {
@@ -401,7 +469,7 @@ async def bulkget(ip, community, scalar_oids, repeating_oids, max_list_size=1,
     return BulkResult(scalar_out, repeating_out)
 
 
-def _bulkwalk_fetcher(bulk_size=10):
+def _bulkwalk_fetcher(bulk_size=10, pythonize=False):
     # type: (int) -> Callable[[str, str, List[str], int, int], List[VarBind]]
     """
     Create a bulk fetcher coroutine with a fixed limit on "repeatable" OIDs.
@@ -410,11 +478,10 @@ def _bulkwalk_fetcher(bulk_size=10):
         '''
         Executes a SNMP BulkGet request.
         '''
-        result = await bulkget(ip, community, [], oids,
-                               max_list_size=bulk_size,
-                               port=port, timeout=timeout)
-        return [VarBind(OID(k), v)
-                for k, v in result.listing.items()]
+        _, repeating = await _bulkget_varbinds(ip, community, [], oids,
+                                               bulk_size, port, timeout,
+                                               pythonize)
+        return repeating
     if sys.version_info < (3, 0):
         fetcher.__name__ = str('_bulkwalk_fetcher(%d)' % bulk_size)
     else:
@@ -422,8 +489,9 @@ def _bulkwalk_fetcher(bulk_size=10):
     return fetcher
 
 
-async def bulkwalk(ip, community, oids, bulk_size=10, port=161):
-    # type: (str, str, List[str], int, int) -> Generator[VarBind, None, None]
+async def bulkwalk(ip, community, oids, bulk_size=10, port=161,
+                   read_ahead=0):
+    # type: (str, str, List[str], int, int, int) -> Generator[VarBind, None, None]
     """
     More efficient implementation of :py:func:`~.walk`. It uses
     :py:func:`~.bulkget` under the hood instead of :py:func:`~.getnext`.
@@ -437,6 +505,8 @@ async def bulkwalk(ip, community, oids, bulk_size=10, port=161):
     :param bulk_size: How many varbinds to request from the remote host with
         one request.
     :param port: The TCP port of the remote host.
+    :param read_ahead: The number of responses to fetch ahead of the
+        consumer (see :py:func:`~.multiwalk`).
 
     Example::
 
@@ -463,11 +533,164 @@ async def bulkwalk(ip, community, oids, bulk_size=10, port=161):
         raise TypeError('OIDS need to be passed as list!')
 
     result = multiwalk(ip, community, oids, port=port,
-                       fetcher=_bulkwalk_fetcher(bulk_size))
+                       fetcher=_bulkwalk_fetcher(bulk_size),
+                       read_ahead=read_ahead)
     async for oid, value in result:
         yield VarBind(oid, value)
 
 
+def _adaptive_bulkwalk_fetcher(tuner):
+    # type: (Tuner) -> Callable[[str, str, List[str], int, int], List[VarBind]]
+    """
+    Create a bulk fetcher coroutine which takes the bulk size and the number
+    of concurrent requests from *tuner* and reports the outcome of each
+    request back to it.
+    """
+    async def fetcher(ip, community, oids, port=161, timeout=6):
+        '''
+        Executes a SNMP BulkGet request. Requests failing with ``tooBig`` are
+        repeated with a smaller bulk size.
+        '''
+        agent = (str(ip_address(ip)), port)
+        loop = asyncio.get_event_loop()
+        while True:
+            bulk_size = tuner.bulk_size(agent)
+            async with tuner.slot(agent):
+                start = loop.time()
+                try:
+                    _, repeating = await _bulkget_varbinds(
+                        ip, community, [], oids, bulk_size, port, timeout)
+                except TooBig:
+                    tuner.too_big(agent)
+                    if bulk_size <= tuner.min_bulk_size:
+                        raise
+                    LOG.debug('Response of %s:%s for bulk size %d was too '
+                              'big. Retrying with %d', ip, port, bulk_size,
+                              tuner.bulk_size(agent))
+                    continue
+                except Timeout:
+                    tuner.timeout(agent)
+                    raise
+            tuner.success(agent, loop.time() - start)
+            return repeating
+    fetcher.__name__ = '_adaptive_bulkwalk_fetcher'
+    return fetcher
+
+
+async def adaptive_bulkwalk(ip, community, oids, port=161, timeout=6,
+                            tuner=None):
+    # type: (str, str, List[str], int, int, Optional[Tuner]) -> Generator[VarBind, None, None]
+    """
+    Same as :py:func:`~.bulkwalk` but the bulk size and the number of
+    concurrent requests to the device are tuned automatically (see
+    :py:mod:`puresnmp.aio.tuning`). What is learned about a device is kept
+    in *tuner* (by default the process-wide
+    :py:data:`puresnmp.aio.tuning.TUNER`) and used by all following walks.
+
+    Example::
+
+        >>> async for row in adaptive_bulkwalk(ip, community, oids):
+        ...     print(row)
+    """
+    if not isinstance(oids, list):
+        raise TypeError('OIDS need to be passed as list!')
+
+    result = multiwalk(ip, community, oids, port=port, timeout=timeout,
+                       fetcher=_adaptive_bulkwalk_fetcher(tuner or TUNER))
+    async for oid, value in result:
+        yield VarBind(oid, value)
+
+
+async def _walk_range(ip, community, root, start, stop, port, timeout,
+                      fetcher):
+    # type: (str, str, ObjectIdentifier, ObjectIdentifier, Optional[ObjectIdentifier], int, int, Callable[[str, str, List[str], int, int], List[VarBind]]) -> List[VarBind]
+    """
+    Walks one piece returned by
+    :py:func:`~puresnmp.util.split_walk_ranges`.
+    """
+    output = []  # type: List[VarBind]
+    previous = start
+    while True:
+        try:
+            varbinds = await fetcher(ip, community, [previous], port, timeout)
+        except NoSuchOID:
+            # Reached end of OID tree
+            return output
+        if not varbinds:
+            return output
+        for varbind in varbinds:
+            if varbind.oid not in root or (stop is not None and
+                                           stop < varbind.oid):
+                return output
+            if not previous < varbind.oid:
+                raise FaultySNMPImplementation(
+                    'The OID %s is not a successor of %s!' %
+                    (unicode(varbind.oid), unicode(previous)))
+            output.append(varbind)
+            previous = varbind.oid
+
+
+async def parallel_walk(ip, community, oids, port=161, timeout=6,
+                        bulk_size=10, split_points=None, max_workers=4,
+                        fetcher=None):
+    # type: (str, str, List[str], int, int, int, Optional[List[str]], int, Optional[Callable[[str, str, List[str], int, int], List[VarBind]]]) -> Generator[VarBind, None, None]
+    """
+    Walks the trees below *oids* (f.ex. the columns of a large table) with
+    up to *max_workers* concurrent chains of requests instead of one.
+
+    Each OID is walked separately. With *split_points*, each tree is
+    additionally split into ranges which are walked concurrently. The split
+    points are OIDs relative to the walked OIDs. They should divide the rows
+    into similarly sized parts. For tables indexed by MAC or IP addresses,
+    the first index node is a good candidate::
+
+        >>> fdb = parallel_walk(ip, community, ['1.3.6.1.2.1.17.4.3.1.2'],
+        ...                     split_points=['64', '128', '192'])
+        >>> async for row in fdb:
+        ...     print(row)
+
+    The requests use GETBULK with *bulk_size* repetitions unless another
+    *fetcher* is given (see :py:func:`~.multiwalk`).
+
+    Unlike :py:func:`~.multiwalk`, the result is ordered by walked OID (and
+    not by row). It contains every OID once.
+    """
+    # pylint: disable=too-many-arguments
+    if not isinstance(oids, list):
+        raise TypeError('OIDS need to be passed as list!')
+    fetcher = fetcher or _bulkwalk_fetcher(bulk_size)
+    ranges = split_walk_ranges(oids, split_points)
+    LOG.debug('Walking on %d OIDs in %d pieces using %s', len(oids),
+              len(ranges), fetcher.__name__)
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def walk_piece(root, start, stop):
+        # type: (ObjectIdentifier, ObjectIdentifier, Optional[ObjectIdentifier]) -> List[VarBind]
+        async with semaphore:
+            return await _walk_range(ip, community, root, start, stop, port,
+                                     timeout, fetcher)
+
+    pieces = [asyncio.ensure_future(walk_piece(root, start, stop))
+              for root, start, stop in ranges]
+    yielded = _set([])  # type: ignore
+    try:
+        for piece in pieces:
+            for varbind in await piece:
+                if varbind.oid in yielded:  # type: ignore
+                    continue
+                yielded.add(varbind.oid)  # type: ignore
+                yield varbind
+    finally:
+        for piece in pieces:
+            piece.cancel()
+        if pieces:
+            await asyncio.wait(pieces)
+        for piece in pieces:
+            if not piece.cancelled():
+                # Avoid "exception was never retrieved" warnings
+                piece.exception()
+
+
 async def table(ip, community, oid, port=161, num_base_nodes=0):
     # type (str, str, str, int, int) ->
     """
@@ -485,3 +708,36 @@ async def table(ip, community, oid, port=161, num_base_nodes=0):
         tmp.append(varbind)
     as_table = tablify(tmp, num_base_nodes=num_base_nodes)
     return as_table
+
+
+async def columnar_table(ip, community, oid, bulk_size=10, port=161, timeout=6,
+                         num_base_nodes=0, use_numpy=True):
+    # type: (str, str, str, int, int, int, int, bool) -> ColumnarTable
+    """
+    A coroutine that walks over a table using "bulk" requests and returns it
+    as :py:class:`~puresnmp.columnar.ColumnarTable`.
+
+    Contrary to :py:func:`~.table`, each numeric column is decoded straight
+    from the responses into one :py:class:`array.array` (or NumPy array if
+    NumPy is installed and *use_numpy* is true). No object is created per
+    cell. See :py:class:`~puresnmp.columnar.TableDecoder` for details about
+    the structure of the result and about *num_base_nodes*.
+
+    Example::
+
+        >>> result = await columnar_table('127.0.0.1', 'private',
+        ...                         '1.3.6.1.2.1.31.1.1.1')
+        >>> result.index
+        array('Q', [1, 2, 3])
+        >>> result.columns[6]  # ifHCInOctets
+        array('Q', [82746, 1219283, 0])
+    """
+    decoder = TableDecoder(to_oid(oid), num_base_nodes)
+    next_oid = to_oid(oid)
+    prefix = message_prefix(community)
+    while next_oid is not None:
+        request = BulkGetRequest(get_request_id(), 0, bulk_size, next_oid)
+        packet = encode_message(request, prefix)
+        response = await send(ip, port, packet, timeout=timeout)
+        next_oid = decoder.feed(response)
+    return decoder.result(use_numpy)
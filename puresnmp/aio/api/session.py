@@ -0,0 +1,262 @@
+'''
+asyncio SNMP sessions bound to one remote agent.
+
+This is the asyncio equivalent of :py:mod:`puresnmp.api.session`. The
+methods of :py:class:`~.Session` are coroutines (or async generators for the
+walk operations) with the same names and return values as the functions in
+:py:mod:`puresnmp.aio.api.raw`.
+
+Example::
+
+    >>> async with Session('192.168.1.1', 'private') as session:
+    ...     await session.get('1.3.6.1.2.1.1.2.0')
+    ...     async for varbind in session.walk('1.3.6.1.2.1.2.2.1.2'):
+    ...         print(varbind)
+'''
+from __future__ import unicode_literals
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from . import raw
+from ...columnar import (
+    ColumnarTable,  # NOQA (must be here for type detection)
+    TableDecoder,
+)
+from ...const import Version
+from ...pdu import (
+    BulkGetRequest,
+    GetNextRequest,
+    GetRequest,
+    SetRequest,
+    VarBind,
+    encode_message,
+    message_prefix,
+)
+from ..transport import Transport, get_request_id
+from ...util import BulkResult, to_oid
+from ...x690.util import tablify
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import, invalid-name, ungrouped-imports
+    from typing import (Any, Callable, Dict, Generator, List, Optional,
+                        Tuple, Union)
+    from ...x690.types import ObjectIdentifier, Type
+
+try:
+    unicode  # type: Callable[[Any], str]
+except NameError:
+    # pylint: disable=invalid-name
+    unicode = str  # type: Callable[[Any], str]
+
+
+class Session(object):
+    '''
+    An asyncio session with the SNMP agent at *ip:port* using *community*.
+
+    *timeout* is the default timeout (in seconds) for each request. It can be
+    overridden on each method call.
+
+    By default, the session opens its own
+    :py:class:`~puresnmp.aio.transport.Transport` which is closed by
+    :py:meth:`~.close`. A transport passed in as *transport* can be shared by
+    multiple sessions and is not closed by the session.
+    '''
+
+    def __init__(self, ip, community, port=161, version=Version.V2C,
+                 timeout=6, transport=None):
+        # type: (str, str, int, int, int, Optional[Transport]) -> None
+        self.ip = ip
+        self.community = community
+        self.port = port
+        self.version = version
+        self.timeout = timeout
+        self._prefix = message_prefix(community, version)
+        self._owns_transport = transport is None
+        self._transport = transport or Transport()
+
+    def __repr__(self):
+        return '%s(%r, %r, port=%r, version=%r)' % (
+            self.__class__.__name__, self.ip, self.community, self.port,
+            self.version)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        # type: () -> None
+        '''
+        Closes the transport of this session (unless it is shared).
+        '''
+        if self._owns_transport:
+            self._transport.close()
+
+    async def _request(self, pdu, timeout):
+        # type: (Type, Optional[int]) -> bytes
+        '''
+        Sends *pdu* to the agent and returns the raw response message.
+        '''
+        packet = encode_message(pdu, self._prefix)
+        if timeout is None:
+            timeout = self.timeout
+        return await self._transport.send(self.ip, self.port, packet,
+                                          timeout=timeout)
+
+    def _fetcher(self, fetch):
+        # type: (Callable[[List[Any], Optional[int]], Any]) -> Callable[[str, str, List[Any], int, int], Any]
+        '''
+        Wraps the coroutine method *fetch* into a "fetcher" as used by
+        :py:func:`puresnmp.aio.api.raw.multiwalk`.
+        '''
+        async def fetcher(ip, community, oids, port, timeout):
+            # pylint: disable=unused-argument
+            return await fetch(oids, timeout)
+        fetcher.__name__ = str(fetch.__name__)
+        return fetcher
+
+    async def get(self, oid, timeout=None):
+        # type: (str, Optional[int]) -> Type
+        '''
+        See :py:func:`puresnmp.aio.api.raw.get`.
+        '''
+        return (await self.multiget([oid], timeout=timeout))[0]
+
+    async def multiget(self, oids, timeout=None, pythonize=False):
+        # type: (List[str], Optional[int], bool) -> List[Type]
+        '''
+        See :py:func:`puresnmp.aio.api.raw.multiget`.
+        '''
+        parsed_oids = [to_oid(oid) for oid in oids]
+        request = GetRequest(get_request_id(), *parsed_oids)
+        response = await self._request(request, timeout)
+        # pylint: disable=protected-access
+        return raw._multiget_response(response, oids, pythonize)
+
+    async def getnext(self, oid, timeout=None):
+        # type: (str, Optional[int]) -> VarBind
+        '''
+        See :py:func:`puresnmp.aio.api.raw.getnext`.
+        '''
+        return (await self.multigetnext([oid], timeout=timeout))[0]
+
+    async def multigetnext(self, oids, timeout=None, pythonize=False):
+        # type: (List[str], Optional[int], bool) -> List[VarBind]
+        '''
+        See :py:func:`puresnmp.aio.api.raw.multigetnext`.
+        '''
+        request = GetNextRequest(get_request_id(), *oids)
+        response = await self._request(request, timeout)
+        # pylint: disable=protected-access
+        return raw._multigetnext_response(response, oids, pythonize)
+
+    def walk(self, oid, timeout=None):
+        # type: (str, Optional[int]) -> Generator[VarBind, None, None]
+        '''
+        See :py:func:`puresnmp.aio.api.raw.walk`.
+        '''
+        return self.multiwalk([oid], timeout=timeout)
+
+    def multiwalk(self, oids, timeout=None):
+        # type: (List[str], Optional[int]) -> Generator[VarBind, None, None]
+        '''
+        See :py:func:`puresnmp.aio.api.raw.multiwalk`.
+        '''
+        return raw.multiwalk(self.ip, self.community, oids, self.port,
+                             timeout=timeout,
+                             fetcher=self._fetcher(self.multigetnext))
+
+    async def set(self, oid, value, timeout=None):
+        # type: (str, Type, Optional[int]) -> Type
+        '''
+        See :py:func:`puresnmp.aio.api.raw.set`.
+        '''
+        return (await self.multiset([(oid, value)], timeout=timeout))[oid]
+
+    async def multiset(self, mappings, timeout=None):
+        # type: (List[Tuple[str, Type]], Optional[int]) -> Dict[str, Type]
+        '''
+        See :py:func:`puresnmp.aio.api.raw.multiset`.
+        '''
+        # pylint: disable=protected-access
+        request = SetRequest(get_request_id(), raw._set_varbinds(mappings))
+        response = await self._request(request, timeout)
+        return raw._multiset_response(response, mappings)
+
+    async def _bulkget_varbinds(self, scalar_oids, repeating_oids,
+                                max_list_size, timeout=None,
+                                pythonize=False):
+        # type: (List[Union[str, ObjectIdentifier]], List[Union[str, ObjectIdentifier]], int, Optional[int], bool) -> Tuple[List[VarBind], List[VarBind]]
+        '''
+        Executes a GetBulk request and returns the scalar and repeating
+        varbinds.
+        '''
+        # pylint: disable=protected-access
+        non_repeaters, oids = raw._bulkget_oids(scalar_oids, repeating_oids)
+        request = BulkGetRequest(get_request_id(), non_repeaters,
+                                 max_list_size, *oids)
+        response = await self._request(request, timeout)
+        return raw._bulkget_response(response, non_repeaters, max_list_size,
+                                     oids, pythonize)
+
+    async def bulkget(self, scalar_oids, repeating_oids, max_list_size=1,
+                      timeout=None):
+        # type: (List[str], List[str], int, Optional[int]) -> BulkResult
+        '''
+        See :py:func:`puresnmp.aio.api.raw.bulkget`.
+        '''
+        scalar_tmp, repeating_tmp = await self._bulkget_varbinds(
+            scalar_oids, repeating_oids, max_list_size, timeout)
+        scalar_out = {
+            unicode(oid): value
+            for oid, value in scalar_tmp
+        }
+        repeating_out = OrderedDict()  # type: Dict[str, Type]
+        for oid, value in repeating_tmp:
+            repeating_out[unicode(oid)] = value
+        return BulkResult(scalar_out, repeating_out)
+
+    async def bulkwalk(self, oids, bulk_size=10, timeout=None):
+        # type: (List[str], int, Optional[int]) -> Generator[VarBind, None, None]
+        '''
+        See :py:func:`puresnmp.aio.api.raw.bulkwalk`.
+        '''
+        if not isinstance(oids, list):
+            raise TypeError('OIDS need to be passed as list!')
+
+        async def bulkwalk_fetcher(oids, timeout):
+            # type: (List[Any], Optional[int]) -> List[VarBind]
+            _, repeating = await self._bulkget_varbinds([], oids, bulk_size,
+                                                        timeout)
+            return repeating
+        bulkwalk_fetcher.__name__ = str('bulkwalk_fetcher(%d)' % bulk_size)
+
+        result = raw.multiwalk(self.ip, self.community, oids, self.port,
+                               timeout=timeout,
+                               fetcher=self._fetcher(bulkwalk_fetcher))
+        async for oid, value in result:
+            yield VarBind(oid, value)
+
+    async def table(self, oid, num_base_nodes=0, timeout=None):
+        # type: (str, int, Optional[int]) -> List[Dict[str, Any]]
+        '''
+        See :py:func:`puresnmp.aio.api.raw.table`.
+        '''
+        tmp = []
+        async for varbind in self.walk(oid, timeout=timeout):
+            tmp.append(varbind)
+        return tablify(tmp, num_base_nodes=num_base_nodes)
+
+    async def columnar_table(self, oid, bulk_size=10, num_base_nodes=0,
+                             use_numpy=True, timeout=None):
+        # type: (str, int, int, bool, Optional[int]) -> ColumnarTable
+        '''
+        See :py:func:`puresnmp.aio.api.raw.columnar_table`.
+        '''
+        decoder = TableDecoder(to_oid(oid), num_base_nodes)
+        next_oid = to_oid(oid)
+        while next_oid is not None:
+            request = BulkGetRequest(get_request_id(), 0, bulk_size, next_oid)
+            next_oid = decoder.feed(await self._request(request, timeout))
+        return decoder.result(use_numpy)
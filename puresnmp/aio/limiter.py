@@ -0,0 +1,218 @@
+"""
+Limits for the number and rate of requests sent by the asyncio transport.
+
+Without limits, nothing prevents an application from starting hundreds of
+concurrent walks against one agent. The control plane of many network
+devices cannot keep up with that. It drops requests, which causes timeouts
+and retransmissions, and the effective throughput goes down. A
+:py:class:`~.Limiter` caps the number of requests in flight and the number of
+packets sent per second, both per agent and for all agents together.
+
+All requests of :py:mod:`puresnmp.aio.api.raw`,
+:py:mod:`puresnmp.aio.api.pythonic` and the sessions go through
+:py:meth:`puresnmp.aio.transport.Transport.send`, which applies the limiter
+of the transport. By default, nothing is limited. To limit the shared
+transport of the current event loop::
+
+    >>> from puresnmp.aio.transport import get_transport
+    >>> get_transport().limiter = Limiter(
+    ...     max_in_flight=200, agent_max_in_flight=4, agent_rate=50)
+"""
+
+import asyncio
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import
+    from typing import Dict, Hashable, List, Optional
+
+
+class TokenBucket(object):
+    """
+    Paces events to *rate* per second on average while allowing bursts of up
+    to *burst* events (by default one second worth of events).
+
+    Waiting callers are served in the order in which they called
+    :py:meth:`~.acquire`.
+    """
+
+    def __init__(self, rate, burst=None):
+        # type: (float, Optional[float]) -> None
+        self.rate = rate
+        self.capacity = burst or max(rate, 1)
+        self.tokens = self.capacity
+        self._updated = None  # type: Optional[float]
+
+    def __repr__(self):
+        return '<%s rate=%r capacity=%r tokens=%r>' % (
+            self.__class__.__name__, self.rate, self.capacity, self.tokens)
+
+    def _refill(self, now):
+        # type: (float) -> None
+        if self._updated is not None:
+            self.tokens = min(
+                self.tokens + (now - self._updated) * self.rate,
+                self.capacity)
+        self._updated = now
+
+    def reserve(self):
+        # type: () -> float
+        """
+        Takes one token from the bucket and returns the time (in seconds)
+        until it is available.
+
+        The token is reserved immediately (the number of tokens may become
+        negative) so later callers wait behind earlier ones.
+        """
+        self._refill(asyncio.get_event_loop().time())
+        self.tokens -= 1
+        return max(-self.tokens / self.rate, 0)
+
+    async def acquire(self):
+        # type: () -> None
+        """
+        Takes one token from the bucket and waits until it is available.
+        """
+        delay = self.reserve()
+        if not delay:
+            return
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.tokens += 1
+            raise
+
+
+class _Limits(object):
+    """
+    The concurrency cap and token bucket of one scope (one agent or all
+    agents).
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, max_in_flight, rate, burst):
+        # type: (Optional[int], Optional[float], Optional[float]) -> None
+        self.semaphore = (asyncio.Semaphore(max_in_flight)
+                          if max_in_flight else None)
+        self.bucket = TokenBucket(rate, burst) if rate else None
+
+
+class _Slot(object):
+    """
+    Asynchronous context manager holding the in-flight slots of one request.
+    """
+
+    def __init__(self, scopes):
+        # type: (List[_Limits]) -> None
+        self.scopes = scopes
+        self.acquired = []  # type: List[asyncio.Semaphore]
+
+    async def __aenter__(self):
+        try:
+            for scope in self.scopes:
+                if scope.semaphore is not None:
+                    await scope.semaphore.acquire()
+                    self.acquired.append(scope.semaphore)
+        except BaseException:
+            await self.__aexit__(None, None, None)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        while self.acquired:
+            self.acquired.pop().release()
+
+
+class Limiter(object):
+    """
+    Limits the requests of a transport.
+
+    *max_in_flight* is the maximum number of requests (including their
+    retransmissions) which are waiting for a response at the same time.
+    *rate* is the maximum number of packets sent per second, with bursts of
+    up to *burst* packets. The ``agent_*`` arguments apply the same limits
+    to each agent (identified by IP address and port). ``None`` disables a
+    limit.
+
+    The in-flight slot of the agent is taken before the global one, so
+    requests waiting for a busy agent do not hold global slots which are
+    needed by requests to other agents.
+    """
+
+    def __init__(self, max_in_flight=None, rate=None, burst=None,
+                 agent_max_in_flight=None, agent_rate=None,
+                 agent_burst=None):
+        # type: (Optional[int], Optional[float], Optional[float], Optional[int], Optional[float], Optional[float]) -> None
+        self.max_in_flight = max_in_flight
+        self.rate = rate
+        self.burst = burst
+        self.agent_max_in_flight = agent_max_in_flight
+        self.agent_rate = agent_rate
+        self.agent_burst = agent_burst
+        self._global = None  # type: Optional[_Limits]
+        self._agents = {}  # type: Dict[Hashable, _Limits]
+
+    def _scopes(self, agent):
+        # type: (Hashable) -> List[_Limits]
+        """
+        Returns the limits for *agent*, the agent specific ones first. They
+        are created on first use as asyncio primitives must be created on
+        the running event loop in older versions of Python.
+        """
+        scopes = []
+        if self.agent_max_in_flight or self.agent_rate:
+            limits = self._agents.get(agent)
+            if limits is None:
+                limits = self._agents[agent] = _Limits(
+                    self.agent_max_in_flight, self.agent_rate,
+                    self.agent_burst)
+            scopes.append(limits)
+        if self.max_in_flight or self.rate:
+            if self._global is None:
+                self._global = _Limits(self.max_in_flight, self.rate,
+                                       self.burst)
+            scopes.append(self._global)
+        return scopes
+
+    def slot(self, agent):
+        # type: (Hashable) -> _Slot
+        """
+        Returns an asynchronous context manager which waits until a request
+        to *agent* may be sent and holds the in-flight slots until the
+        request is done::
+
+            >>> async with limiter.slot(agent):
+            ...     for attempt in attempts:
+            ...         await limiter.pace(agent)
+            ...         # send the packet and wait for the response
+        """
+        return _Slot(self._scopes(agent))
+
+    def reserve(self, agent):
+        # type: (Hashable) -> float
+        """
+        Reserves the sending of the next packet to *agent* and returns the
+        time (in seconds) to wait before sending it.
+        """
+        delay = 0.0
+        for scope in self._scopes(agent):
+            if scope.bucket is not None:
+                delay = max(delay, scope.bucket.reserve())
+        return delay
+
+    async def pace(self, agent):
+        # type: (Hashable) -> None
+        """
+        Waits until the next packet to *agent* may be sent. If the waiting
+        is cancelled, the reserved tokens are returned.
+        """
+        delay = self.reserve(agent)
+        if not delay:
+            return
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            for scope in self._scopes(agent):
+                if scope.bucket is not None:
+                    scope.bucket.tokens += 1
+            raise
@@ -0,0 +1,96 @@
+"""
+Coarse-grained timers for large numbers of outstanding requests.
+
+Waiting for each request with :py:func:`asyncio.wait_for` creates a task and
+a timer handle for every attempt of every request. With tens of thousands of
+requests in flight, this overhead dominates the event loop. A
+:py:class:`~.TimerWheel` instead sorts the deadlines into buckets of
+*resolution* seconds and arms a single event loop timer for the earliest
+bucket. All deadlines of a bucket expire in one batch.
+
+Deadlines cannot be cancelled. The owner of the wheel ignores expired items
+which are no longer relevant (f.ex. because the response has arrived).
+"""
+
+import asyncio
+import heapq
+import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import
+    from typing import Any, Callable, Dict, List, Optional
+
+
+class TimerWheel(object):
+    """
+    Calls *callback* with the list of all items whose deadline has passed.
+
+    Deadlines are rounded up to multiples of *resolution* seconds, so items
+    expire up to *resolution* seconds late.
+    """
+
+    def __init__(self, callback, resolution=0.01, loop=None):
+        # type: (Callable[[List[Any]], None], float, Optional[asyncio.AbstractEventLoop]) -> None
+        self.callback = callback
+        self.resolution = resolution
+        self.loop = loop
+        self._buckets = {}  # type: Dict[int, List[Any]]
+        self._ticks = []  # type: List[int]
+        self._handle = None  # type: Optional[asyncio.TimerHandle]
+        self._armed = None  # type: Optional[int]
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def add(self, when, item):
+        # type: (float, Any) -> None
+        """
+        Adds *item* to expire at *when* (in the time of the event loop).
+        """
+        tick = int(math.ceil(when / self.resolution))
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            bucket = self._buckets[tick] = []
+            heapq.heappush(self._ticks, tick)
+            if self._armed is None or tick < self._armed:
+                self._arm(tick)
+        bucket.append(item)
+
+    def _arm(self, tick):
+        # type: (int) -> None
+        if self._handle is not None:
+            self._handle.cancel()
+        loop = self.loop or asyncio.get_event_loop()
+        self._handle = loop.call_at(tick * self.resolution, self._expire)
+        self._armed = tick
+
+    def _expire(self):
+        # type: () -> None
+        """
+        Passes the items of all due buckets to the callback and arms the
+        timer for the next bucket.
+        """
+        self._handle = None
+        self._armed = None
+        loop = self.loop or asyncio.get_event_loop()
+        now = loop.time()
+        expired = []  # type: List[Any]
+        while self._ticks and self._ticks[0] * self.resolution <= now:
+            expired.extend(self._buckets.pop(heapq.heappop(self._ticks)))
+        if expired:
+            self.callback(expired)
+        if self._ticks and self._armed is None:
+            self._arm(self._ticks[0])
+
+    def close(self):
+        # type: () -> None
+        """
+        Drops all items and stops the timer.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = None
+        self._armed = None
+        self._buckets.clear()
+        del self._ticks[:]
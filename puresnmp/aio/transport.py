@@ -13,10 +13,21 @@ hard to test.
 
 import asyncio
 import logging
+from ipaddress import ip_address
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary, ref
 
 from ..exc import Timeout
+from ..pdu import peek_request_id
 from ..x690.util import visible_octets
-from ..transport import get_request_id
+from ..transport import RETRANSMISSION, address_family, get_request_id
+from .limiter import Limiter
+from .timers import TimerWheel
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import
+    from typing import (Dict, Iterator, List, MutableMapping, Optional,
+                        Tuple)
 
 LOG = logging.getLogger(__name__)
 
@@ -27,6 +38,8 @@ class SNMPClientProtocol:
     that provide a method to convert the callback based API into a coroutine
     based API.
 
+    This protocol handles exactly one request on a dedicated endpoint. It is
+    no longer used by :py:func:`~.send` (see :py:class:`~.Transport`).
     """
     def __init__(self, packet, loop):
         self.packet = packet
@@ -91,24 +104,295 @@ class SNMPClientProtocol:
             raise Timeout("{} second timeout exceeded".format(timeout))
 
 
-async def send(ip, port, packet, timeout=6, loop=None):  # pragma: no cover
-    # type: ( str, int, bytes, int ) -> bytes
+class TransportProtocol(asyncio.DatagramProtocol):
     """
-    A coroutine that opens a UDP socket to *ip:port*, sends a packet with
-    *bytes* and returns the raw bytes as returned from the remote host.
+    The protocol of the long-lived endpoint of a :py:class:`~.Transport`.
 
-    If the connection fails due to a timeout, a Timeout exception is raised.
+    Each response is passed on to the future which is registered for the
+    address of the sender and the request-id of the response. Datagrams which
+    do not match any pending request (f.ex. late or duplicate responses) are
+    dropped.
+    """
+
+    def __init__(self):
+        self.transport = None
+        self.pending = {}  # type: Dict[Tuple[str, int, Optional[int]], asyncio.Future]
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        """
+        Passes the datagram on to the future waiting for it.
+        """
+        if LOG.isEnabledFor(logging.DEBUG):
+            hexdump = visible_octets(data)
+            LOG.debug('Received packet from %s:%s\n%s',
+                      addr[0], addr[1], hexdump)
+
+        key = (addr[0], addr[1], peek_request_id(data))
+        future = self.pending.pop(key, None)
+        if future is None or future.done():
+            LOG.debug('Dropping unexpected packet from %s:%s (request-id '
+                      '%r)', *key)
+            return
+        future.set_result(data)
+
+    def error_received(self, exc):
+        """
+        Logs the error. The socket is shared by many requests, so the error
+        cannot be attributed to one of them. The affected request will time
+        out.
+        """
+        LOG.debug('Error received: %s', exc)
+
+    def connection_lost(self, exc):
+        """
+        Fails all pending requests when the socket is closed.
+        """
+        LOG.debug('Connection lost: %s', exc)
+        pending = list(self.pending.values())
+        self.pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(exc or ConnectionError('Socket closed'))
+
+
+class _Request(object):
+    """
+    The state of one outstanding request of a :py:class:`~.Transport`.
+    """
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ('ip', 'port', 'agent', 'packet', 'timeout', 'future',
+                 'endpoint', 'attempts', 'attempt', 'num_attempts', 'sent')
+
+    def __init__(self, ip, port, agent, packet, timeout, future, endpoint):
+        # type: (str, int, Tuple[str, int], bytes, int, asyncio.Future, asyncio.DatagramTransport) -> None
+        self.ip = ip
+        self.port = port
+        self.agent = agent
+        self.packet = packet
+        self.timeout = timeout
+        self.future = future
+        self.endpoint = endpoint
+        self.attempts = None  # type: Optional[Iterator[Tuple[int, float]]]
+        self.attempt = 0
+        self.num_attempts = 0
+        self.sent = 0.0
+
+
+class Transport(object):
+    """
+    A UDP transport which keeps its datagram endpoints open between requests
+    and demultiplexes the responses.
+
+    One (unconnected) endpoint per address family is created on first use
+    and serves all requests to all agents. Each response is routed to the
+    waiting request by the address of the sender and the request-id (see
+    :py:class:`~.TransportProtocol`), so any number of requests can be in
+    flight at the same time.
+
+    Retransmissions are handled by *policy* (by default the policy
+    :py:data:`puresnmp.transport.RETRANSMISSION` which is shared with the
+    synchronous transports). The number and rate of the requests can be
+    limited with a :py:class:`~puresnmp.aio.limiter.Limiter` (by default,
+    nothing is limited).
+
+    The timeouts of all attempts are kept in one
+    :py:class:`~puresnmp.aio.timers.TimerWheel` with a granularity of
+    *timer_resolution* seconds. Expired attempts are retransmitted in
+    batches from the timer callback, so a request needs no task or timer
+    handle of its own.
+
+    The :py:meth:`~.send` coroutine has the same signature as the
+    module-level :py:func:`~.send` coroutine, which uses the shared transport
+    of the event loop (see :py:func:`~.get_transport`).
+
+    Only a weak reference to *loop* is kept. The endpoints are bound to the
+    loop which created them, so :py:meth:`~.close` should be called before
+    the loop is closed.
+
+    Example::
+
+        >>> transport = Transport()
+        >>> response = await transport.send('192.168.1.1', 161, packet)
+        >>> transport.close()
+    """
+
+    def __init__(self, loop=None, policy=None, limiter=None,
+                 timer_resolution=0.01):
+        self._loop = None if loop is None else ref(loop)
+        self.policy = policy or RETRANSMISSION
+        self.limiter = limiter or Limiter()
+        self._endpoints = {}  # type: Dict[int, Tuple[asyncio.DatagramTransport, TransportProtocol]]
+        self._endpoint_lock = None  # type: Optional[asyncio.Lock]
+        self._timers = TimerWheel(self._expire, timer_resolution)
+
+    @property
+    def loop(self):
+        # type: () -> Optional[asyncio.AbstractEventLoop]
+        """
+        The event loop passed to the constructor (``None`` if none was passed
+        or if it has been garbage collected).
+        """
+        return None if self._loop is None else self._loop()
+
+    async def _endpoint(self, family):
+        # type: (int) -> Tuple[asyncio.DatagramTransport, TransportProtocol]
+        endpoint = self._endpoints.get(family)
+        if endpoint is not None and not endpoint[0].is_closing():
+            return endpoint
+        if self._endpoint_lock is None:
+            self._endpoint_lock = asyncio.Lock()
+        async with self._endpoint_lock:
+            endpoint = self._endpoints.get(family)
+            if endpoint is None or endpoint[0].is_closing():
+                loop = self.loop or asyncio.get_event_loop()
+                endpoint = await loop.create_datagram_endpoint(
+                    TransportProtocol, family=family)
+                self._endpoints[family] = endpoint
+        return endpoint
+
+    def _transmit(self, request):
+        # type: (_Request) -> None
+        """
+        Sends the next attempt of *request* and adds its deadline to the
+        timer wheel. Fails the request with a
+        :py:exc:`~puresnmp.exc.Timeout` if no attempts are left.
+        """
+        if request.future.done():
+            return
+        try:
+            request.attempt, wait = next(request.attempts)  # type: ignore
+        except StopIteration:
+            request.future.set_exception(Timeout(
+                'No response from %s:%s after %d attempts within %s '
+                'seconds' % (request.ip, request.port, request.num_attempts,
+                             request.timeout)))
+            return
+        request.num_attempts += 1
+        if LOG.isEnabledFor(logging.DEBUG):
+            hexdump = visible_octets(request.packet)
+            LOG.debug('Sending packet to %s:%s (attempt %d/%d, waiting '
+                      '%.3fs)\n%s', request.ip, request.port,
+                      request.num_attempts, self.policy.retries, wait,
+                      hexdump)
+        loop = self.loop or asyncio.get_event_loop()
+        request.sent = loop.time()
+        request.endpoint.sendto(request.packet, request.agent)
+        self._timers.add(request.sent + wait, (request, request.num_attempts))
+
+    def _expire(self, expired):
+        # type: (List[Tuple[_Request, int]]) -> None
+        """
+        Retransmits the requests whose attempt has timed out. Called by the
+        timer wheel with the ``(request, attempt)`` tuples of all deadlines
+        which have passed.
+        """
+        loop = self.loop or asyncio.get_event_loop()
+        for request, num_attempts in expired:
+            if request.future.done() or request.num_attempts != num_attempts:
+                continue
+            self.policy.failure(request.agent)
+            LOG.debug('Timeout during attempt #%d', num_attempts)
+            delay = self.limiter.reserve(request.agent)
+            if delay:
+                loop.call_later(delay, self._transmit, request)
+            else:
+                self._transmit(request)
+
+    async def send(self, ip, port, packet, timeout=6):
+        # type: ( str, int, bytes, int ) -> bytes
+        """
+        Sends *packet* to *ip:port* and returns the response with the same
+        request-id. If no response arrives, the request is retransmitted (see
+        :py:mod:`puresnmp.retransmission`).
+
+        If no response arrives within *timeout* seconds, a
+        :py:exc:`~puresnmp.exc.Timeout` exception is raised. The time spent
+        waiting for an in-flight slot of the :py:attr:`limiter` does not
+        count towards the *timeout*.
+        """
+        key = (str(ip_address(ip)), port, peek_request_id(packet))
+        agent = key[:2]
+        transport, protocol = await self._endpoint(address_family(ip))
+        if key in protocol.pending:
+            raise ValueError('A request with the ID %r to %s:%s is already '
+                             'in progress!' % (key[2], ip, port))
+        loop = self.loop or asyncio.get_event_loop()
+        future = loop.create_future()
+        protocol.pending[key] = future
+        request = _Request(ip, port, agent, packet, timeout, future,
+                           transport)
+
+        try:
+            async with self.limiter.slot(agent):
+                request.attempts = iter(self.policy.attempts(agent, timeout))
+                await self.limiter.pace(agent)
+                self._transmit(request)
+                response = await future
+                self.policy.success(agent, request.attempt,
+                                    loop.time() - request.sent)
+                return response
+        finally:
+            if not future.done():
+                future.cancel()
+            if protocol.pending.get(key) is future:
+                del protocol.pending[key]
+
+    def close(self):
+        # type: () -> None
+        """
+        Closes all endpoints. They are reopened on the next request.
+        """
+        for transport, _ in self._endpoints.values():
+            try:
+                transport.close()
+            except RuntimeError:
+                # The event loop is closed already. The socket is closed when
+                # the endpoint is garbage collected.
+                LOG.debug('Event loop closed before %r', transport)
+        self._endpoints.clear()
+        self._timers.close()
+
+
+#: The shared transports used by :py:func:`~.send` (one per event loop).
+_TRANSPORTS = WeakKeyDictionary()  # type: MutableMapping[asyncio.AbstractEventLoop, Transport]
+
+
+def get_transport(loop=None):
+    # type: (Optional[asyncio.AbstractEventLoop]) -> Transport
+    """
+    Returns the :py:class:`~.Transport` shared by all requests on the event
+    loop *loop* (by default the current event loop).
+
+    The transports of event loops which have been closed in the meantime
+    are closed and dropped when a new transport is created, so that the
+    loops can be garbage collected.
     """
     if loop is None:
         loop = asyncio.get_event_loop()
+    transport = _TRANSPORTS.get(loop)
+    if transport is None:
+        for old_loop, old_transport in list(_TRANSPORTS.items()):
+            if old_loop.is_closed():
+                del _TRANSPORTS[old_loop]
+                old_transport.close()
+        transport = _TRANSPORTS[loop] = Transport(loop)
+    return transport
 
-    # family could be specified here (and is in the sync implementation),
-    # is it needed? are retries necessary for async implementation?
-    transport, protocol = await loop.create_datagram_endpoint(
-        lambda: SNMPClientProtocol(packet, loop),
-        remote_addr=(ip, port)
-    )
 
-    response = await protocol.get_data(timeout)
+async def send(ip, port, packet, timeout=6, loop=None):  # pragma: no cover
+    # type: ( str, int, bytes, int, Optional[asyncio.AbstractEventLoop] ) -> bytes
+    """
+    A coroutine that sends a packet with *bytes* to *ip:port* and returns the
+    raw bytes as returned from the remote host.
+
+    The packet is sent using the long-lived endpoint shared by all requests
+    on the event loop (see :py:func:`~.get_transport`).
 
-    return response
+    If the connection fails due to a timeout, a Timeout exception is raised.
+    """
+    transport = get_transport(loop)
+    return await transport.send(ip, port, packet, timeout=timeout)
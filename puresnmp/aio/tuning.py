@@ -0,0 +1,258 @@
+"""
+Adaptive tuning of the request concurrency and bulk size per device.
+
+No single ``bulk_size`` fits all devices: a core router answers large bulk
+requests quickly and handles many requests in parallel, while a small access
+point drops requests or answers with ``tooBig`` errors. A :py:class:`~.Tuner`
+learns suitable values for each device with an AIMD (additive increase,
+multiplicative decrease) controller, the same scheme TCP uses for its
+congestion window:
+
+* After each fast response, the bulk size grows by a fixed step and the
+  number of concurrent requests grows by one per "window" of requests.
+* On timeouts and latency spikes (responses much slower than the recent
+  baseline, which is also what retransmitted requests look like), both are
+  reduced by a constant factor. The baseline is the fastest response time,
+  aged towards the current response times so that it follows lasting
+  changes of the latency (f.ex. of a larger bulk size or a busier device).
+* A ``tooBig`` error reduces the bulk size and caps it below the failed value
+  for the rest of the process lifetime.
+
+The learned values are kept for the lifetime of the process (in
+:py:data:`~.TUNER` by default) and are used by
+:py:func:`puresnmp.aio.api.raw.adaptive_bulkwalk`. The requests in flight are
+counted separately for each event loop, so the same tuner can be used by
+one event loop after another.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import
+    from typing import Dict, Hashable, MutableMapping, Optional
+
+
+class _LoopSlots(object):
+    """
+    The requests to one device from one event loop.
+
+    ``in_flight`` is the number of requests holding a slot and ``users`` the
+    number of requests holding or waiting for a slot.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self):
+        # type: () -> None
+        self.condition = asyncio.Condition()
+        self.in_flight = 0
+        self.users = 0
+
+
+class DeviceState(object):
+    """
+    The learned parameters of one device.
+
+    *concurrency* and *bulk_size* are kept as floats to allow fractional
+    increases. ``base_rtt`` is the baseline of the response times (see
+    :py:meth:`Tuner.success`) and ``max_bulk_size`` the upper bound learned
+    from ``tooBig`` errors.
+    """
+
+    def __init__(self, concurrency, bulk_size, max_bulk_size):
+        # type: (float, float, int) -> None
+        self.concurrency = concurrency
+        self.bulk_size = bulk_size
+        self.max_bulk_size = max_bulk_size
+        self.base_rtt = None  # type: Optional[float]
+        self._slots = WeakKeyDictionary()  # type: MutableMapping[asyncio.AbstractEventLoop, _LoopSlots]
+
+    def __repr__(self):
+        return '<%s concurrency=%.2f bulk_size=%.2f base_rtt=%r>' % (
+            self.__class__.__name__, self.concurrency, self.bulk_size,
+            self.base_rtt)
+
+    def enter(self):
+        # type: () -> _LoopSlots
+        """
+        Returns the slots of the current event loop and registers a user.
+
+        The asyncio primitives are bound to the loop they are used on, so
+        they are created per loop. They are dropped again by
+        :py:meth:`~.leave` once the last user is gone, which also releases
+        the loop.
+        """
+        loop = asyncio.get_event_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = _LoopSlots()
+        slots.users += 1
+        return slots
+
+    def leave(self, slots):
+        # type: (_LoopSlots) -> None
+        """
+        Unregisters a user of *slots* (see :py:meth:`~.enter`).
+        """
+        slots.users -= 1
+        if slots.users > 0:
+            return
+        loop = asyncio.get_event_loop()
+        if self._slots.get(loop) is slots:
+            del self._slots[loop]
+
+
+class _Slot(object):
+    """
+    Asynchronous context manager which holds one of the concurrent request
+    slots of a device.
+    """
+
+    def __init__(self, state):
+        # type: (DeviceState) -> None
+        self.state = state
+        self.slots = None  # type: Optional[_LoopSlots]
+
+    async def __aenter__(self):
+        state = self.state
+        slots = self.slots = state.enter()
+        entered = False
+        try:
+            async with slots.condition:
+                await slots.condition.wait_for(
+                    lambda: slots.in_flight < max(int(state.concurrency), 1))
+                slots.in_flight += 1
+            entered = True
+        finally:
+            if not entered:
+                state.leave(slots)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        slots = self.slots
+        try:
+            async with slots.condition:
+                slots.in_flight -= 1
+                slots.condition.notify_all()
+        finally:
+            self.state.leave(slots)
+
+
+class Tuner(object):
+    """
+    Learns the number of concurrent requests and the bulk size for each
+    device (identified by an ``(ip, port)`` tuple).
+
+    Each device starts with *initial_concurrency* and *initial_bulk_size*.
+    Both grow additively (by *increase*) while responses are fast and are
+    multiplied by *decrease* on timeouts and latency spikes. A response is a
+    spike if it took longer than *spike_factor* times the baseline response
+    time of the device. The values never leave the given bounds.
+    """
+
+    #: The weight of each slower response in the baseline response time.
+    AGING = 1 / 8.0
+
+    def __init__(self, initial_concurrency=1, max_concurrency=16,
+                 initial_bulk_size=10, min_bulk_size=1, max_bulk_size=100,
+                 increase=1.0, decrease=0.5, spike_factor=4.0):
+        # type: (int, int, int, int, int, float, float, float) -> None
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.initial_bulk_size = initial_bulk_size
+        self.min_bulk_size = min_bulk_size
+        self.max_bulk_size = max_bulk_size
+        self.increase = increase
+        self.decrease = decrease
+        self.spike_factor = spike_factor
+        self._devices = {}  # type: Dict[Hashable, DeviceState]
+
+    def device(self, agent):
+        # type: (Hashable) -> DeviceState
+        """
+        Returns the state of *agent*.
+        """
+        state = self._devices.get(agent)
+        if state is None:
+            state = self._devices[agent] = DeviceState(
+                self.initial_concurrency, self.initial_bulk_size,
+                self.max_bulk_size)
+        return state
+
+    def bulk_size(self, agent):
+        # type: (Hashable) -> int
+        """
+        Returns the bulk size to use for the next request to *agent*.
+        """
+        return int(self.device(agent).bulk_size)
+
+    def concurrency(self, agent):
+        # type: (Hashable) -> int
+        """
+        Returns the number of requests which may be sent to *agent* at the
+        same time.
+        """
+        return max(int(self.device(agent).concurrency), 1)
+
+    def slot(self, agent):
+        # type: (Hashable) -> _Slot
+        """
+        Returns an asynchronous context manager which waits until fewer than
+        :py:meth:`~.concurrency` requests to *agent* are in flight and holds
+        a slot until the request is done.
+        """
+        return _Slot(self.device(agent))
+
+    def success(self, agent, rtt):
+        # type: (Hashable, float) -> None
+        """
+        Records a response from *agent* which took *rtt* seconds.
+
+        A faster response becomes the new baseline. Slower ones (including
+        spikes) move the baseline towards them by :py:attr:`~.AGING`, so a
+        device whose latency rises permanently is not seen as spiking
+        forever.
+        """
+        state = self.device(agent)
+        base_rtt = state.base_rtt
+        if base_rtt is None or rtt < base_rtt:
+            state.base_rtt = rtt
+        else:
+            state.base_rtt = base_rtt + (rtt - base_rtt) * self.AGING
+        if base_rtt is not None and rtt > base_rtt * self.spike_factor:
+            self._back_off(state)
+            return
+        state.bulk_size = min(state.bulk_size + self.increase,
+                              state.max_bulk_size)
+        state.concurrency = min(
+            state.concurrency + self.increase / state.concurrency,
+            self.max_concurrency)
+
+    def timeout(self, agent):
+        # type: (Hashable) -> None
+        """
+        Records a request to *agent* which timed out.
+        """
+        self._back_off(self.device(agent))
+
+    def too_big(self, agent):
+        # type: (Hashable) -> None
+        """
+        Records a ``tooBig`` error from *agent*.
+        """
+        state = self.device(agent)
+        failed = int(state.bulk_size)
+        state.max_bulk_size = max(failed - 1, self.min_bulk_size)
+        state.bulk_size = min(max(failed * self.decrease, self.min_bulk_size),
+                              state.max_bulk_size)
+
+    def _back_off(self, state):
+        # type: (DeviceState) -> None
+        state.bulk_size = max(state.bulk_size * self.decrease,
+                              self.min_bulk_size)
+        state.concurrency = max(state.concurrency * self.decrease, 1)
+
+
+#: The tuner shared by all walks which do not pass their own.
+TUNER = Tuner()
@@ -0,0 +1,371 @@
+'''
+Collection of scalars, table columns and single table cells in as few
+GETBULK requests as possible.
+
+A poll cycle usually needs a mix of values from each device: some scalars
+(``sysUpTime.0``, ``sysName.0``), a few table columns and some cells with
+known indices. Fetching them with separate
+:py:func:`~puresnmp.api.raw.multiget`, :py:func:`~puresnmp.api.raw.bulkwalk`
+and :py:func:`~puresnmp.api.raw.bulkget` calls costs at least one round trip
+each. :py:func:`~.collect` instead packs
+everything into GETBULK requests: the single values are fetched as
+*non-repeaters* and the columns as *repeaters*, with as many repetitions as
+fit into the limit of varbinds per request::
+
+    >>> spec = CollectSpec(
+    ...     scalars=['1.3.6.1.2.1.1.3.0', '1.3.6.1.2.1.1.5.0'],
+    ...     columns=['1.3.6.1.2.1.2.2.1.2', '1.3.6.1.2.1.2.2.1.10'],
+    ...     cells=['1.3.6.1.2.1.2.2.1.8.1'])
+    >>> result = collect('192.168.1.1', 'public', spec)
+    >>> result.scalars['1.3.6.1.2.1.1.5.0']
+    b'router-1'
+    >>> list(result.columns['1.3.6.1.2.1.2.2.1.2'].items())
+    [('1.3.6.1.2.1.2.2.1.2.1', b'lo'), ('1.3.6.1.2.1.2.2.1.2.2', b'eth0')]
+
+Non-repeaters have GETNEXT semantics. A single value is therefore requested
+at the OID preceding it (``sysName`` for ``sysName.0``, ``ifOperStatus.0``
+for ``ifOperStatus.1``). If the agent returns a different OID (because other
+OIDs lie in between or the value does not exist), the value is fetched with
+a GET request after the GETBULK requests.
+
+Values which do not exist are missing from the result. The exception values
+``noSuchObject``, ``noSuchInstance`` and ``endOfMibView`` (see :rfc:`3416`)
+do not raise :py:exc:`~puresnmp.exc.NoSuchOID` as in the "raw" API, and
+``endOfMibView`` ends a column.
+
+The planning is done by :py:class:`~.CollectPlan`, which is shared with
+:py:func:`puresnmp.aio.api.collect.collect`.
+'''
+from __future__ import unicode_literals
+from collections import OrderedDict, namedtuple
+from typing import TYPE_CHECKING
+import logging
+
+from . import raw
+from ..exc import TooBig
+from ..pdu import (
+    BulkGetRequest,
+    GetRequest,
+    VarBind,
+    encode_message,
+    iter_raw_varbinds,
+    message_prefix,
+)
+from ..transport import get_request_id
+from ..util import to_oid
+from ..x690.types import ObjectIdentifier, Registry, UnknownType
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import, invalid-name
+    from typing import Any, Callable, Dict, List, Optional, Tuple
+    from ..x690.types import Type
+
+try:
+    unicode  # type: Callable[[Any], str]
+except NameError:
+    # pylint: disable=invalid-name
+    unicode = str  # type: Callable[[Any], str]
+
+LOG = logging.getLogger(__name__)
+
+#: The default maximum number of varbinds per request.
+MAX_VARBINDS = 50
+
+#: The values returned by :py:func:`~.collect`. *scalars* and *cells* map the
+#: requested OIDs to their values. *columns* maps each requested column to an
+#: OrderedDict of its OIDs and values.
+CollectResult = namedtuple('CollectResult', 'scalars columns cells')
+
+#: The identifier octets of the exception values noSuchObject,
+#: noSuchInstance and endOfMibView.
+EXCEPTIONS = frozenset([0x80, 0x81, 0x82])
+
+
+def _is_exception(value):
+    # type: (Type) -> bool
+    return isinstance(value, UnknownType) and value.tag in EXCEPTIONS
+
+
+def _decode_varbinds(response):
+    # type: (bytes) -> List[VarBind]
+    '''
+    Decodes the varbinds of the SNMP response message *response*. Exception
+    values are returned as :py:class:`~puresnmp.x690.types.UnknownType`
+    instances instead of raising :py:exc:`~puresnmp.exc.NoSuchOID`.
+    '''
+    output = []  # type: List[VarBind]
+    for oid, identifier, value in iter_raw_varbinds(response):
+        cls = Registry.lookup(identifier)
+        if identifier in EXCEPTIONS or cls is None:
+            value = UnknownType(identifier, bytes(value))
+        else:
+            value = cls.decode(value)
+        output.append(VarBind(ObjectIdentifier.from_content(bytes(oid)),
+                              value))
+    return output
+
+
+def _bulk_message(community, request):
+    # type: (str, Round) -> bytes
+    '''
+    Encodes the GETBULK request for the planned *request*.
+    '''
+    pdu = BulkGetRequest(get_request_id(), len(request.scalar_oids),
+                         request.max_repetitions,
+                         *(request.scalar_oids + request.repeating_oids))
+    return encode_message(pdu, message_prefix(community))
+
+
+def _bulk_response(response, request):
+    # type: (bytes, Round) -> Tuple[List[VarBind], List[VarBind]]
+    '''
+    Decodes the *response* to *request* into the varbinds of the
+    non-repeaters and the repeaters.
+    '''
+    varbinds = _decode_varbinds(response)
+    non_repeaters = len(request.scalar_oids)
+    return varbinds[:non_repeaters], varbinds[non_repeaters:]
+
+
+def _get_message(community, oids):
+    # type: (str, List[ObjectIdentifier]) -> bytes
+    '''
+    Encodes the GET request for the fallback *oids*.
+    '''
+    return encode_message(GetRequest(get_request_id(), *oids),
+                          message_prefix(community))
+
+
+def _get_response(response):
+    # type: (bytes) -> List[Type]
+    '''
+    Decodes the values of the *response* to a fallback GET request.
+    '''
+    return [varbind.value for varbind in _decode_varbinds(response)]
+
+
+class CollectSpec(object):
+    '''
+    Describes the values to collect from a device.
+
+    *scalars* and *cells* are the OIDs of single values (including their
+    instance, f.ex. ``sysName.0`` or ``ifOperStatus.1``). *columns* are the
+    OIDs of trees which are walked (usually table columns).
+    '''
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, scalars=None, columns=None, cells=None):
+        # type: (Optional[List[str]], Optional[List[str]], Optional[List[str]]) -> None
+        self.scalars = [to_oid(oid) for oid in scalars or []]
+        self.columns = [to_oid(oid) for oid in columns or []]
+        self.cells = [to_oid(oid) for oid in cells or []]
+
+    def __repr__(self):
+        return '<%s scalars=%d columns=%d cells=%d>' % (
+            self.__class__.__name__, len(self.scalars), len(self.columns),
+            len(self.cells))
+
+
+def _preceding(oid):
+    # type: (ObjectIdentifier) -> ObjectIdentifier
+    '''
+    Returns the OID to request with GETNEXT to retrieve *oid*, assuming no
+    other OIDs lie in between.
+    '''
+    nodes = oid.identifiers
+    if nodes[-1] == 0 or len(nodes) == 1:
+        return ObjectIdentifier(*nodes[:-1])
+    return ObjectIdentifier(*(nodes[:-1] + (nodes[-1] - 1,)))
+
+
+class Round(object):
+    '''
+    One GETBULK request planned by :py:class:`~.CollectPlan`.
+
+    *values* are the single values fetched as non-repeaters (requested at
+    *scalar_oids*), *columns* the columns fetched as repeaters (continuing
+    at *repeating_oids*) with *max_repetitions* repetitions.
+    '''
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, values, columns, repeating_oids, max_repetitions):
+        # type: (List[ObjectIdentifier], List[ObjectIdentifier], List[ObjectIdentifier], int) -> None
+        self.values = values
+        self.scalar_oids = [_preceding(oid) for oid in values]
+        self.columns = columns
+        self.repeating_oids = repeating_oids
+        self.max_repetitions = max_repetitions
+
+
+class CollectPlan(object):
+    '''
+    Plans the GETBULK requests for a :py:class:`~.CollectSpec` and sorts the
+    responses into a :py:class:`~.CollectResult`.
+
+    No request contains more than *max_varbinds* OIDs or asks for more than
+    *max_varbinds* varbinds. The plan is used as follows::
+
+        >>> plan = CollectPlan(spec)
+        >>> request = plan.next_round()
+        >>> while request:
+        ...     try:
+        ...         scalars, repeating = send_bulkget(request)
+        ...     except TooBig:
+        ...         plan.too_big()
+        ...     else:
+        ...         plan.feed(request, scalars, repeating)
+        ...     request = plan.next_round()
+        >>> for oids in plan.fallback():
+        ...     plan.feed_fallback(oids, send_multiget(oids))
+        >>> result = plan.result()
+    '''
+
+    def __init__(self, spec, max_varbinds=MAX_VARBINDS):
+        # type: (CollectSpec, int) -> None
+        self.spec = spec
+        self.max_varbinds = max_varbinds
+        self._pending = []  # type: List[ObjectIdentifier]
+        for oid in spec.scalars + spec.cells:
+            if oid not in self._pending:
+                self._pending.append(oid)
+        self._missed = []  # type: List[ObjectIdentifier]
+        self._values = {}  # type: Dict[ObjectIdentifier, Type]
+        self._columns = OrderedDict(
+            (column, OrderedDict()) for column in spec.columns
+        )  # type: Dict[ObjectIdentifier, Dict[ObjectIdentifier, Type]]
+        self._next = OrderedDict(
+            (column, column) for column in spec.columns
+        )  # type: Dict[ObjectIdentifier, ObjectIdentifier]
+
+    def next_round(self):
+        # type: () -> Optional[Round]
+        '''
+        Returns the next request or ``None`` if all values are fetched
+        (except for the ones returned by :py:meth:`~.fallback`).
+        '''
+        columns = list(self._next)[:self.max_varbinds]
+        room = self.max_varbinds - len(columns)
+        values = self._pending[:room]
+        if not values and not columns:
+            return None
+        max_repetitions = 0
+        if columns:
+            max_repetitions = max(
+                (self.max_varbinds - len(values)) // len(columns), 1)
+        repeating_oids = [self._next[column] for column in columns]
+        return Round(values, columns, repeating_oids, max_repetitions)
+
+    def too_big(self):
+        # type: () -> None
+        '''
+        Halves the number of varbinds per request after a ``tooBig`` error.
+        Raises :py:exc:`~puresnmp.exc.TooBig` if the limit cannot be reduced
+        any further.
+        '''
+        if self.max_varbinds <= 1:
+            raise TooBig('The response to a single varbind is too big')
+        self.max_varbinds //= 2
+        LOG.debug('Reduced the number of varbinds per request to %d',
+                  self.max_varbinds)
+
+    def feed(self, request, scalars, repeating):
+        # type: (Round, List[VarBind], List[VarBind]) -> None
+        '''
+        Processes the response to *request*, split into the varbinds of the
+        non-repeaters and the repeaters (see
+        :py:func:`~puresnmp.api.raw.bulkget`). Exception values count as
+        missing values and as the end of a column.
+        '''
+        for oid, varbind in zip(request.values, scalars):
+            if varbind.oid == oid and not _is_exception(varbind.value):
+                self._values[oid] = varbind.value
+            else:
+                self._missed.append(oid)
+        # Values missing from a (truncated) response are requested again
+        for oid in request.values[len(scalars):]:
+            self._missed.append(oid)
+        del self._pending[:len(request.values)]
+
+        received = dict((column, 0) for column in request.columns)
+        for index, varbind in enumerate(repeating):
+            column = request.columns[index % len(request.columns)]
+            if column not in self._next:
+                continue
+            if (_is_exception(varbind.value) or varbind.oid not in column or
+                    not self._next[column] < varbind.oid):
+                del self._next[column]
+                continue
+            self._columns[column][varbind.oid] = varbind.value
+            self._next[column] = varbind.oid
+            received[column] += 1
+        for column, count in received.items():
+            if not count:
+                # Protect against agents which return nothing for a column
+                self._next.pop(column, None)
+
+    def fallback(self):
+        # type: () -> List[List[ObjectIdentifier]]
+        '''
+        Returns the single values which could not be fetched with GETBULK
+        requests, split into lists for GET requests.
+        '''
+        size = max(self.max_varbinds, 1)
+        return [self._missed[start:start + size]
+                for start in range(0, len(self._missed), size)]
+
+    def feed_fallback(self, oids, values):
+        # type: (List[ObjectIdentifier], List[Type]) -> None
+        '''
+        Processes the *values* of a GET request for *oids*. Exception values
+        mean that the value does not exist.
+        '''
+        for oid, value in zip(oids, values):
+            if not _is_exception(value):
+                self._values[oid] = value
+
+    def result(self):
+        # type: () -> CollectResult
+        '''
+        Returns the collected values.
+        '''
+        scalars = OrderedDict(
+            (unicode(oid), self._values[oid])
+            for oid in self.spec.scalars if oid in self._values)
+        cells = OrderedDict(
+            (unicode(oid), self._values[oid])
+            for oid in self.spec.cells if oid in self._values)
+        columns = OrderedDict()  # type: Dict[str, Dict[str, Type]]
+        for column, values in self._columns.items():
+            columns[unicode(column)] = OrderedDict(
+                (unicode(oid), value) for oid, value in values.items())
+        return CollectResult(scalars, columns, cells)
+
+
+def collect(ip, community, spec, port=161, timeout=2,
+            max_varbinds=MAX_VARBINDS):
+    # type: (str, str, CollectSpec, int, int, int) -> CollectResult
+    '''
+    Fetches the values described by *spec* with as few requests as possible
+    and returns a :py:class:`~.CollectResult`.
+
+    No request asks for more than *max_varbinds* varbinds. If the agent
+    answers with a ``tooBig`` error, the limit is halved and the request is
+    repeated.
+    '''
+    plan = CollectPlan(spec, max_varbinds)
+    request = plan.next_round()
+    while request:
+        response = raw.send(ip, port, _bulk_message(community, request),
+                            timeout=timeout)
+        try:
+            scalars, repeating = _bulk_response(response, request)
+        except TooBig:
+            plan.too_big()
+        else:
+            plan.feed(request, scalars, repeating)
+        request = plan.next_round()
+    for oids in plan.fallback():
+        response = raw.send(ip, port, _get_message(community, oids),
+                            timeout=timeout)
+        plan.feed_fallback(oids, _get_response(response))
+    return plan.result()
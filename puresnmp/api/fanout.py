@@ -0,0 +1,530 @@
+'''
+Concurrent SNMP requests to many agents from a single thread.
+
+The functions in :py:mod:`puresnmp.api.raw` block until the response of each
+request has arrived. Polling many agents therefore either takes the sum of
+all round-trip times or needs one thread per agent. The
+:py:class:`~.FanOut` engine instead sends the requests of many
+:py:class:`~.Operation` instances at once and waits for all responses with
+one :py:mod:`selectors` loop. Timeouts and retransmissions are kept in a
+timer heap and follow the same
+:py:class:`~puresnmp.retransmission.RetransmissionPolicy` as
+:py:mod:`puresnmp.transport`.
+
+Operations which need several requests (walks) send the next request as soon
+as the previous response arrived. The operations are returned as they
+complete::
+
+    >>> operations = [Walk(ip, 'public', ['1.3.6.1.2.1.2.2.1'])
+    ...               for ip in ips]
+    >>> with FanOut() as engine:
+    ...     for operation in engine.as_completed(operations):
+    ...         if operation.error:
+    ...             print(operation.ip, operation.error)
+    ...         else:
+    ...             print(operation.ip, len(operation.result))
+
+The engine is not thread-safe. Each thread needs its own instance.
+'''
+from __future__ import unicode_literals
+from collections import OrderedDict, deque
+from ipaddress import ip_address
+from typing import TYPE_CHECKING
+import errno
+import heapq
+import logging
+import socket
+
+try:
+    import selectors
+except ImportError:  # pragma: no cover
+    import selectors34 as selectors  # type: ignore
+
+from . import raw
+from ..const import Version
+from ..exc import FaultySNMPImplementation, NoSuchOID, Timeout
+from ..pdu import (
+    BulkGetRequest,
+    GetNextRequest,
+    GetRequest,
+    encode_message,
+    message_prefix,
+    peek_request_id,
+)
+from ..transport import (
+    MAX_DATAGRAM_SIZE,
+    RETRANSMISSION,
+    address_family,
+    get_request_id,
+)
+from ..util import (
+    BulkResult,
+    OIDTrie,
+    get_unfinished_walk_oids,
+    group_varbinds,
+    to_oid,
+)
+from ..x690.util import visible_octets
+
+try:
+    from time import monotonic
+except ImportError:  # pragma: no cover
+    from time import time as monotonic  # type: ignore
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import, invalid-name, ungrouped-imports
+    from typing import (Any, Callable, Dict, Iterable, Iterator, List,
+                        Optional, Set, Tuple, Union)
+    from ..pdu import PDU, VarBind
+    from ..retransmission import RetransmissionPolicy
+    from ..x690.types import ObjectIdentifier
+
+try:
+    unicode  # type: Callable[[Any], str]
+except NameError:
+    # pylint: disable=invalid-name
+    unicode = str  # type: Callable[[Any], str]
+
+LOG = logging.getLogger(__name__)
+
+#: Errors of non-blocking sockets which only mean "try again later".
+_WOULD_BLOCK = (errno.EAGAIN, errno.EWOULDBLOCK, errno.ENOBUFS)
+
+
+class Operation(object):
+    '''
+    Base class for the operations executed by :py:class:`~.FanOut`.
+
+    An operation produces one request at a time with :py:meth:`~.request`
+    and processes its response with :py:meth:`~.feed`. When it is done,
+    either :py:attr:`result` contains the same value as the equivalent
+    function in :py:mod:`puresnmp.api.raw` or :py:attr:`error` contains the
+    exception which the function would have raised.
+
+    *timeout* is the total time (in seconds) allowed for each request,
+    including retransmissions.
+    '''
+
+    def __init__(self, ip, community, port=161, timeout=2,
+                 version=Version.V2C):
+        # type: (str, str, int, float, int) -> None
+        self.ip = ip
+        self.community = community
+        self.port = port
+        self.timeout = timeout
+        self.result = None  # type: Any
+        self.error = None  # type: Optional[Exception]
+        self.done = False
+        self.prefix = message_prefix(community, version)
+
+    def __repr__(self):
+        return '<%s %s:%s done=%r>' % (self.__class__.__name__, self.ip,
+                                       self.port, self.done)
+
+    def request(self):
+        # type: () -> PDU
+        '''
+        Returns the next request PDU.
+        '''
+        raise NotImplementedError('Not yet implemented in %s' %
+                                  self.__class__.__name__)
+
+    def feed(self, response):
+        # type: (bytes) -> bool
+        '''
+        Processes the raw *response* message to the last request. Returns
+        ``True`` if another request is needed.
+        '''
+        raise NotImplementedError('Not yet implemented in %s' %
+                                  self.__class__.__name__)
+
+
+class Get(Operation):
+    '''
+    A GET request for *oids* (see :py:func:`puresnmp.api.raw.multiget`).
+    '''
+
+    def __init__(self, ip, community, oids, port=161, timeout=2,
+                 version=Version.V2C, pythonize=False):
+        # type: (str, str, List[str], int, float, int, bool) -> None
+        super(Get, self).__init__(ip, community, port, timeout, version)
+        self.oids = oids
+        self.pythonize = pythonize
+
+    def request(self):
+        # type: () -> PDU
+        return GetRequest(get_request_id(),
+                          *[to_oid(oid) for oid in self.oids])
+
+    def feed(self, response):
+        # type: (bytes) -> bool
+        # pylint: disable=protected-access
+        self.result = raw._multiget_response(response, self.oids,
+                                             self.pythonize)
+        return False
+
+
+class GetNext(Operation):
+    '''
+    A GETNEXT request for *oids* (see
+    :py:func:`puresnmp.api.raw.multigetnext`).
+    '''
+
+    def __init__(self, ip, community, oids, port=161, timeout=2,
+                 version=Version.V2C, pythonize=False):
+        # type: (str, str, List[str], int, float, int, bool) -> None
+        super(GetNext, self).__init__(ip, community, port, timeout, version)
+        self.oids = oids
+        self.pythonize = pythonize
+
+    def request(self):
+        # type: () -> PDU
+        return GetNextRequest(get_request_id(), *self.oids)
+
+    def feed(self, response):
+        # type: (bytes) -> bool
+        # pylint: disable=protected-access
+        self.result = raw._multigetnext_response(response, self.oids,
+                                                 self.pythonize)
+        return False
+
+
+class BulkGet(Operation):
+    '''
+    A GETBULK request (see :py:func:`puresnmp.api.raw.bulkget`).
+    '''
+
+    def __init__(self, ip, community, scalar_oids, repeating_oids,
+                 max_list_size=1, port=161, timeout=2, version=Version.V2C):
+        # type: (str, str, List[str], List[str], int, int, float, int) -> None
+        super(BulkGet, self).__init__(ip, community, port, timeout, version)
+        # pylint: disable=protected-access
+        self.non_repeaters, self.oids = raw._bulkget_oids(scalar_oids,
+                                                          repeating_oids)
+        self.max_list_size = max_list_size
+
+    def request(self):
+        # type: () -> PDU
+        return BulkGetRequest(get_request_id(), self.non_repeaters,
+                              self.max_list_size, *self.oids)
+
+    def feed(self, response):
+        # type: (bytes) -> bool
+        # pylint: disable=protected-access
+        scalar_tmp, repeating_tmp = raw._bulkget_response(
+            response, self.non_repeaters, self.max_list_size, self.oids,
+            False)
+        scalar_out = {
+            unicode(oid): value
+            for oid, value in scalar_tmp
+        }
+        repeating_out = OrderedDict()  # type: Dict[str, Any]
+        for oid, value in repeating_tmp:
+            repeating_out[unicode(oid)] = value
+        self.result = BulkResult(scalar_out, repeating_out)
+        return False
+
+
+class Walk(Operation):
+    '''
+    A walk over the trees below *oids*. The result is the list of
+    :py:class:`~puresnmp.pdu.VarBind` instances which
+    :py:func:`puresnmp.api.raw.multiwalk` would generate.
+
+    The walk uses GETNEXT requests by default. If *bulk_size* is set, GETBULK
+    requests with this many repetitions are used instead (see
+    :py:func:`puresnmp.api.raw.bulkwalk`). *errors* has the same meaning as
+    in :py:func:`puresnmp.api.raw.walk`.
+    '''
+
+    def __init__(self, ip, community, oids, port=161, timeout=2,
+                 version=Version.V2C, bulk_size=None,
+                 errors=raw.ERRORS_STRICT):
+        # type: (str, str, List[str], int, float, int, Optional[int], str) -> None
+        super(Walk, self).__init__(ip, community, port, timeout, version)
+        self.bulk_size = bulk_size
+        self.errors = errors
+        self.result = []  # type: List[VarBind]
+        self._requested = [to_oid(oid) for oid in oids]
+        self._index = OIDTrie(self._requested)
+        self._next = self._requested  # type: List[ObjectIdentifier]
+        self._yielded = set()  # type: Set[ObjectIdentifier]
+        self._started = False
+
+    def request(self):
+        # type: () -> PDU
+        if self.bulk_size:
+            return BulkGetRequest(get_request_id(), 0, self.bulk_size,
+                                  *self._next)
+        return GetNextRequest(get_request_id(), *self._next)
+
+    def _varbinds(self, response):
+        # type: (bytes) -> List[VarBind]
+        # pylint: disable=protected-access
+        if self.bulk_size:
+            _, repeating = raw._bulkget_response(
+                response, 0, self.bulk_size, self._next, False)
+            return repeating
+        return raw._multigetnext_response(response, self._next, False)
+
+    def feed(self, response):
+        # type: (bytes) -> bool
+        started, self._started = self._started, True
+        try:
+            varbinds = self._varbinds(response)
+        except NoSuchOID:
+            if not started:
+                raise
+            # Reached end of OID tree
+            return False
+        except FaultySNMPImplementation as exc:
+            if started and self.errors == raw.ERRORS_WARN:
+                LOG.warning('SNMP walk aborted prematurely due to faulty '
+                            'SNMP implementation on device %r! Upon running '
+                            'a GetNext on OIDs %r it returned the following '
+                            'error: %s', self.ip,
+                            [unicode(_) for _ in self._next], exc)
+                return False
+            raise
+        grouped_oids = group_varbinds(varbinds, self._next,
+                                      user_roots=self._requested)
+        unfinished_oids = get_unfinished_walk_oids(grouped_oids)
+        for var in sorted(grouped_oids.values()):
+            for varbind in var:
+                if (not self._index.prefixes(varbind.oid) or
+                        varbind.oid in self._yielded):
+                    continue
+                self._yielded.add(varbind.oid)
+                self.result.append(varbind)
+        self._next = [_[1].value.oid for _ in unfinished_oids]
+        return bool(self._next)
+
+
+class _Pending(object):
+    '''
+    An outstanding request of an operation.
+    '''
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ('operation', 'key', 'family', 'packet', 'attempts',
+                 'attempt', 'num_attempts', 'sent', 'timer')
+
+    def __init__(self, operation, key, family, packet, attempts):
+        # type: (Operation, Tuple[str, int, int], int, bytes, Iterator[Tuple[int, float]]) -> None
+        self.operation = operation
+        self.key = key
+        self.family = family
+        self.packet = packet
+        self.attempts = attempts
+        self.attempt = 0
+        self.num_attempts = 0
+        self.sent = 0.0
+        self.timer = 0
+
+
+class FanOut(object):
+    '''
+    Executes many :py:class:`~.Operation` instances concurrently from one
+    thread.
+
+    The engine keeps one non-blocking UDP socket per address family. All
+    responses are read into one preallocated buffer and assigned to the
+    requests by source address and request-id. *policy* decides about
+    retransmissions (see :py:class:`~puresnmp.transport.Transport`) and
+    *receive_buffer_size* sets ``SO_RCVBUF`` of the sockets. Raise it when
+    polling many agents at once.
+    '''
+
+    def __init__(self, policy=None, receive_buffer_size=None):
+        # type: (Optional[RetransmissionPolicy], Optional[int]) -> None
+        self.policy = policy or RETRANSMISSION
+        self.receive_buffer_size = receive_buffer_size
+        self._selector = selectors.DefaultSelector()
+        self._sockets = {}  # type: Dict[int, socket.socket]
+        self._buffer = memoryview(bytearray(MAX_DATAGRAM_SIZE))
+        self._pending = {}  # type: Dict[Tuple[str, int, int], _Pending]
+        self._timers = []  # type: List[Tuple[float, int, Tuple[str, int, int]]]
+        self._sequence = 0
+        self._completed = deque()  # type: deque
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        # type: () -> None
+        '''
+        Closes all sockets.
+        '''
+        for sock in self._sockets.values():
+            self._selector.unregister(sock)
+            sock.close()
+        self._sockets.clear()
+        self._selector.close()
+
+    def _socket(self, family):
+        # type: (int) -> socket.socket
+        sock = self._sockets.get(family)
+        if sock is None:
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            if self.receive_buffer_size:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                                self.receive_buffer_size)
+            self._selector.register(sock, selectors.EVENT_READ)
+            self._sockets[family] = sock
+        return sock
+
+    def _finish(self, operation, error=None):
+        # type: (Operation, Optional[Exception]) -> None
+        operation.error = error
+        operation.done = True
+        self._completed.append(operation)
+
+    def _start(self, operation):
+        # type: (Operation) -> None
+        '''
+        Sends the next request of *operation*.
+        '''
+        try:
+            pdu = operation.request()
+            packet = encode_message(pdu, operation.prefix)
+            host = str(ip_address(operation.ip))
+            family = address_family(host)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._finish(operation, exc)
+            return
+        key = (host, operation.port, pdu.request_id)
+        attempts = self.policy.attempts((host, operation.port),
+                                        operation.timeout)
+        pending = _Pending(operation, key, family, packet, attempts)
+        self._pending[key] = pending
+        self._transmit(pending)
+
+    def _transmit(self, pending):
+        # type: (_Pending) -> None
+        '''
+        Sends the next attempt of *pending* and arms its timer. If no
+        attempts are left, the operation fails with a timeout.
+        '''
+        operation = pending.operation
+        try:
+            pending.attempt, wait = next(pending.attempts)
+        except StopIteration:
+            del self._pending[pending.key]
+            self._finish(operation, Timeout(
+                'No response from %s:%s after %d attempts within %s '
+                'seconds' % (operation.ip, operation.port,
+                             pending.num_attempts, operation.timeout)))
+            return
+        pending.num_attempts += 1
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug('Sending packet to %s:%s (attempt %d/%d, waiting '
+                      '%.3fs)\n%s', operation.ip, operation.port,
+                      (pending.attempt+1), self.policy.retries, wait,
+                      visible_octets(pending.packet))
+        pending.sent = monotonic()
+        self._sequence += 1
+        pending.timer = self._sequence
+        heapq.heappush(self._timers,
+                       (pending.sent + wait, self._sequence, pending.key))
+        try:
+            self._socket(pending.family).sendto(pending.packet,
+                                                pending.key[:2])
+        except socket.error as exc:
+            if exc.errno not in _WOULD_BLOCK:
+                del self._pending[pending.key]
+                self._finish(operation, exc)
+                return
+            # The timer retransmits the request
+            LOG.debug('Unable to send packet to %s:%s (%s)', operation.ip,
+                      operation.port, exc)
+
+    def _expire(self, now):
+        # type: (float) -> None
+        '''
+        Handles all timers which expired at *now*.
+        '''
+        while self._timers and self._timers[0][0] <= now:
+            _, sequence, key = heapq.heappop(self._timers)
+            pending = self._pending.get(key)
+            if pending is None or pending.timer != sequence:
+                continue  # The response arrived in the meantime
+            LOG.debug('Timeout during attempt #%d', (pending.attempt+1))
+            self.policy.failure(key[:2])
+            self._transmit(pending)
+
+    def _read(self, sock):
+        # type: (socket.socket) -> None
+        '''
+        Reads all datagrams waiting on *sock*.
+        '''
+        while True:
+            try:
+                nbytes, addr = sock.recvfrom_into(self._buffer)
+            except socket.error as exc:
+                if exc.errno not in _WOULD_BLOCK:
+                    LOG.debug('Error on socket %r: %s', sock, exc)
+                return
+            data = self._buffer[:nbytes]
+            key = (addr[0], addr[1], peek_request_id(data))
+            pending = self._pending.pop(key, None)
+            if pending is None:
+                LOG.debug('Dropping unexpected datagram from %s:%s (%d '
+                          'bytes)', addr[0], addr[1], nbytes)
+                continue
+            self.policy.success(key[:2], pending.attempt,
+                                monotonic() - pending.sent)
+            response = data.tobytes()
+            if LOG.isEnabledFor(logging.DEBUG):
+                LOG.debug('Received packet:\n%s', visible_octets(response))
+            operation = pending.operation
+            try:
+                more = operation.feed(response)
+            except Exception as exc:  # pylint: disable=broad-except
+                self._finish(operation, exc)
+                continue
+            if more:
+                self._start(operation)
+            else:
+                self._finish(operation)
+
+    def as_completed(self, operations):
+        # type: (Iterable[Operation]) -> Iterator[Operation]
+        '''
+        Executes *operations* and generates each of them as soon as it is
+        done.
+
+        If the generator is closed early, the outstanding requests are
+        abandoned.
+        '''
+        operations = list(operations)
+        for operation in operations:
+            self._start(operation)
+        try:
+            while self._pending or self._completed:
+                while self._completed:
+                    yield self._completed.popleft()
+                if not self._pending:
+                    break
+                timeout = max(self._timers[0][0] - monotonic(), 0)
+                for key, _ in self._selector.select(timeout):
+                    self._read(key.fileobj)  # type: ignore
+                self._expire(monotonic())
+        finally:
+            self._pending.clear()
+            self._completed.clear()
+            del self._timers[:]
+
+    def run(self, operations):
+        # type: (Iterable[Operation]) -> List[Operation]
+        '''
+        Executes *operations* and returns them (in the same order) when all
+        of them are done.
+        '''
+        operations = list(operations)
+        for _ in self.as_completed(operations):
+            pass
+        return operations
@@ -0,0 +1,274 @@
+'''
+Thread pool for polling many agents from threaded code.
+
+The functions in :py:mod:`puresnmp.api.raw` block until the response has
+arrived. A :py:class:`~.Pool` runs them on a managed
+:py:class:`concurrent.futures.ThreadPoolExecutor` and returns
+:py:class:`~concurrent.futures.Future` instances::
+
+    >>> with Pool(max_workers=32) as pool:
+    ...     futures = {pool.submit_walk(ip, 'public', '1.3.6.1.2.1.2.2.1'): ip
+    ...                for ip in ips}
+    ...     for future in as_completed(futures):
+    ...         print(futures[future], future.result())
+
+All requests of a pool share one :py:class:`~puresnmp.transport.Transport`
+(one socket per address family) and one
+:py:class:`~puresnmp.api.session.Session` for each agent. Everything used by
+the workers is thread-safe: the request-ids come from a locked counter (see
+:py:func:`~puresnmp.transport.get_request_id`), the transport assigns the
+responses to the waiting threads by request-id and the retransmission policy
+locks its estimators.
+
+At most *max_queued* calls are accepted before they are executed. Further
+submissions block until a queued call has finished. This keeps memory
+bounded when submitting requests to thousands of agents.
+
+The module-level ``submit_*`` functions use a shared default pool (see
+:py:func:`~.get_pool`).
+'''
+from __future__ import unicode_literals
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+import atexit
+import threading
+
+from . import raw
+from ..const import Version
+from ..transport import Transport
+from .session import Session
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import, invalid-name
+    from concurrent.futures import Future
+    from typing import Any, Callable, Dict, List, Optional, Tuple
+    from ..pdu import VarBind
+    from ..retransmission import RetransmissionPolicy
+
+#: The default number of worker threads.
+MAX_WORKERS = 32
+
+_DEFAULT_POOL = None  # type: Optional[Pool]
+_DEFAULT_POOL_LOCK = threading.Lock()
+
+
+class Pool(object):
+    '''
+    Executes SNMP requests on *max_workers* threads.
+
+    *max_queued* limits the number of submitted calls which have not yet
+    finished (default: four times *max_workers*). *policy* and
+    *receive_buffer_size* are passed to the shared
+    :py:class:`~puresnmp.transport.Transport`.
+    '''
+
+    def __init__(self, max_workers=MAX_WORKERS, max_queued=None, policy=None,
+                 receive_buffer_size=None):
+        # type: (int, Optional[int], Optional[RetransmissionPolicy], Optional[int]) -> None
+        self.max_workers = max_workers
+        self.max_queued = max_queued or max_workers * 4
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._slots = threading.BoundedSemaphore(self.max_queued)
+        self._transport = Transport(policy, receive_buffer_size)
+        self._sessions = {}  # type: Dict[Tuple[str, str, int, int], Session]
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def shutdown(self, wait=True):
+        # type: (bool) -> None
+        '''
+        Stops the worker threads (waiting for the running calls if *wait* is
+        true) and closes the transport.
+        '''
+        self._executor.shutdown(wait)
+        self._transport.close()
+
+    def session(self, ip, community, port=161, version=Version.V2C):
+        # type: (str, str, int, int) -> Session
+        '''
+        Returns the session for the agent at *ip:port* using *community*.
+        The sessions are created once and use the transport of the pool.
+        '''
+        key = (ip, community, port, version)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = Session(ip, community, port, version,
+                                  transport=self._transport)
+                self._sessions[key] = session
+            return session
+
+    def submit(self, func, *args, **kwargs):
+        # type: (Callable[..., Any], *Any, **Any) -> Future
+        '''
+        Schedules ``func(*args, **kwargs)`` and returns its future. Blocks
+        while *max_queued* calls are pending.
+        '''
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def submit_get(self, ip, community, oid, port=161, timeout=2):
+        # type: (str, str, str, int, int) -> Future
+        '''
+        Schedules :py:func:`puresnmp.api.raw.get`.
+        '''
+        return self.submit(self.session(ip, community, port).get, oid,
+                           timeout=timeout)
+
+    def submit_multiget(self, ip, community, oids, port=161, timeout=2):
+        # type: (str, str, List[str], int, int) -> Future
+        '''
+        Schedules :py:func:`puresnmp.api.raw.multiget`.
+        '''
+        return self.submit(self.session(ip, community, port).multiget, oids,
+                           timeout=timeout)
+
+    def submit_bulkget(self, ip, community, scalar_oids, repeating_oids,
+                       max_list_size=1, port=161, timeout=2):
+        # type: (str, str, List[str], List[str], int, int, int) -> Future
+        '''
+        Schedules :py:func:`puresnmp.api.raw.bulkget`.
+        '''
+        return self.submit(self.session(ip, community, port).bulkget,
+                           scalar_oids, repeating_oids, max_list_size,
+                           timeout=timeout)
+
+    def submit_walk(self, ip, community, oid, port=161, timeout=2,
+                    errors=raw.ERRORS_STRICT):
+        # type: (str, str, str, int, int, str) -> Future
+        '''
+        Schedules :py:func:`puresnmp.api.raw.walk`. The result of the future
+        is the list of all varbinds.
+        '''
+        return self.submit(_collect, self.session(ip, community, port).walk,
+                           oid, timeout=timeout, errors=errors)
+
+    def submit_multiwalk(self, ip, community, oids, port=161, timeout=2,
+                         errors=raw.ERRORS_STRICT):
+        # type: (str, str, List[str], int, int, str) -> Future
+        '''
+        Schedules :py:func:`puresnmp.api.raw.multiwalk`. The result of the
+        future is the list of all varbinds.
+        '''
+        return self.submit(_collect,
+                           self.session(ip, community, port).multiwalk,
+                           oids, timeout=timeout, errors=errors)
+
+    def submit_bulkwalk(self, ip, community, oids, bulk_size=10, port=161,
+                        timeout=2):
+        # type: (str, str, List[str], int, int, int) -> Future
+        '''
+        Schedules :py:func:`puresnmp.api.raw.bulkwalk`. The result of the
+        future is the list of all varbinds.
+        '''
+        return self.submit(_collect,
+                           self.session(ip, community, port).bulkwalk,
+                           oids, bulk_size=bulk_size, timeout=timeout)
+
+    def submit_table(self, ip, community, oid, port=161, num_base_nodes=0,
+                     timeout=2):
+        # type: (str, str, str, int, int, int) -> Future
+        '''
+        Schedules :py:func:`puresnmp.api.raw.table`.
+        '''
+        return self.submit(self.session(ip, community, port).table, oid,
+                           num_base_nodes=num_base_nodes, timeout=timeout)
+
+
+def _collect(func, *args, **kwargs):
+    # type: (Callable[..., Any], *Any, **Any) -> List[VarBind]
+    '''
+    Runs the generator function *func* to the end and returns the generated
+    values as list.
+    '''
+    return list(func(*args, **kwargs))
+
+
+def get_pool():
+    # type: () -> Pool
+    '''
+    Returns the default pool used by the module-level ``submit_*``
+    functions. It is created with the default arguments on first use and
+    shut down when the interpreter exits.
+    '''
+    global _DEFAULT_POOL  # pylint: disable=global-statement
+    with _DEFAULT_POOL_LOCK:
+        if _DEFAULT_POOL is None:
+            _DEFAULT_POOL = Pool()
+            atexit.register(_DEFAULT_POOL.shutdown)
+        return _DEFAULT_POOL
+
+
+def submit_get(ip, community, oid, port=161, timeout=2):
+    # type: (str, str, str, int, int) -> Future
+    '''
+    See :py:meth:`.Pool.submit_get`.
+    '''
+    return get_pool().submit_get(ip, community, oid, port, timeout)
+
+
+def submit_multiget(ip, community, oids, port=161, timeout=2):
+    # type: (str, str, List[str], int, int) -> Future
+    '''
+    See :py:meth:`.Pool.submit_multiget`.
+    '''
+    return get_pool().submit_multiget(ip, community, oids, port, timeout)
+
+
+def submit_bulkget(ip, community, scalar_oids, repeating_oids,
+                   max_list_size=1, port=161, timeout=2):
+    # type: (str, str, List[str], List[str], int, int, int) -> Future
+    '''
+    See :py:meth:`.Pool.submit_bulkget`.
+    '''
+    return get_pool().submit_bulkget(ip, community, scalar_oids,
+                                     repeating_oids, max_list_size, port,
+                                     timeout)
+
+
+def submit_walk(ip, community, oid, port=161, timeout=2,
+                errors=raw.ERRORS_STRICT):
+    # type: (str, str, str, int, int, str) -> Future
+    '''
+    See :py:meth:`.Pool.submit_walk`.
+    '''
+    return get_pool().submit_walk(ip, community, oid, port, timeout, errors)
+
+
+def submit_multiwalk(ip, community, oids, port=161, timeout=2,
+                     errors=raw.ERRORS_STRICT):
+    # type: (str, str, List[str], int, int, str) -> Future
+    '''
+    See :py:meth:`.Pool.submit_multiwalk`.
+    '''
+    return get_pool().submit_multiwalk(ip, community, oids, port, timeout,
+                                       errors)
+
+
+def submit_bulkwalk(ip, community, oids, bulk_size=10, port=161, timeout=2):
+    # type: (str, str, List[str], int, int, int) -> Future
+    '''
+    See :py:meth:`.Pool.submit_bulkwalk`.
+    '''
+    return get_pool().submit_bulkwalk(ip, community, oids, bulk_size, port,
+                                      timeout)
+
+
+def submit_table(ip, community, oid, port=161, num_base_nodes=0, timeout=2):
+    # type: (str, str, str, int, int, int) -> Future
+    '''
+    See :py:meth:`.Pool.submit_table`.
+    '''
+    return get_pool().submit_table(ip, community, oid, port, num_base_nodes,
+                                   timeout)
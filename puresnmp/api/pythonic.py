@@ -45,6 +45,18 @@ _set = set
 LOG = logging.getLogger(__name__)
 
 
+def _pythonize(value):
+    # type: (Any) -> Pythonized
+    """
+    Values fetched with ``pythonize=True`` are already pure Python objects.
+    Everything else is converted using
+    :py:meth:`~puresnmp.x690.types.Type.pythonize`.
+    """
+    if isinstance(value, Type):
+        return value.pythonize()
+    return value
+
+
 def get(ip, community, oid, port=161, timeout=2):
     # type: (str, str, str, int, int) -> Pythonized
     """
@@ -65,8 +77,9 @@ def multiget(ip, community, oids, port=161, timeout=2):
 
     See the "raw" equivalent for detailed documentation & examples.
     """
-    raw_output = raw.multiget(ip, community, oids, port, timeout)
-    pythonized = [value.pythonize() for value in raw_output]
+    raw_output = raw.multiget(ip, community, oids, port, timeout,
+                              pythonize=True)
+    pythonized = [_pythonize(value) for value in raw_output]
     return pythonized
 
 
@@ -89,8 +102,10 @@ def multigetnext(ip, community, oids, port=161, timeout=2):
 
     See the "raw" equivalent for detailed documentation & examples.
     """
-    raw_output = raw.multigetnext(ip, community, oids, port, timeout)
-    pythonized = [VarBind(oid, value.pythonize()) for oid, value in raw_output]
+    raw_output = raw.multigetnext(ip, community, oids, port, timeout,
+                                  pythonize=True)
+    pythonized = [VarBind(oid, _pythonize(value))
+                  for oid, value in raw_output]
     return pythonized
 
 
@@ -103,9 +118,10 @@ def walk(ip, community, oid, port=161, timeout=2):
     See the "raw" equivalent for detailed documentation & examples.
     """
 
-    raw_result = raw.walk(ip, community, oid, port, timeout)
+    raw_result = raw.walk(ip, community, oid, port, timeout,
+                          fetcher=multigetnext)
     for raw_oid, raw_value in raw_result:
-        yield VarBind(raw_oid, raw_value.pythonize())
+        yield VarBind(raw_oid, _pythonize(raw_value))
 
 
 def multiwalk(ip, community, oids, port=161, timeout=2,
@@ -119,9 +135,7 @@ def multiwalk(ip, community, oids, port=161, timeout=2,
     """
     raw_output = raw.multiwalk(ip, community, oids, port, timeout, fetcher)
     for oid, value in raw_output:
-        if isinstance(value, Type):
-            value = value.pythonize()
-        yield VarBind(oid, value)
+        yield VarBind(oid, _pythonize(value))
 
 
 def set(ip, community, oid, value, port=161, timeout=2):  # pylint: disable=redefined-builtin
@@ -185,7 +199,7 @@ def bulkwalk(ip, community, oids, bulk_size=10, port=161):
 
     result = multiwalk(
         ip, community, oids, port=port,
-        fetcher=raw._bulkwalk_fetcher(bulk_size))  # pylint: disable=protected-access
+        fetcher=raw._bulkwalk_fetcher(bulk_size, pythonize=True))  # pylint: disable=protected-access
     for oid, value in result:
         yield VarBind(oid, value)
 
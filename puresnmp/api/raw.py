@@ -11,37 +11,54 @@ case it's recommended to use :py:mod:`puresnmp.api.raw`.
 '''
 from __future__ import unicode_literals
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 import logging
 import sys
+import threading
 
 from ..x690.types import (
-    Integer,
     ObjectIdentifier,
-    OctetString,
     Sequence,
     Type,
 )
-from ..x690.util import to_bytes, tablify
+from ..x690.util import tablify
+from ..columnar import (
+    ColumnarTable,  # NOQA (must be here for type detection)
+    TableDecoder,
+)
 from ..exc import SnmpError, NoSuchOID, FaultySNMPImplementation
 from ..pdu import (
     BulkGetRequest,
     GetNextRequest,
     GetRequest,
+    MessageTemplate,
     SetRequest,
     VarBind,
+    decode_known_values,
+    decode_python_varbinds,
+    encode_message,
+    message_prefix,
 )
-from ..const import Version
 from ..transport import send, get_request_id
 from ..util import (
     BulkResult,  # NOQA (must be here for type detection)
+    OIDTrie,
     get_unfinished_walk_oids,
     group_varbinds,
+    split_walk_ranges,
+    to_oid,
 )
 
 if TYPE_CHECKING:  # pragma: no cover
     # pylint: disable=unused-import, invalid-name, ungrouped-imports
-    from typing import Any, Callable, Dict, Generator, List, Tuple, Union, Set
+    from typing import (Any, Callable, Dict, Generator, Iterator, List,
+                        Optional, Tuple, Union, Set)
+
+try:
+    from queue import Empty, Full, Queue
+except ImportError:  # pragma: no cover
+    from Queue import Empty, Full, Queue  # type: ignore
 
 try:
     unicode  # type: Callable[[Any], str]
@@ -57,6 +74,18 @@ ERRORS_STRICT = 'strict'
 ERRORS_WARN = 'warn'
 
 
+def _decode_varbinds(response, pythonize):
+    # type: (bytes, bool) -> List[VarBind]
+    """
+    Extracts the varbinds from the SNMP response message *response*. The
+    values are either :py:class:`~puresnmp.x690.types.Type` instances or, if
+    *pythonize* is true, pure Python objects.
+    """
+    if pythonize:
+        return decode_python_varbinds(response)
+    return Sequence.from_bytes(response, lazy=True)[2].varbinds
+
+
 def get(ip, community, oid, port=161, timeout=2):
     # type: ( str, str, str, int, int ) -> Type
     """
@@ -71,8 +100,8 @@ def get(ip, community, oid, port=161, timeout=2):
     return multiget(ip, community, [oid], port, timeout=timeout)[0]
 
 
-def multiget(ip, community, oids, port=161, timeout=2):
-    # type: ( str, str, List[str], int, int ) -> List[Type]
+def multiget(ip, community, oids, port=161, timeout=2, pythonize=False):
+    # type: ( str, str, List[str], int, int, bool ) -> List[Type]
     """
     Executes an SNMP GET request with multiple OIDs and returns a list of pure
     Python objects. The order of the output items is the same order as the OIDs
@@ -82,20 +111,62 @@ def multiget(ip, community, oids, port=161, timeout=2):
 
         >>> multiget('192.168.1.1', 'private', ['1.2.3.4', '1.2.3.5'])
         ['non-functional example', 'second value']
+
+    If *pythonize* is true, the values are decoded directly into pure Python
+    objects (see :py:func:`puresnmp.pdu.decode_python_varbinds`).
+    """
+
+    parsed_oids = [to_oid(oid) for oid in oids]
+    request = GetRequest(get_request_id(), *parsed_oids)
+    packet = encode_message(request, message_prefix(community))
+    response = send(ip, port, packet, timeout=timeout)
+    return _multiget_response(response, oids, pythonize)
+
+
+def compile_get(community, oids):
+    # type: (str, List[str]) -> MessageTemplate
+    """
+    Encodes a GET request for *oids* once for use with
+    :py:func:`~.multiget_compiled`. This avoids parsing the OIDs and encoding
+    the request again when the same values are polled repeatedly (f.ex. from
+    many devices in a fixed interval).
+
+    Example::
+
+        >>> template = compile_get('private', ['1.2.3.4', '1.2.3.5'])
+        >>> multiget_compiled('192.168.1.1', template)
+        ['non-functional example', 'second value']
     """
+    parsed_oids = [to_oid(oid) for oid in oids]
+    return MessageTemplate(GetRequest(0, *parsed_oids),
+                           message_prefix(community))
 
-    parsed_oids = [OID(oid) for oid in oids]
 
-    packet = Sequence(
-        Integer(Version.V2C),
-        OctetString(community),
-        GetRequest(get_request_id(), *parsed_oids)
-    )
+def multiget_compiled(ip, template, port=161, timeout=2, pythonize=False):
+    # type: (str, MessageTemplate, int, int, bool) -> List[Type]
+    """
+    Same as :py:func:`~.multiget` but sends a request prepared by
+    :py:func:`~.compile_get`. Only the request-id is filled in.
+    """
+    packet = template.render(get_request_id())
+    response = send(ip, port, packet, timeout=timeout)
+    return _multiget_response(response, template.oids, pythonize)
 
-    response = send(ip, port, to_bytes(packet), timeout=timeout)
-    raw_response = Sequence.from_bytes(response)
 
-    output = [value for _, value in raw_response[2].varbinds]
+def _multiget_response(response, oids, pythonize):
+    # type: (bytes, List[Any], bool) -> List[Type]
+    """
+    Extracts the values from the response to a GET request for *oids*.
+
+    The agent usually returns exactly the requested OIDs. In that case only
+    the values are decoded (see :py:func:`puresnmp.pdu.decode_known_values`).
+    """
+    values = decode_known_values(response, [to_oid(oid) for oid in oids],
+                                 pythonize)
+    if values is not None:
+        return values
+    varbinds = _decode_varbinds(response, pythonize)
+    output = [value for _, value in varbinds]
     if len(output) != len(oids):
         raise SnmpError('Unexpected response. Expected %d varbind, '
                         'but got %d!' % (len(oids), len(output)))
@@ -115,8 +186,9 @@ def getnext(ip, community, oid, port=161, timeout=2):
     return multigetnext(ip, community, [oid], port, timeout=timeout)[0]
 
 
-def multigetnext(ip, community, oids, port=161, timeout=2):
-    # type: (str, str, List[str], int, int) -> List[VarBind]
+def multigetnext(ip, community, oids, port=161, timeout=2,
+                 pythonize=False):
+    # type: (str, str, List[str], int, int, bool) -> List[VarBind]
     """
     Function to send a single multi-oid GETNEXT request.
 
@@ -130,25 +202,32 @@ def multigetnext(ip, community, oids, port=161, timeout=2):
             VarBind(ObjectIdentifier(1, 2, 3, 0), 'non-functional example'),
             VarBind(ObjectIdentifier(1, 2, 4, 0), 'second value')
         ]
+
+    If *pythonize* is true, the values are decoded directly into pure Python
+    objects (see :py:func:`puresnmp.pdu.decode_python_varbinds`).
     """
     request = GetNextRequest(get_request_id(), *oids)
-    packet = Sequence(
-        Integer(Version.V2C),
-        OctetString(community),
-        request
-    )
-    response = send(ip, port, to_bytes(packet), timeout=timeout)
-    raw_response = Sequence.from_bytes(response)
-    response_object = raw_response[2]
-    if len(response_object.varbinds) != len(oids):
+    packet = encode_message(request, message_prefix(community))
+    response = send(ip, port, packet, timeout=timeout)
+    return _multigetnext_response(response, oids, pythonize)
+
+
+def _multigetnext_response(response, oids, pythonize):
+    # type: (bytes, List[Any], bool) -> List[VarBind]
+    """
+    Extracts the varbinds from the response to a GETNEXT request for *oids*
+    and verifies that they are successors of the requested OIDs.
+    """
+    varbinds = _decode_varbinds(response, pythonize)
+    if len(varbinds) != len(oids):
         raise SnmpError(
             'Invalid response! Expected exactly %d varbind, '
-            'but got %d' % (len(oids), len(response_object.varbinds)))
-    output = [VarBind(oid, value) for oid, value in response_object.varbinds]
+            'but got %d' % (len(oids), len(varbinds)))
+    output = [VarBind(oid, value) for oid, value in varbinds]
 
     # Verify that the OIDs we retrieved are successors of the requested OIDs.
     for requested, retrieved in zip(oids, output):
-        if not OID(requested) < retrieved.oid:
+        if not to_oid(requested) < retrieved.oid:
             stringified = unicode(retrieved.oid)  # TODO remove when Py2 is dropped
             raise FaultySNMPImplementation(
                 'The OID %s is not a successor of %s!' %
@@ -156,8 +235,9 @@ def multigetnext(ip, community, oids, port=161, timeout=2):
     return output
 
 
-def walk(ip, community, oid, port=161, timeout=2, errors=ERRORS_STRICT):
-    # type: (str, str, str, int, int, str) -> Generator[VarBind, None, None]
+def walk(ip, community, oid, port=161, timeout=2, errors=ERRORS_STRICT,
+         fetcher=multigetnext, read_ahead=0):
+    # type: (str, str, str, int, int, str, Callable[[str, str, List[str], int, int], List[VarBind]], int) -> Generator[VarBind, None, None]
     """
     Executes a sequence of SNMP GETNEXT requests and returns an generator over
     :py:class:`~puresnmp.pdu.VarBind` instances.
@@ -165,6 +245,8 @@ def walk(ip, community, oid, port=161, timeout=2, errors=ERRORS_STRICT):
     The generator stops when hitting an OID which is *not* a sub-node of the
     given start OID or at the end of the tree (whichever comes first).
 
+    *fetcher* and *read_ahead* are passed on to :py:func:`~.multiwalk`.
+
     Example::
 
         >>> walk('127.0.0.1', 'private', '1.3.6.1.2.1.1')
@@ -178,12 +260,12 @@ def walk(ip, community, oid, port=161, timeout=2, errors=ERRORS_STRICT):
     """
 
     return multiwalk(ip, community, [oid], port, timeout=timeout,
-                     errors=errors)
+                     fetcher=fetcher, errors=errors, read_ahead=read_ahead)
 
 
 def multiwalk(ip, community, oids, port=161, timeout=2, fetcher=multigetnext,
-              errors=ERRORS_STRICT):
-    # type: (str, str, List[str], int, int, Callable[[str, str, List[str], int, int], List[VarBind]], str) -> Generator[VarBind, None, None]
+              errors=ERRORS_STRICT, read_ahead=0):
+    # type: (str, str, List[str], int, int, Callable[[str, str, List[str], int, int], List[VarBind]], str, int) -> Generator[VarBind, None, None]
     """
     Executes a sequence of SNMP GETNEXT requests and returns an generator over
     :py:class:`~puresnmp.pdu.VarBind` instances.
@@ -191,41 +273,65 @@ def multiwalk(ip, community, oids, port=161, timeout=2, fetcher=multigetnext,
     This is the same as :py:func:`~.walk` except that it is capable of
     iterating over multiple OIDs at the same time.
 
+    By default, the next request is only sent once the consumer has taken
+    all values of the previous response from the generator. With a positive
+    *read_ahead*, the requests are sent from a background thread as soon as
+    the previous response has arrived, so the network round trips overlap
+    with the work of the consumer. Up to *read_ahead* responses are
+    buffered before the thread waits for the consumer.
+
     Example::
 
         >>> multiwalk('127.0.0.1', 'private', [
         ...     '1.3.6.1.2.1.1', '1.3.6.1.4.1.1'])
         <generator object multiwalk at 0x7fa2f775cf68>
     """
+    batches = _walk_batches(ip, community, oids, port, timeout, fetcher,
+                            errors)
+    if read_ahead > 0:
+        batches = _read_ahead(batches, read_ahead)
+    for batch in batches:
+        for varbind in batch:
+            yield varbind
+
+
+def _walk_batches(ip, community, oids, port, timeout, fetcher, errors):
+    # type: (str, str, List[str], int, int, Callable[[str, str, List[str], int, int], List[VarBind]], str) -> Generator[List[VarBind], None, None]
+    """
+    Executes the requests of :py:func:`~.multiwalk` and generates the new
+    varbinds of each response as one list.
+    """
     LOG.debug('Walking on %d OIDs using %s', len(oids), fetcher.__name__)
 
     varbinds = fetcher(ip, community, oids, port, timeout)
-    requested_oids = [OID(oid) for oid in oids]
+    requested_oids = [to_oid(oid) for oid in oids]
+    requested_index = OIDTrie(requested_oids)
     grouped_oids = group_varbinds(varbinds, requested_oids)
     unfinished_oids = get_unfinished_walk_oids(grouped_oids)
     LOG.debug('%d of %d OIDs need to be continued',
               len(unfinished_oids),
               len(oids))
     yielded = _set([])  # type: ignore
+    batch = []
     for var in sorted(grouped_oids.values()):
         for varbind in var:
-            containment = [varbind.oid in _ for _ in requested_oids]
-            if not any(containment) or varbind.oid in yielded:  # type: ignore
+            if (not requested_index.prefixes(varbind.oid) or
+                    varbind.oid in yielded):  # type: ignore
                 LOG.debug('Unexpected device response: Returned VarBind %s '
                           'was either not contained in the requested tree or '
                           'appeared more than once. Skipping!', varbind)
                 continue
             yielded.add(varbind.oid)  # type: ignore
-            yield varbind
+            batch.append(varbind)
+    yield batch
 
     # As long as we have unfinished OIDs, we need to continue the walk for
     # those.
     while unfinished_oids:
         next_fetches = [_[1].value.oid for _ in unfinished_oids]
-        next_fetches_str = [unicode(_) for _ in next_fetches]
         try:
             varbinds = fetcher(ip, community,
-                               next_fetches_str,
+                               next_fetches,
                                port,
                                timeout)
         except NoSuchOID:
@@ -236,7 +342,8 @@ def multiwalk(ip, community, oids, port=161, timeout=2, fetcher=multigetnext,
                 LOG.warning('SNMP walk aborted prematurely due to faulty SNMP '
                             'implementation on device %r! Upon running a '
                             'GetNext on OIDs %r it returned the following '
-                            'error: %s', ip, next_fetches_str, exc)
+                            'error: %s', ip,
+                            [unicode(_) for _ in next_fetches], exc)
                 break
             raise
         grouped_oids = group_varbinds(varbinds,
@@ -246,13 +353,72 @@ def multiwalk(ip, community, oids, port=161, timeout=2, fetcher=multigetnext,
         LOG.debug('%d of %d OIDs need to be continued',
                   len(unfinished_oids),
                   len(oids))
+        batch = []
         for var in sorted(grouped_oids.values()):
             for varbind in var:
-                containment = [varbind.oid in _ for _ in requested_oids]
-                if not any(containment) or varbind.oid in yielded:  # type: ignore
+                if (not requested_index.prefixes(varbind.oid) or
+                        varbind.oid in yielded):  # type: ignore
                     continue
                 yielded.add(varbind.oid)  # type: ignore
-                yield varbind
+                batch.append(varbind)
+        yield batch
+
+
+def _read_ahead(batches, size):
+    # type: (Iterator[List[VarBind]], int) -> Generator[List[VarBind], None, None]
+    """
+    Takes the items of *batches* in a background thread and generates them.
+    At most *size* items are taken ahead of the consumer. Exceptions raised
+    by *batches* are re-raised in the consumer.
+    """
+    buffer = Queue(size)  # type: Queue
+    stopped = threading.Event()
+
+    def put(item):
+        # type: (Tuple[Optional[List[VarBind]], Optional[Exception]]) -> bool
+        """
+        Waits for room in the buffer and adds *item* to it. Returns ``False``
+        without adding it once the consumer has stopped.
+        """
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.05)
+                return True
+            except Full:
+                pass
+        return False
+
+    def produce():
+        # type: () -> None
+        try:
+            for batch in batches:
+                if not put((batch, None)) or stopped.is_set():
+                    return
+        except Exception as exc:  # pylint: disable=broad-except
+            put((None, exc))
+        else:
+            put((None, None))
+
+    thread = threading.Thread(target=produce, name='puresnmp-read-ahead')
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            batch, exc = buffer.get()
+            if exc is not None:
+                raise exc
+            if batch is None:
+                return
+            yield batch
+    finally:
+        # The consumer may stop early. The producer notices this while waiting
+        # for room in the buffer and ends.
+        stopped.set()
+        while True:
+            try:
+                buffer.get_nowait()
+            except Empty:
+                break
 
 
 def set(ip, community, oid, value, port=161, timeout=2):  # pylint: disable=redefined-builtin
@@ -287,19 +453,30 @@ def multiset(ip, community, mappings, port=161, timeout=2):
         {'1.2.3': b'foo', '2.3.4': b'bar'}
     """
 
+    request = SetRequest(get_request_id(), _set_varbinds(mappings))
+    packet = encode_message(request, message_prefix(community))
+    response = send(ip, port, packet, timeout=timeout)
+    return _multiset_response(response, mappings)
+
+
+def _set_varbinds(mappings):
+    # type: (List[Tuple[str, Type]]) -> List[VarBind]
+    """
+    Converts the *mappings* of a SET request into varbinds.
+    """
     if any([not isinstance(v, Type) for k, v in mappings]):
         raise TypeError('SNMP requires typing information. The value for a '
                         '"set" request must be an instance of "Type"!')
 
-    binds = [VarBind(OID(k), v)
-             for k, v in mappings]
+    return [VarBind(to_oid(k), v) for k, v in mappings]
+
 
-    request = SetRequest(get_request_id(), binds)
-    packet = Sequence(Integer(Version.V2C),
-                      OctetString(community),
-                      request)
-    response = send(ip, port, to_bytes(packet), timeout=timeout)
-    raw_response = Sequence.from_bytes(response)
+def _multiset_response(response, mappings):
+    # type: (bytes, List[Tuple[str, Type]]) -> Dict[str, Type]
+    """
+    Extracts the values from the response to a SET request for *mappings*.
+    """
+    raw_response = Sequence.from_bytes(response, lazy=True)
     output = {
         unicode(oid): value
         for oid, value in raw_response[2].varbinds
@@ -310,6 +487,70 @@ def multiset(ip, community, mappings, port=161, timeout=2):
     return output
 
 
+def _bulkget_varbinds(ip, community, scalar_oids, repeating_oids,
+                      max_list_size, port, timeout, pythonize=False):
+    # type: (str, str, List[Union[str, ObjectIdentifier]], List[Union[str, ObjectIdentifier]], int, int, int) -> Tuple[List[VarBind], List[VarBind]]
+    """
+    Executes a GetBulk request and returns the scalar and repeating varbinds
+    as two lists of :py:class:`~puresnmp.pdu.VarBind` instances (without
+    converting the OIDs to strings).
+
+    If *pythonize* is true, the values are decoded directly into pure Python
+    objects (see :py:func:`puresnmp.pdu.decode_python_varbinds`).
+
+    See :py:func:`~.bulkget` for details about the arguments.
+    """
+
+    non_repeaters, oids = _bulkget_oids(scalar_oids, repeating_oids)
+    request = BulkGetRequest(get_request_id(), non_repeaters, max_list_size,
+                             *oids)
+    packet = encode_message(request, message_prefix(community))
+    response = send(ip, port, packet, timeout=timeout)
+    return _bulkget_response(response, non_repeaters, max_list_size, oids,
+                             pythonize)
+
+
+def _bulkget_oids(scalar_oids, repeating_oids):
+    # type: (List[Union[str, ObjectIdentifier]], List[Union[str, ObjectIdentifier]]) -> Tuple[int, List[ObjectIdentifier]]
+    """
+    Returns the number of non-repeaters and the list of all OIDs of a GetBulk
+    request.
+    """
+    scalar_oids = scalar_oids or []  # protect against empty values
+    repeating_oids = repeating_oids or []  # protect against empty values
+
+    oids = [
+        to_oid(oid) for oid in scalar_oids
+    ] + [
+        to_oid(oid) for oid in repeating_oids
+    ]
+    return len(scalar_oids), oids
+
+
+def _bulkget_response(response, non_repeaters, max_list_size, oids,
+                      pythonize):
+    # type: (bytes, int, int, List[ObjectIdentifier], bool) -> Tuple[List[VarBind], List[VarBind]]
+    """
+    Splits the response to a GetBulk request into the scalar and repeating
+    varbinds.
+    """
+    varbinds = _decode_varbinds(response, pythonize)
+
+    # See RFC=3416 for details of the following calculation
+    n = min(non_repeaters, len(oids))
+    m = max_list_size
+    r = max(len(oids) - n, 0)  # pylint: disable=invalid-name
+    expected_max_varbinds = n + (m * r)
+
+    if len(varbinds) > expected_max_varbinds:
+        raise SnmpError('Unexpected response. Expected no more than %d '
+                        'varbinds, but got %d!' % (
+                            expected_max_varbinds, len(oids)))
+
+    # cut off the scalar OIDs from the listing(s)
+    return varbinds[0:non_repeaters], varbinds[non_repeaters:]
+
+
 def bulkget(ip, community, scalar_oids, repeating_oids, max_list_size=1,
             port=161, timeout=2):
     # type: (str, str, List[str], List[str], int, int, int) -> BulkResult
@@ -376,40 +617,9 @@ def bulkget(ip, community, scalar_oids, repeating_oids, max_list_size=1,
                 ('1.3.6.1.2.1.5.10.0', b'\x00')]))
     """
 
-    scalar_oids = scalar_oids or []  # protect against empty values
-    repeating_oids = repeating_oids or []  # protect against empty values
-
-    oids = [
-        OID(oid) for oid in scalar_oids
-    ] + [
-        OID(oid) for oid in repeating_oids
-    ]
-
-    non_repeaters = len(scalar_oids)
-
-    packet = Sequence(
-        Integer(Version.V2C),
-        OctetString(community),
-        BulkGetRequest(get_request_id(), non_repeaters, max_list_size, *oids)
-    )
-
-    response = send(ip, port, to_bytes(packet), timeout=timeout)
-    raw_response = Sequence.from_bytes(response)
-
-    # See RFC=3416 for details of the following calculation
-    n = min(non_repeaters, len(oids))
-    m = max_list_size
-    r = max(len(oids) - n, 0)  # pylint: disable=invalid-name
-    expected_max_varbinds = n + (m * r)
-
-    if len(raw_response[2].varbinds) > expected_max_varbinds:
-        raise SnmpError('Unexpected response. Expected no more than %d '
-                        'varbinds, but got %d!' % (
-                            expected_max_varbinds, len(oids)))
-
-    # cut off the scalar OIDs from the listing(s)
-    scalar_tmp = raw_response[2].varbinds[0:len(scalar_oids)]
-    repeating_tmp = raw_response[2].varbinds[len(scalar_oids):]
+    scalar_tmp, repeating_tmp = _bulkget_varbinds(
+        ip, community, scalar_oids, repeating_oids, max_list_size,
+        port, timeout)
 
     # prepare output for scalar OIDs
     scalar_out = {
@@ -425,7 +635,7 @@ def bulkget(ip, community, scalar_oids, repeating_oids, max_list_size=1,
     return BulkResult(scalar_out, repeating_out)
 
 
-def _bulkwalk_fetcher(bulk_size=10):
+def _bulkwalk_fetcher(bulk_size=10, pythonize=False):
     # type: (int) -> Callable[[str, str, List[str], int, int], List[VarBind]]
     """
     Create a bulk fetcher with a fixed limit on "repeatable" OIDs.
@@ -435,9 +645,9 @@ def _bulkwalk_fetcher(bulk_size=10):
         '''
         Executes a SNMP BulkGet request.
         '''
-        result = bulkget(ip, community, [], oids, max_list_size=bulk_size,
-                         port=port, timeout=timeout)
-        return [VarBind(OID(k), v) for k, v in result.listing.items()]
+        _, repeating = _bulkget_varbinds(ip, community, [], oids, bulk_size,
+                                         port, timeout, pythonize)
+        return repeating
 
     if sys.version_info < (3, 0):
         fetcher.__name__ = str('_bulkwalk_fetcher(%d)' % bulk_size)
@@ -446,8 +656,8 @@ def _bulkwalk_fetcher(bulk_size=10):
     return fetcher
 
 
-def bulkwalk(ip, community, oids, bulk_size=10, port=161):
-    # type: (str, str, List[str], int, int) -> Generator[VarBind, None, None]
+def bulkwalk(ip, community, oids, bulk_size=10, port=161, read_ahead=0):
+    # type: (str, str, List[str], int, int, int) -> Generator[VarBind, None, None]
     """
     More efficient implementation of :py:func:`~.walk`. It uses
     :py:func:`~.bulkget` under the hood instead of :py:func:`~.getnext`.
@@ -461,6 +671,8 @@ def bulkwalk(ip, community, oids, bulk_size=10, port=161):
     :param bulk_size: How many varbinds to request from the remote host with
         one request.
     :param port: The TCP port of the remote host.
+    :param read_ahead: The number of responses to fetch ahead of the
+        consumer (see :py:func:`~.multiwalk`).
 
     Example::
 
@@ -486,11 +698,98 @@ def bulkwalk(ip, community, oids, bulk_size=10, port=161):
         raise TypeError('OIDS need to be passed as list!')
 
     result = multiwalk(ip, community, oids, port=port,
-                       fetcher=_bulkwalk_fetcher(bulk_size))
+                       fetcher=_bulkwalk_fetcher(bulk_size),
+                       read_ahead=read_ahead)
     for oid, value in result:
         yield VarBind(oid, value)
 
 
+def _walk_range(ip, community, root, start, stop, port, timeout, fetcher,
+                stopped):
+    # type: (str, str, ObjectIdentifier, ObjectIdentifier, Optional[ObjectIdentifier], int, int, Callable[[str, str, List[str], int, int], List[VarBind]], threading.Event) -> List[VarBind]
+    """
+    Walks one piece returned by
+    :py:func:`~puresnmp.util.split_walk_ranges`. The walk ends early once
+    *stopped* is set.
+    """
+    # pylint: disable=too-many-arguments
+    output = []  # type: List[VarBind]
+    previous = start
+    while not stopped.is_set():
+        try:
+            varbinds = fetcher(ip, community, [previous], port, timeout)
+        except NoSuchOID:
+            # Reached end of OID tree
+            return output
+        if not varbinds:
+            return output
+        for varbind in varbinds:
+            if varbind.oid not in root or (stop is not None and
+                                           stop < varbind.oid):
+                return output
+            if not previous < varbind.oid:
+                raise FaultySNMPImplementation(
+                    'The OID %s is not a successor of %s!' %
+                    (unicode(varbind.oid), unicode(previous)))
+            output.append(varbind)
+            previous = varbind.oid
+    return output
+
+
+def parallel_walk(ip, community, oids, port=161, timeout=2, bulk_size=10,
+                  split_points=None, max_workers=4, fetcher=None):
+    # type: (str, str, List[str], int, int, int, Optional[List[str]], int, Optional[Callable[[str, str, List[str], int, int], List[VarBind]]]) -> Generator[VarBind, None, None]
+    """
+    Walks the trees below *oids* (f.ex. the columns of a large table) with
+    up to *max_workers* concurrent chains of requests instead of one.
+
+    Each OID is walked separately. With *split_points*, each tree is
+    additionally split into ranges which are walked concurrently. The split
+    points are OIDs relative to the walked OIDs. They should divide the rows
+    into similarly sized parts. For tables indexed by MAC or IP addresses,
+    the first index node is a good candidate::
+
+        >>> fdb = parallel_walk(ip, community, ['1.3.6.1.2.1.17.4.3.1.2'],
+        ...                     split_points=['64', '128', '192'])
+
+    The requests use GETBULK with *bulk_size* repetitions unless another
+    *fetcher* is given (see :py:func:`~.multiwalk`).
+
+    Unlike :py:func:`~.multiwalk`, the result is ordered by walked OID (and
+    not by row). It contains every OID once.
+
+    If the consumer stops early, the running pieces end after their current
+    request.
+    """
+    # pylint: disable=too-many-arguments
+    if not isinstance(oids, list):
+        raise TypeError('OIDS need to be passed as list!')
+    fetcher = fetcher or _bulkwalk_fetcher(bulk_size)
+    ranges = split_walk_ranges(oids, split_points)
+    LOG.debug('Walking on %d OIDs in %d pieces using %s', len(oids),
+              len(ranges), fetcher.__name__)
+    yielded = _set([])  # type: ignore
+    stopped = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pieces = []  # type: List[Any]
+    try:
+        for root, start, stop in ranges:
+            pieces.append(executor.submit(_walk_range, ip, community, root,
+                                          start, stop, port, timeout,
+                                          fetcher, stopped))
+        for piece in pieces:
+            for varbind in piece.result():
+                if varbind.oid in yielded:  # type: ignore
+                    continue
+                yielded.add(varbind.oid)  # type: ignore
+                yield varbind
+    finally:
+        stopped.set()
+        for piece in pieces:
+            piece.cancel()
+        executor.shutdown(wait=False)
+
+
 def table(ip, community, oid, port=161, num_base_nodes=0):
     # type (str, str, str, int, int) ->
     """
@@ -506,3 +805,36 @@ def table(ip, community, oid, port=161, num_base_nodes=0):
     tmp = walk(ip, community, oid, port=port)
     as_table = tablify(tmp, num_base_nodes=num_base_nodes)
     return as_table
+
+
+def columnar_table(ip, community, oid, bulk_size=10, port=161, timeout=2,
+                   num_base_nodes=0, use_numpy=True):
+    # type: (str, str, str, int, int, int, int, bool) -> ColumnarTable
+    """
+    Walks over a table using "bulk" requests and returns it as
+    :py:class:`~puresnmp.columnar.ColumnarTable`.
+
+    Contrary to :py:func:`~.table`, each numeric column is decoded straight
+    from the responses into one :py:class:`array.array` (or NumPy array if
+    NumPy is installed and *use_numpy* is true). No object is created per
+    cell. See :py:class:`~puresnmp.columnar.TableDecoder` for details about
+    the structure of the result and about *num_base_nodes*.
+
+    Example::
+
+        >>> result = columnar_table('127.0.0.1', 'private',
+        ...                         '1.3.6.1.2.1.31.1.1.1')
+        >>> result.index
+        array('Q', [1, 2, 3])
+        >>> result.columns[6]  # ifHCInOctets
+        array('Q', [82746, 1219283, 0])
+    """
+    decoder = TableDecoder(to_oid(oid), num_base_nodes)
+    next_oid = to_oid(oid)
+    prefix = message_prefix(community)
+    while next_oid is not None:
+        request = BulkGetRequest(get_request_id(), 0, bulk_size, next_oid)
+        packet = encode_message(request, prefix)
+        response = send(ip, port, packet, timeout=timeout)
+        next_oid = decoder.feed(response)
+    return decoder.result(use_numpy)
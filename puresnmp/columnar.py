@@ -0,0 +1,242 @@
+"""
+Decoding of SNMP tables into columns.
+
+Contrary to :py:func:`puresnmp.x690.util.tablify`, which creates one
+dictionary per row (and one typed value per cell), the
+:py:class:`~.TableDecoder` in this module reads the values straight from the
+response packets into one :py:class:`array.array` per numeric column. No
+Python object is kept per cell. This makes it possible to collect large
+counter tables (f.ex. ``ifXTable``) at short intervals.
+
+If NumPy is installed, the numeric columns can be returned as NumPy arrays.
+The arrays share the memory with the underlying :py:class:`array.array`
+instances, so this conversion does not copy anything.
+
+The table is usually fetched using :py:func:`puresnmp.api.raw.columnar_table`
+(or its asyncio equivalent) which uses "bulk" requests to walk over the
+table.
+"""
+from array import array
+from collections import namedtuple
+from typing import TYPE_CHECKING
+
+import six
+
+from .pdu import iter_raw_varbinds
+from .x690.types import ObjectIdentifier, Registry
+from .x690.util import int_from_bytes
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # pragma: no cover
+    numpy = None  # pylint: disable=invalid-name
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import
+    from typing import Any, Dict, List, Optional, Tuple, Union
+
+#: The result of :py:meth:`~.TableDecoder.result`.
+#:
+#: ``index`` contains the row IDs. ``columns`` maps the column ID (as
+#: :py:class:`int`) to the column values. The n-th value of each column
+#: belongs to the n-th row ID of the index.
+ColumnarTable = namedtuple('ColumnarTable', 'index columns')
+
+#: The identifier octet of the "endOfMibView" exception in responses.
+END_OF_MIB_VIEW = 0x82
+
+
+def _decode_subidentifiers(data):
+    # type: (Union[bytes, memoryview]) -> List[int]
+    """
+    Decodes a sequence of encoded OID sub-identifiers into integers. Contrary
+    to :py:meth:`puresnmp.x690.types.ObjectIdentifier.decode`, the first
+    octet is not split into two nodes.
+    """
+    output = []
+    value = 0
+    for char in six.iterbytes(data):
+        value = (value << 7) | (char & 0b1111111)
+        if not char & 0b10000000:
+            output.append(value)
+            value = 0
+    return output
+
+
+class TableDecoder(object):
+    """
+    Collects the cells of a table below *base_oid* into columns.
+
+    *num_base_nodes* has the same meaning as in
+    :py:func:`puresnmp.x690.util.tablify`. With the default value of ``0``,
+    the last OID node is the row ID and the second-to-last node the column
+    ID. The index of the resulting table is an ``array('Q')`` in that case.
+    Otherwise the column ID is the node following the first *num_base_nodes*
+    nodes and the row ID consists of all remaining nodes. The index is then a
+    list of dotted strings (like the ``'0'`` column of
+    :py:func:`~puresnmp.x690.util.tablify`).
+
+    Numeric columns are stored in :py:class:`array.array` instances, using the
+    type code defined in ``ARRAY_TYPECODE`` on the value type (f.ex. ``'Q'``
+    for :py:class:`~puresnmp.types.Counter64`). Note that time ticks are
+    stored as raw integers (hundredths of a second). All other columns are
+    lists of pure Python values (see
+    :py:meth:`~puresnmp.x690.types.Type.decode_python`).
+
+    Missing cells are stored as ``0`` in numeric and as ``None`` in other
+    columns.
+
+    Example::
+
+        >>> decoder = TableDecoder(OID('1.3.6.1.2.1.31.1.1.1'), 10)
+        >>> next_oid = decoder.feed(response)
+        >>> decoder.result()
+        ColumnarTable(index=array('Q', [1, 2]), columns={
+            6: array('Q', [1234, 5678]), ...})
+    """
+
+    def __init__(self, base_oid, num_base_nodes=0):
+        # type: (ObjectIdentifier, int) -> None
+        # pylint: disable=protected-access
+        self._prefix = base_oid._content
+        if num_base_nodes == 1:
+            raise ValueError('The first two OID nodes cannot be separated. '
+                             'Use num_base_nodes=0 or a value above 1!')
+        # The first content octet contains the first *two* nodes.
+        self._skip = max(num_base_nodes - 1, 0)
+        self._rows = {}  # type: Dict[bytes, int]
+        self._columns = {}  # type: Dict[bytes, Tuple[int, Any]]
+        self._last = None  # type: Optional[bytes]
+        if num_base_nodes:
+            self._index = []  # type: Union[array, List[str]]
+        else:
+            self._index = array('Q')
+
+    def _split(self, oid):
+        # type: (memoryview) -> Tuple[bytes, bytes]
+        """
+        Splits the OID content octets into the encoded column and row IDs.
+        """
+        if self._skip:
+            position = 0
+            skipped = 0
+            end = len(oid)
+            while skipped < self._skip and position < end:
+                if not six.indexbytes(oid, position) & 0b10000000:
+                    skipped += 1
+                position += 1
+            row = position
+            while row < end and six.indexbytes(oid, row) & 0b10000000:
+                row += 1
+            row += 1
+            return bytes(oid[position:row]), bytes(oid[row:])
+
+        # The row ID is the last sub-identifier, the column ID the one before.
+        row = len(oid) - 1
+        while row > 0 and six.indexbytes(oid, row - 1) & 0b10000000:
+            row -= 1
+        column = row - 1
+        while column > 0 and six.indexbytes(oid, column - 1) & 0b10000000:
+            column -= 1
+        return bytes(oid[column:row]), bytes(oid[row:])
+
+    def _row_position(self, row_key):
+        # type: (bytes) -> int
+        position = self._rows.get(row_key)
+        if position is None:
+            position = len(self._rows)
+            self._rows[row_key] = position
+            nodes = _decode_subidentifiers(row_key)
+            if isinstance(self._index, array):
+                self._index.append(nodes[0])
+            else:
+                self._index.append('.'.join([str(node) for node in nodes]))
+        return position
+
+    def _column(self, column_key, cls):
+        # type: (bytes, Optional[type]) -> Tuple[int, Any]
+        column = self._columns.get(column_key)
+        if column is None:
+            typecode = cls.ARRAY_TYPECODE if cls else None
+            values = array(typecode) if typecode else []  # type: Any
+            column = _decode_subidentifiers(column_key)[0], values
+            self._columns[column_key] = column
+        return column
+
+    def feed(self, response):
+        # type: (bytes) -> Optional[ObjectIdentifier]
+        """
+        Adds all cells contained in the SNMP response message *response*.
+
+        Returns the OID from which the walk should continue, or ``None`` if the
+        response contained the end of the table.
+        """
+        prefix = self._prefix
+        prefix_length = len(prefix)
+        last = None
+        for oid, identifier, value in iter_raw_varbinds(response):
+            if (identifier == END_OF_MIB_VIEW or
+                    oid[:prefix_length] != prefix or
+                    len(oid) == prefix_length):
+                return None
+            column_key, row_key = self._split(oid)
+            position = self._row_position(row_key)
+            last = oid
+            if identifier & 0b11000000 == 0b10000000:
+                # context-specific types are exceptions (noSuchInstance, ...)
+                continue
+            cls = Registry.lookup(identifier)
+            _, values = self._column(column_key, cls)
+            missing = position - len(values)
+            if isinstance(values, array):
+                if cls is None or cls.ARRAY_TYPECODE is None:
+                    continue
+                if missing > 0:
+                    values.extend(array(values.typecode, [0]) * missing)
+                value = int_from_bytes(value, 'big',
+                                       signed=values.typecode == 'q')
+            else:
+                if missing > 0:
+                    values.extend([None] * missing)
+                value = cls.decode_python(value) if cls else bytes(value)
+            if missing < 0:
+                values[position] = value
+            else:
+                values.append(value)
+
+        if last is None:
+            return None
+        last = bytes(last)
+        if last == self._last:
+            # The remote device did not advance. Stop here to avoid an endless
+            # loop.
+            return None
+        self._last = last
+        return ObjectIdentifier.from_content(last)
+
+    def result(self, use_numpy=True):
+        # type: (bool) -> ColumnarTable
+        """
+        Returns the collected table as :py:class:`~.ColumnarTable`.
+
+        If *use_numpy* is true and NumPy is installed, the numeric columns
+        and a numeric index are converted to NumPy arrays (without copying
+        the data). In that case, no more responses can be fed into the
+        decoder afterwards.
+        """
+        num_rows = len(self._rows)
+        columns = {}  # type: Dict[int, Any]
+        for column_id, values in self._columns.values():
+            missing = num_rows - len(values)
+            if isinstance(values, array):
+                if missing > 0:
+                    values.extend(array(values.typecode, [0]) * missing)
+                if use_numpy and numpy is not None:
+                    values = numpy.frombuffer(values, dtype=values.typecode)
+            elif missing > 0:
+                values.extend([None] * missing)
+            columns[column_id] = values
+        index = self._index
+        if isinstance(index, array) and use_numpy and numpy is not None:
+            index = numpy.frombuffer(index, dtype=index.typecode)
+        return ColumnarTable(index, columns)
@@ -27,6 +27,14 @@ class NoSuchOID(SnmpError):
     """
 
 
+class TooBig(SnmpError):
+    """
+    Exception which is raised when the agent answers with the error status
+    ``tooBig``: the response would exceed the maximum message size of the
+    agent (f.ex. because a bulk request asked for too many repetitions).
+    """
+
+
 class TooManyVarbinds(SnmpError):
     '''
     Exception which is raised when the number of VarBinds exceeds the limit
@@ -7,36 +7,62 @@ their type identifier header (f.ex. ``b'\\xa0'`` for a
 :py:class:`~.GetRequest`).
 """
 
-# TODO: Add a method to wrap a message in a full packet (including SNMP version
-#       and community). This can then replace some duplicated code in
-#       "puresnmp.get", "puresnmp.walk" & co.
-
 from collections import namedtuple
+from copy import copy
 from typing import TYPE_CHECKING
+import struct
+
+try:
+    from collections.abc import Sequence as AbcSequence
+except ImportError:  # pragma: no cover
+    from collections import Sequence as AbcSequence  # type: ignore
 
 import six
 
-from .const import MAX_VARBINDS
-from .exc import EmptyMessage, NoSuchOID, SnmpError, TooManyVarbinds
+from .const import MAX_VARBINDS, Version
+from .exc import (
+    EmptyMessage,
+    NoSuchOID,
+    SnmpError,
+    TooBig,
+    TooManyVarbinds,
+)
 from .x690.types import (
     Integer,
     Null,
     ObjectIdentifier,
+    OctetString,
+    Registry,
     Sequence,
     Type,
-    encode_length,
-    pop_tlv
+    UnknownType,
+    decode_tlv
+)
+from .x690.util import (
+    TypeInfo,
+    decode_length_at,
+    int_from_bytes,
+    patch_length,
+    reserve_length
 )
-from .x690.util import TypeInfo, to_bytes
 
 if TYPE_CHECKING:
     # pylint: disable=unused-import
-    from typing import List, Union
+    from typing import Any, Iterator, List, Optional, Tuple, Union
 
 
 if six.PY3:
     unicode = str  # pylint: disable=invalid-name
 
+#: The identifier octet of a constructed X.690 sequence
+SEQUENCE_IDENTIFIER = 0x30
+
+#: The smallest request-id which is encoded with four octets (see
+#: :py:class:`~.MessageTemplate`)
+MIN_FIXED_REQUEST_ID = 2**23
+
+_REQUEST_ID = struct.Struct('>i')
+
 
 class VarBind(namedtuple('VarBind', 'oid, value')):
     '''
@@ -53,6 +79,108 @@ class VarBind(namedtuple('VarBind', 'oid, value')):
         return super(VarBind, cls).__new__(cls, oid, value)
 
 
+class LazyVarBinds(AbcSequence):
+    '''
+    A read-only list of :py:class:`~.VarBind` instances which is backed by a
+    lazily decoded :py:class:`~puresnmp.x690.types.Sequence`. A VarBind is
+    only decoded when it is accessed by index or iteration.
+
+    As decoding is deferred, decoding errors are also deferred until access.
+    Like :py:meth:`.GetResponse.decode`, an empty value raises
+    :py:exc:`~puresnmp.exc.NoSuchOID`.
+    '''
+
+    def __init__(self, values):
+        # type: (Sequence) -> None
+        self._values = values
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        try:
+            return VarBind(*self._values[idx])
+        except EmptyMessage as exc:
+            raise NoSuchOID('Nothing found at the given OID (%s)' % exc)
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, tuple, LazyVarBinds)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def encode_pdu(buffer, identifier, request_id, field_a, field_b, varbinds):
+    # type: (bytearray, int, int, int, int, List[VarBind]) -> None
+    '''
+    Appends an encoded PDU to *buffer*. *field_a* and *field_b* are the two
+    integer fields following the request-id (error-status and error-index for
+    most PDUs, non-repeaters and max-repetitions for bulk requests).
+
+    The varbinds are encoded directly into *buffer*. Lengths are back-patched
+    once the nested values are written (see
+    :py:func:`puresnmp.x690.util.reserve_length`).
+    '''
+    buffer.append(identifier | 0b00100000)
+    pdu_position = reserve_length(buffer)
+    Integer(request_id).encode_into(buffer)
+    Integer(field_a).encode_into(buffer)
+    Integer(field_b).encode_into(buffer)
+    buffer.append(SEQUENCE_IDENTIFIER)
+    list_position = reserve_length(buffer)
+    for oid, value in varbinds:
+        buffer.append(SEQUENCE_IDENTIFIER)
+        varbind_position = reserve_length(buffer)
+        oid.encode_into(buffer)
+        value.encode_into(buffer)
+        patch_length(buffer, varbind_position)
+    patch_length(buffer, list_position)
+    patch_length(buffer, pdu_position)
+
+
+def message_prefix(community, version=Version.V2C):
+    # type: (str, int) -> bytes
+    '''
+    Returns the encoded SNMP version and community fields. These are the
+    first two values of every message sent to the same agent, so they can be
+    encoded once and reused with :py:func:`~.encode_message`.
+    '''
+    buffer = bytearray()
+    Integer(version).encode_into(buffer)
+    OctetString(community).encode_into(buffer)
+    return bytes(buffer)
+
+
+def encode_message(pdu, prefix):
+    # type: (Type, bytes) -> bytes
+    '''
+    Wraps *pdu* in a complete SNMP message. *prefix* contains the encoded
+    version and community (see :py:func:`~.message_prefix`).
+
+    Example::
+
+        >>> prefix = message_prefix('public')
+        >>> encode_message(GetRequest(1, ObjectIdentifier(1, 3)), prefix)
+        b'0\\x1f\\x02\\x01\\x01\\x04\\x06public\\xa0\\x12...'
+    '''
+    buffer = bytearray([SEQUENCE_IDENTIFIER])
+    position = reserve_length(buffer)
+    buffer.extend(prefix)
+    pdu.encode_into(buffer)
+    patch_length(buffer, position)
+    return bytes(buffer)
+
+
 ERROR_MESSAGES = {
     0: '(noError)',
     1: '(tooBig)',
@@ -76,6 +204,252 @@ ERROR_MESSAGES = {
 }
 
 
+def _raise_for_error(error_status):
+    # type: (int) -> None
+    '''
+    Raises a :py:exc:`~puresnmp.exc.SnmpError` if *error_status* (as integer)
+    is non-zero (:py:exc:`~puresnmp.exc.TooBig` for ``tooBig``).
+    '''
+    if error_status:
+        msg = ERROR_MESSAGES.get(error_status,
+                                 'Unknown Error: %s' % error_status)
+        # TODO Add detail from the error_index.
+        if error_status == 1:
+            raise TooBig('Error packet received: %s!' % msg)
+        raise SnmpError('Error packet received: %s!' % msg)
+
+
+def _skip_tlv(data, offset):
+    # type: (memoryview, int) -> int
+    '''
+    Returns the offset of the TLV value *following* the one at *offset*.
+    '''
+    length, start = decode_length_at(data, offset + 1)
+    return start + length
+
+
+def _request_id_position(data):
+    # type: (Union[bytes, bytearray, memoryview]) -> Optional[Tuple[int, int]]
+    '''
+    Returns the offset and length of the request-id value in the complete
+    SNMP message *data* or ``None`` if *data* is not an SNMP message.
+    '''
+    # pylint: disable=protected-access
+    try:
+        if six.indexbytes(data, 0) != SEQUENCE_IDENTIFIER:
+            return None
+        _, offset = decode_length_at(data, 1)
+        offset = _skip_tlv(data, offset)  # version
+        offset = _skip_tlv(data, offset)  # community
+        _, offset = decode_length_at(data, offset + 1)  # PDU header
+        if six.indexbytes(data, offset) != Integer._identifier:
+            return None
+        length, start = decode_length_at(data, offset + 1)
+    except (IndexError, NotImplementedError):
+        return None
+    if not length or start + length > len(data):
+        return None
+    return start, length
+
+
+def peek_request_id(data):
+    # type: (Union[bytes, bytearray, memoryview]) -> Optional[int]
+    '''
+    Returns the request-id of the complete SNMP message *data* (a request or
+    a response) by decoding only the message header. ``None`` is returned if
+    *data* is not an SNMP message.
+
+    This is used by the transports to match responses to requests without
+    decoding the varbinds.
+
+    Example::
+
+        >>> peek_request_id(readbytes('get_sysoid_01.hex'))
+        1401558560
+    '''
+    position = _request_id_position(data)
+    if position is None:
+        return None
+    start, length = position
+    return int_from_bytes(data[start:start + length], 'big', signed=True)
+
+
+class MessageTemplate(object):
+    '''
+    A complete SNMP message for *pdu* which is encoded once and sent many
+    times with different request-ids. *prefix* contains the encoded version
+    and community (see :py:func:`~.message_prefix`). The request-id of *pdu*
+    is ignored. The OIDs of *pdu* are available as ``oids``.
+
+    Request-ids from :py:data:`~.MIN_FIXED_REQUEST_ID` to ``2**31 - 1`` are
+    all encoded with four octets. For these, :py:meth:`~.render` only
+    inserts the request-id between the encoded parts before and after it.
+    Other request-ids are supported but need a complete encoding.
+
+    Example::
+
+        >>> prefix = message_prefix('public')
+        >>> template = MessageTemplate(
+        ...     GetRequest(0, ObjectIdentifier(1, 3)), prefix)
+        >>> template.render(12345678) == encode_message(
+        ...     GetRequest(12345678, ObjectIdentifier(1, 3)), prefix)
+        True
+    '''
+
+    def __init__(self, pdu, prefix):
+        # type: (Type, bytes) -> None
+        self.pdu = copy(pdu)
+        self.prefix = prefix
+        self.oids = [oid for oid, _ in self.pdu.varbinds]
+        self.pdu.request_id = MIN_FIXED_REQUEST_ID
+        message = encode_message(self.pdu, prefix)
+        start, length = _request_id_position(message)  # type: ignore
+        self._head = message[:start]
+        self._tail = message[start + length:]
+
+    def __repr__(self):
+        return '<%s %r>' % (self.__class__.__name__, self.pdu)
+
+    def render(self, request_id):
+        # type: (int) -> bytes
+        '''
+        Returns the message with *request_id*.
+        '''
+        if MIN_FIXED_REQUEST_ID <= request_id <= 0x7fffffff:
+            return b''.join((self._head, _REQUEST_ID.pack(request_id),
+                             self._tail))
+        pdu = copy(self.pdu)
+        pdu.request_id = request_id
+        return encode_message(pdu, self.prefix)
+
+
+def iter_raw_varbinds(data):
+    # type: (bytes) -> Iterator[Tuple[memoryview, int, memoryview]]
+    '''
+    Iterates over the varbinds in a complete SNMP response message (the
+    sequence containing the version, community and PDU) without decoding
+    them.
+
+    For each varbind, a tuple ``(oid, identifier, value)`` is generated.
+    *oid* contains the content octets of the OID, *identifier* is the type
+    identifier octet of the value (as :py:class:`int`) and *value* contains
+    the content octets of the value. Both *oid* and *value* are
+    :py:class:`memoryview` slices of *data*.
+
+    Errors reported in the PDU header raise a
+    :py:exc:`~puresnmp.exc.SnmpError` before anything is generated.
+    '''
+    if not data:
+        raise NoSuchOID('Nothing found at the given OID (No data to decode!)')
+    data = memoryview(data)
+    Sequence.validate(data)
+    _, offset = decode_length_at(data, 1)
+    offset = _skip_tlv(data, offset)  # version
+    offset = _skip_tlv(data, offset)  # community
+    _, offset = decode_length_at(data, offset + 1)  # PDU header
+    offset = _skip_tlv(data, offset)  # request-id
+    error_status, offset = decode_tlv(data, offset)
+    offset = _skip_tlv(data, offset)  # error-index
+    _raise_for_error(error_status.value)
+
+    length, offset = decode_length_at(data, offset + 1)
+    end = offset + length
+    if end > len(data):
+        raise ValueError('Corrupt packet: The varbind list expects %d more '
+                         'octets than available!' % (end - len(data)))
+    oid_identifier = ObjectIdentifier._identifier  # pylint: disable=protected-access
+    while offset < end:
+        _, offset = decode_length_at(data, offset + 1)  # varbind header
+        if six.indexbytes(data, offset) != oid_identifier:
+            raise ValueError('Corrupt packet: Expected an OID at position %d '
+                             'but got type 0x%02x' % (
+                                 offset, six.indexbytes(data, offset)))
+        length, start = decode_length_at(data, offset + 1)
+        offset = start + length
+        oid = data[start:offset]
+        identifier = six.indexbytes(data, offset)
+        if identifier == 0b11111111:
+            raise NotImplementedError('Long identifier types are not yet '
+                                      'implemented')
+        length, start = decode_length_at(data, offset + 1)
+        offset = start + length
+        if offset > end:
+            raise ValueError('Corrupt packet: The value at position %d '
+                             'exceeds the varbind list!' % start)
+        yield oid, identifier, data[start:offset]
+
+
+def decode_python_varbinds(data):
+    # type: (bytes) -> List[VarBind]
+    '''
+    Decodes a complete SNMP response message (the sequence containing the
+    version, community and PDU) and returns the contained varbinds.
+
+    The values are converted straight from the packet into pure Python values
+    using :py:meth:`~puresnmp.x690.types.Type.decode_python`. No
+    :py:class:`~puresnmp.x690.types.Type` instance is created for them. The
+    OIDs are returned as :py:class:`~puresnmp.x690.types.ObjectIdentifier`
+    instances (created directly from their content octets) as they are needed
+    to continue walks. Values of unknown types are returned as
+    :py:class:`bytes`.
+
+    Errors are handled the same way as in :py:meth:`.GetResponse.decode`.
+
+    Example::
+
+        >>> decode_python_varbinds(response)
+        [VarBind(oid=ObjectIdentifier((1, 3, 6, 1, 2, 1, 1, 3, 0)), value=42)]
+    '''
+    output = []  # type: List[VarBind]
+    for oid, identifier, value in iter_raw_varbinds(data):
+        cls = Registry.lookup(identifier)
+        try:
+            value = cls.decode_python(value) if cls else bytes(value)
+        except EmptyMessage as exc:
+            raise NoSuchOID('Nothing found at the given OID (%s)' % exc)
+        output.append(VarBind(ObjectIdentifier.from_content(bytes(oid)),
+                              value))
+    return output
+
+
+def decode_known_values(data, oids, pythonize=False):
+    # type: (bytes, List[ObjectIdentifier], bool) -> Optional[List[Any]]
+    '''
+    Returns the values of the complete SNMP response message *data* to a
+    request for exactly *oids* (f.ex. a GET request).
+
+    The OIDs in the response are not decoded. Instead, their content octets
+    are compared with the ones of *oids*. If the response contains other OIDs
+    or another number of varbinds, ``None`` is returned and the caller has to
+    decode the response completely.
+
+    The values are :py:class:`~puresnmp.x690.types.Type` instances or, if
+    *pythonize* is true, pure Python values (see
+    :py:func:`~.decode_python_varbinds`). Errors are handled the same way as
+    in :py:meth:`.GetResponse.decode`.
+    '''
+    # pylint: disable=protected-access
+    output = []  # type: List[Any]
+    for oid, identifier, value in iter_raw_varbinds(data):
+        index = len(output)
+        if index >= len(oids) or oid != oids[index]._content:
+            return None
+        cls = Registry.lookup(identifier)
+        try:
+            if cls is None:
+                output.append(bytes(value) if pythonize else
+                              UnknownType(identifier, bytes(value)))
+            elif pythonize:
+                output.append(cls.decode_python(value))
+            else:
+                output.append(cls.decode(value))
+        except EmptyMessage as exc:
+            raise NoSuchOID('Nothing found at the given OID (%s)' % exc)
+    if len(output) != len(oids):
+        return None
+    return output
+
+
 class PDU(Type):
     """
     The superclass for SNMP Messages (GET, SET, GETNEXT, ...)
@@ -90,21 +464,40 @@ class PDU(Type):
         an application object. This is callable from each subclass of
         :py:class:`~.PDU`.
         """
+        return cls._decode(data, lazy=False)
+
+    @classmethod
+    def decode_lazy(cls, data):
+        # type: (bytes) -> PDU
+        """
+        Same as :py:meth:`~.decode` but the varbinds are only decoded when
+        accessed. The request-id and error information are always decoded
+        immediately so errors are raised right away.
+
+        The ``varbinds`` attribute of the resulting instance is a
+        :py:class:`~.LazyVarBinds` instance.
+        """
+        return cls._decode(data, lazy=True)
+
+    @classmethod
+    def _decode(cls, data, lazy):
+        # type: (bytes, bool) -> PDU
         # TODO (advanced): recent tests revealed that this is *not symmetric*
         # with __bytes__ of this class. This should be ensured!
         if not data:
             raise EmptyMessage('No data to decode!')
-        request_id, data = pop_tlv(data)
-        error_status, data = pop_tlv(data)
-        error_index, data = pop_tlv(data)
-        if error_status.value:
-            msg = ERROR_MESSAGES.get(error_status.value,
-                                     'Unknown Error: %s' % error_status.value)
-            # TODO Add detail from the error_index.
-            raise SnmpError('Error packet received: %s!' % msg)
-        values, data = pop_tlv(data)
-
-        varbinds = [VarBind(*encoded_varbind) for encoded_varbind in values]
+        data = memoryview(data)
+        request_id, offset = decode_tlv(data)
+        error_status, offset = decode_tlv(data, offset)
+        error_index, offset = decode_tlv(data, offset)
+        _raise_for_error(error_status.value)
+        values, offset = decode_tlv(data, offset, lazy=lazy)
+
+        if lazy:
+            varbinds = LazyVarBinds(values)
+        else:
+            varbinds = [VarBind(*encoded_varbind)
+                        for encoded_varbind in values]
 
         return cls(
             request_id,
@@ -124,18 +517,13 @@ class PDU(Type):
             self.varbinds = varbinds
 
     def __bytes__(self):
-        wrapped_varbinds = [Sequence(vb.oid, vb.value) for vb in self.varbinds]
-        data = [
-            Integer(self.request_id),
-            Integer(self.error_status),
-            Integer(self.error_index),
-            Sequence(*wrapped_varbinds)
-        ]
-        payload = b''.join([to_bytes(chunk) for chunk in data])
+        buffer = bytearray()
+        self.encode_into(buffer)
+        return bytes(buffer)
 
-        tinfo = TypeInfo(TypeInfo.CONTEXT, TypeInfo.CONSTRUCTED, self.TAG)
-        length = encode_length(len(payload))
-        return to_bytes(tinfo) + length + payload
+    def encode_into(self, buffer):
+        encode_pdu(buffer, self._identifier, self.request_id,
+                   self.error_status, self.error_index, self.varbinds)
 
     def __repr__(self):
         return '%s(%r, %r)' % (
@@ -205,6 +593,18 @@ class GetResponse(PDU):
         except EmptyMessage as exc:
             raise NoSuchOID('Nothing found at the given OID (%s)' % exc)
 
+    @classmethod
+    def decode_lazy(cls, data):
+        # type: (bytes) -> PDU
+        """
+        Same as :py:meth:`~.decode` but decodes the varbinds lazily. See
+        :py:meth:`.PDU.decode_lazy`.
+        """
+        try:
+            return super(GetResponse, cls).decode_lazy(data)
+        except EmptyMessage as exc:
+            raise NoSuchOID('Nothing found at the given OID (%s)' % exc)
+
 
 class GetNextRequest(GetRequest):
     """
@@ -239,18 +639,13 @@ class BulkGetRequest(Type):
             self.varbinds.append(VarBind(oid, Null()))
 
     def __bytes__(self):
-        wrapped_varbinds = [Sequence(vb.oid, vb.value) for vb in self.varbinds]
-        data = [
-            Integer(self.request_id),
-            Integer(self.non_repeaters),
-            Integer(self.max_repeaters),
-            Sequence(*wrapped_varbinds)
-        ]
-        payload = b''.join([to_bytes(chunk) for chunk in data])
+        buffer = bytearray()
+        self.encode_into(buffer)
+        return bytes(buffer)
 
-        tinfo = TypeInfo(TypeInfo.CONTEXT, TypeInfo.CONSTRUCTED, self.TAG)
-        length = encode_length(len(payload))
-        return to_bytes(tinfo) + length + payload
+    def encode_into(self, buffer):
+        encode_pdu(buffer, self._identifier, self.request_id,
+                   self.non_repeaters, self.max_repeaters, self.varbinds)
 
     def __repr__(self):
         oids = [repr(oid) for oid, _ in self.varbinds]
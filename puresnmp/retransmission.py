@@ -0,0 +1,187 @@
+"""
+Retransmission of requests with adaptive timeouts.
+
+SNMP runs over UDP, so lost requests or responses have to be detected by a
+timeout and the request has to be sent again. Instead of waiting a fixed time
+for each attempt, the :py:class:`~.RetransmissionPolicy` estimates the
+round-trip time of each agent the same way TCP does (see :rfc:`6298`). Fast
+agents get short retransmission timeouts, slow agents (f.ex. over a WAN link)
+get longer ones. After each timeout, the retransmission timeout of the agent
+is doubled (with some random jitter) until a response arrives again.
+
+The ``timeout`` passed to the transports is the *total* deadline of one
+operation. All attempts (including the retransmissions) have to fit into that
+deadline.
+
+The policy is shared by :py:func:`puresnmp.transport.send` and
+:py:func:`puresnmp.aio.transport.send` (see
+:py:data:`puresnmp.transport.RETRANSMISSION`).
+"""
+
+import random
+import threading
+from typing import TYPE_CHECKING
+
+try:
+    from time import monotonic
+except ImportError:  # pragma: no cover
+    from time import time as monotonic  # type: ignore
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import
+    from typing import Dict, Hashable, Iterator, Optional, Tuple
+
+
+#: The number of attempts (including the first one) for each request.
+DEFAULT_RETRIES = 3
+
+#: The retransmission timeout (in seconds) used for an unknown agent.
+INITIAL_RTO = 1.0
+
+#: Lower bound of the retransmission timeout (in seconds).
+MIN_RTO = 0.1
+
+#: Upper bound of the retransmission timeout (in seconds).
+MAX_RTO = 30.0
+
+
+class RttEstimator(object):
+    """
+    Estimates the round-trip time of one agent and derives the
+    retransmission timeout (RTO) as described in :rfc:`6298`.
+
+    All values are in seconds. ``srtt`` and ``rttvar`` are ``None`` until the
+    first measurement was recorded.
+    """
+
+    ALPHA = 1 / 8.0
+    BETA = 1 / 4.0
+    K = 4
+
+    def __init__(self, initial_rto=INITIAL_RTO, min_rto=MIN_RTO,
+                 max_rto=MAX_RTO):
+        # type: (float, float, float) -> None
+        self.min_rto = min_rto
+        self.max_rto = max_rto
+        self.srtt = None  # type: Optional[float]
+        self.rttvar = None  # type: Optional[float]
+        self.rto = initial_rto
+
+    def __repr__(self):
+        return '<%s srtt=%r rttvar=%r rto=%r>' % (
+            self.__class__.__name__, self.srtt, self.rttvar, self.rto)
+
+    def update(self, rtt):
+        # type: (float) -> None
+        """
+        Records the measured round-trip time *rtt*.
+        """
+        if self.srtt is None or self.rttvar is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2.0
+        else:
+            self.rttvar = ((1 - self.BETA) * self.rttvar +
+                           self.BETA * abs(self.srtt - rtt))
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        rto = self.srtt + self.K * self.rttvar
+        self.rto = min(max(rto, self.min_rto), self.max_rto)
+
+    def backoff(self):
+        # type: () -> None
+        """
+        Doubles the retransmission timeout after a timeout.
+        """
+        self.rto = min(self.rto * 2, self.max_rto)
+
+
+class RetransmissionPolicy(object):
+    """
+    Decides how long to wait for each attempt of a request and how often to
+    retransmit it.
+
+    The policy keeps one :py:class:`~.RttEstimator` per agent. *retries* is
+    the maximum number of attempts (including the first one). *jitter* is the
+    relative amount by which each wait time is randomly varied to avoid
+    synchronised retransmissions to many agents. The policy is thread-safe.
+
+    The transports use it as follows::
+
+        >>> for attempt, wait in policy.attempts(agent, timeout):
+        ...     sent = monotonic()
+        ...     # send the request and wait up to *wait* seconds
+        ...     if response is not None:
+        ...         policy.success(agent, attempt, monotonic() - sent)
+        ...         break
+        ...     policy.failure(agent)
+    """
+
+    def __init__(self, retries=DEFAULT_RETRIES, initial_rto=INITIAL_RTO,
+                 min_rto=MIN_RTO, max_rto=MAX_RTO, jitter=0.1):
+        # type: (int, float, float, float, float) -> None
+        self.retries = retries
+        self.initial_rto = initial_rto
+        self.min_rto = min_rto
+        self.max_rto = max_rto
+        self.jitter = jitter
+        self._estimators = {}  # type: Dict[Hashable, RttEstimator]
+        self._lock = threading.Lock()
+
+    def estimator(self, agent):
+        # type: (Hashable) -> RttEstimator
+        """
+        Returns the estimator for *agent* (usually an ``(ip, port)`` tuple).
+        """
+        with self._lock:
+            estimator = self._estimators.get(agent)
+            if estimator is None:
+                estimator = RttEstimator(self.initial_rto, self.min_rto,
+                                         self.max_rto)
+                self._estimators[agent] = estimator
+            return estimator
+
+    def attempts(self, agent, timeout):
+        # type: (Hashable, float) -> Iterator[Tuple[int, float]]
+        """
+        Generates a tuple ``(attempt, wait)`` for each attempt of a request
+        to *agent*. *attempt* counts from ``0`` and *wait* is the time (in
+        seconds) to wait for a response before retransmitting.
+
+        The attempts end at *timeout* seconds after the start. The last
+        attempt waits for the whole remaining time.
+        """
+        deadline = monotonic() + timeout
+        estimator = self.estimator(agent)
+        for attempt in range(self.retries):
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return
+            if attempt == self.retries - 1:
+                yield attempt, remaining
+                return
+            with self._lock:
+                rto = estimator.rto
+            wait = rto * random.uniform(1 - self.jitter, 1 + self.jitter)
+            yield attempt, min(wait, remaining)
+
+    def success(self, agent, attempt, rtt):
+        # type: (Hashable, int, float) -> None
+        """
+        Records the response to attempt *attempt* which arrived after *rtt*
+        seconds. Following Karn's algorithm, the round-trip time is only
+        measured if the request was not retransmitted: the response could
+        belong to any of the attempts otherwise.
+        """
+        if attempt:
+            return
+        estimator = self.estimator(agent)
+        with self._lock:
+            estimator.update(rtt)
+
+    def failure(self, agent):
+        # type: (Hashable) -> None
+        """
+        Records a timeout of a request to *agent*.
+        """
+        estimator = self.estimator(agent)
+        with self._lock:
+            estimator.backoff()
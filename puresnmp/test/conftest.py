@@ -4,3 +4,9 @@ collect_ignore = []
 if sys.version_info < (3, 6):
     collect_ignore.append('test_aio_pythonized.py')
     collect_ignore.append('test_aio_raw.py')
+    collect_ignore.append('test_aio_collect.py')
+    collect_ignore.append('test_aio_limiter.py')
+    collect_ignore.append('test_aio_session.py')
+    collect_ignore.append('test_aio_timers.py')
+    collect_ignore.append('test_aio_transport.py')
+    collect_ignore.append('test_aio_tuning.py')
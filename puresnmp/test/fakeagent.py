@@ -0,0 +1,161 @@
+# pylint: skip-file
+
+"""
+A minimal SNMP agent on the loopback interface for tests which need real
+network I/O.
+
+The agent serves a static MIB and answers GET, GETNEXT and GETBULK requests
+from a background thread.
+"""
+
+import bisect
+import socket
+import threading
+import time
+
+import six
+
+from ..const import Version
+from ..pdu import GetResponse, VarBind
+from ..x690.types import (
+    Integer,
+    ObjectIdentifier,
+    OctetString,
+    Sequence,
+    UnknownType,
+    decode_tlv,
+    to_bytes
+)
+from ..x690.util import decode_length_at
+
+GET = 0xa0
+GETNEXT = 0xa1
+GETBULK = 0xa5
+
+
+def end_of_mib_view():
+    return UnknownType(0x82, b'')
+
+
+def make_message(pdu):
+    return to_bytes(Sequence(Integer(Version.V2C), OctetString('public'),
+                             pdu))
+
+
+def parse_request(data):
+    """
+    Returns the tuple ``(identifier, request_id, field_a, field_b, oids)`` of
+    the request message *data*.
+    """
+    data = memoryview(data)
+    _, offset = decode_length_at(data, 1)
+    _, offset = decode_tlv(data, offset)  # version
+    _, offset = decode_tlv(data, offset)  # community
+    identifier = six.indexbytes(data, offset)
+    _, offset = decode_length_at(data, offset + 1)
+    request_id, offset = decode_tlv(data, offset)
+    field_a, offset = decode_tlv(data, offset)
+    field_b, offset = decode_tlv(data, offset)
+    varbinds, offset = decode_tlv(data, offset)
+    oids = [varbind[0] for varbind in varbinds]
+    return (identifier, request_id.value, field_a.value, field_b.value,
+            oids)
+
+
+class FakeAgent(object):
+    """
+    Answers requests for the *mib* (a mapping from OID strings to values).
+
+    Each request is answered after *delay* seconds. The first *drop*
+    requests are ignored. Bulk requests for more than *max_repetitions*
+    repetitions are answered with a ``tooBig`` error. All received requests
+    are collected in ``requests``.
+
+    With *batch*, the requests are collected until *batch* of them have
+    arrived. They are then answered in reverse order, preceded by a response
+    with an unknown request-id.
+    """
+
+    def __init__(self, mib, delay=0, drop=0, max_repetitions=None, batch=0):
+        self.mib = sorted((ObjectIdentifier.from_string(oid), value)
+                          for oid, value in mib.items())
+        self.oids = [oid for oid, _ in self.mib]
+        self.delay = delay
+        self.drop = drop
+        self.max_repetitions = max_repetitions
+        self.batch = batch
+        self.requests = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.settimeout(0.05)
+        self.ip, self.port = self.sock.getsockname()
+        self._running = True
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get(self, oid):
+        index = bisect.bisect_left(self.oids, oid)
+        if index < len(self.oids) and self.oids[index] == oid:
+            return VarBind(oid, self.mib[index][1])
+        return VarBind(oid, end_of_mib_view())
+
+    def getnext(self, oid):
+        index = bisect.bisect_right(self.oids, oid)
+        if index < len(self.oids):
+            return VarBind(*self.mib[index])
+        return VarBind(oid, end_of_mib_view())
+
+    def respond(self, data):
+        identifier, request_id, field_a, field_b, oids = parse_request(data)
+        if identifier == GET:
+            varbinds = [self.get(oid) for oid in oids]
+        elif identifier == GETNEXT:
+            varbinds = [self.getnext(oid) for oid in oids]
+        elif self.max_repetitions and field_b > self.max_repetitions:
+            return make_message(GetResponse(request_id, [], error_status=1))
+        else:
+            varbinds = [self.getnext(oid) for oid in oids[:field_a]]
+            current = oids[field_a:]
+            for _ in range(field_b):
+                row = [self.getnext(oid) for oid in current]
+                varbinds.extend(row)
+                current = [varbind.oid for varbind in row]
+        return make_message(GetResponse(request_id, varbinds))
+
+    def run(self):
+        pending = []
+        while self._running:
+            try:
+                data, addr = self.sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except socket.error:
+                return
+            self.requests.append(data)
+            if self.drop:
+                self.drop -= 1
+                continue
+            if self.delay:
+                time.sleep(self.delay)
+            if not self.batch:
+                self.sock.sendto(self.respond(data), addr)
+                continue
+            pending.append((data, addr))
+            if len(pending) < self.batch:
+                continue
+            self.sock.sendto(make_message(GetResponse(0, [])), addr)
+            for data, addr in reversed(pending):
+                self.sock.sendto(self.respond(data), addr)
+            del pending[:]
+
+    def close(self):
+        self._running = False
+        self.thread.join(5)
+        self.sock.close()
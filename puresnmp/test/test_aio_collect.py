@@ -0,0 +1,53 @@
+# pylint: skip-file
+
+"""
+Tests for the asynchronous planned collection.
+"""
+
+import sys
+
+import pytest
+
+from puresnmp.aio.api.collect import collect
+from puresnmp.api.collect import CollectSpec
+from puresnmp.x690.types import Integer, OctetString
+
+from .fakeagent import FakeAgent
+from .test_collect import MIB, SPEC
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3,5),
+                                reason="requires python3.5")
+
+
+@pytest.mark.asyncio
+async def test_collect():
+    with FakeAgent(MIB) as agent:
+        result = await collect(agent.ip, 'public', SPEC, port=agent.port)
+    assert result.scalars == {
+        '1.2.1.3.0': Integer(1234),
+        '1.2.1.5.0': OctetString(b'router-1'),
+    }
+    assert result.cells == {'1.2.2.1.8.5': Integer(1)}
+    assert len(result.columns['1.2.2.1.10']) == 20
+    assert len(agent.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_fallback():
+    spec = CollectSpec(cells=['1.2.9.2'])
+    with FakeAgent(MIB) as agent:
+        result = await collect(agent.ip, 'public', spec, port=agent.port)
+    assert result.cells == {'1.2.9.2': Integer(7)}
+    assert len(agent.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_end_of_mib():
+    spec = CollectSpec(columns=['1.2.9'], cells=['1.2.9.3'])
+    with FakeAgent(MIB) as agent:
+        result = await collect(agent.ip, 'public', spec, port=agent.port)
+    assert result.columns == {'1.2.9': {
+        '1.2.9.1.5': Integer(0),
+        '1.2.9.2': Integer(7),
+    }}
+    assert result.cells == {}
@@ -0,0 +1,135 @@
+# pylint: skip-file
+
+"""
+Tests for the concurrency and rate limits of the asyncio transport.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from puresnmp.aio.limiter import Limiter, TokenBucket
+from puresnmp.aio.transport import Transport
+from puresnmp.pdu import GetRequest, encode_message, message_prefix
+from puresnmp.x690.types import Integer, ObjectIdentifier
+
+from .fakeagent import FakeAgent
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3,5),
+                                reason="requires python3.5")
+
+
+class Tracker(object):
+    """
+    Records the maximum number of concurrent requests.
+    """
+
+    def __init__(self):
+        self.current = 0
+        self.maximum = 0
+
+    async def request(self, limiter, agent):
+        async with limiter.slot(agent):
+            self.current += 1
+            self.maximum = max(self.maximum, self.current)
+            await asyncio.sleep(0.01)
+            self.current -= 1
+
+
+@pytest.mark.asyncio
+async def test_bucket_burst():
+    bucket = TokenBucket(rate=10, burst=3)
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    for _ in range(3):
+        await bucket.acquire()
+    assert loop.time() - start < 0.05
+
+
+@pytest.mark.asyncio
+async def test_bucket_rate():
+    bucket = TokenBucket(rate=50, burst=1)
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    await asyncio.gather(*[bucket.acquire() for _ in range(6)])
+    # The first token is available right away, the others every 20ms
+    assert loop.time() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_bucket_cancel():
+    bucket = TokenBucket(rate=1, burst=1)
+    await bucket.acquire()
+    task = asyncio.ensure_future(bucket.acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert bucket.tokens > -0.5
+
+
+@pytest.mark.asyncio
+async def test_pace_cancel():
+    limiter = Limiter(rate=1, burst=1, agent_rate=1, agent_burst=1)
+    await limiter.pace('agent')
+    task = asyncio.ensure_future(limiter.pace('agent'))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert limiter._global.bucket.tokens > -0.5
+    assert limiter._agents['agent'].bucket.tokens > -0.5
+
+
+@pytest.mark.asyncio
+async def test_agent_max_in_flight():
+    limiter = Limiter(agent_max_in_flight=2)
+    tracker_a = Tracker()
+    tracker_b = Tracker()
+    await asyncio.gather(
+        *[tracker_a.request(limiter, 'a') for _ in range(10)] +
+        [tracker_b.request(limiter, 'b') for _ in range(10)])
+    assert tracker_a.maximum == 2
+    assert tracker_b.maximum == 2
+
+
+@pytest.mark.asyncio
+async def test_global_max_in_flight():
+    limiter = Limiter(max_in_flight=3, agent_max_in_flight=2)
+    tracker = Tracker()
+    await asyncio.gather(*[tracker.request(limiter, agent)
+                           for agent in 'abcd' for _ in range(5)])
+    assert tracker.maximum == 3
+
+
+@pytest.mark.asyncio
+async def test_unlimited():
+    limiter = Limiter()
+    tracker = Tracker()
+    await asyncio.gather(*[tracker.request(limiter, 'a')
+                           for _ in range(10)])
+    assert tracker.maximum == 10
+
+
+@pytest.mark.asyncio
+async def test_transport_rate():
+    agent = FakeAgent({'1.2.3': Integer(1)})
+    limiter = Limiter(agent_rate=20, agent_burst=1)
+    transport = Transport(limiter=limiter)
+    prefix = message_prefix('public')
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    try:
+        await asyncio.gather(*[
+            transport.send(
+                '127.0.0.1', agent.port,
+                encode_message(GetRequest(request_id, ObjectIdentifier(1)),
+                               prefix),
+                timeout=5)
+            for request_id in range(1, 4)])
+    finally:
+        transport.close()
+        agent.close()
+    assert loop.time() - start >= 0.09
+    assert len(agent.requests) == 3
@@ -7,15 +7,18 @@ Test the external "raw" interface.
 PureSNMP object instances.
 """
 
+import asyncio
 import pytest
 import sys
 from datetime import timedelta
 from unittest import skipUnless
 
-from puresnmp.aio.api.raw import (bulkget, bulkwalk, get, getnext, multiget,
-                              multiset, multiwalk, set, table, walk)
+from puresnmp.aio.api.raw import (bulkget, bulkwalk, columnar_table,
+                              compile_get, get, getnext, multiget,
+                              multiget_compiled, multiset, multiwalk,
+                              parallel_walk, set, table, walk)
 from puresnmp.const import Version
-from puresnmp.exc import NoSuchOID, SnmpError
+from puresnmp.exc import NoSuchOID, SnmpError, Timeout
 from puresnmp.pdu import BulkGetRequest, GetNextRequest, GetRequest, VarBind
 from puresnmp.types import Counter, Gauge, IpAddress, TimeTicks
 from puresnmp.util import BulkResult
@@ -23,6 +26,7 @@ from puresnmp.x690.types import (Integer, ObjectIdentifier, OctetString,
                                  Sequence, to_bytes)
 
 from . import readbytes
+from .fakeagent import FakeAgent
 from .asyncmock import AsyncMock
 
 try:
@@ -135,6 +139,20 @@ class TestMultiGet(object):
             ])
         assert result == expected
 
+    @pytest.mark.asyncio
+    async def test_multiget_compiled(self):
+        data = readbytes('multiget_response.hex')
+        template = compile_get('private', [
+            '1.3.6.1.2.1.1.2.0',
+            '1.3.6.1.2.1.1.1.0',
+        ])
+        with patch('puresnmp.aio.api.raw.send', new_callable=AsyncMock) as mck:
+            mck.return_value = data
+            result = await multiget_compiled('::1', template)
+        assert result[0] == ObjectIdentifier.from_string(
+            '1.3.6.1.4.1.8072.3.2.10')
+        assert len(result) == 2
+
 
 class TestMultiWalk(object):
 
@@ -172,6 +190,154 @@ class TestMultiWalk(object):
         assert len(result) == len(expected)
 
 
+class FakeFetcher(object):
+    """
+    A walk fetcher answering GETNEXT requests from a static MIB.
+    """
+
+    def __init__(self, size, fail_on=None):
+        OID = ObjectIdentifier.from_string
+        self.mib = [VarBind(OID('1.2.3.%d' % index), Integer(index))
+                    for index in range(1, size + 1)]
+        self.mib.append(VarBind(OID('1.3'), Integer(0)))
+        self.fail_on = fail_on
+        self.calls = 0
+        self.__name__ = 'FakeFetcher'
+
+    async def __call__(self, ip, community, oids, port, timeout):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise Timeout('Simulated timeout')
+        await asyncio.sleep(0)
+        return [next(varbind for varbind in self.mib if varbind.oid > oid)
+                for oid in map(ObjectIdentifier.from_string, map(str, oids))]
+
+
+class TestReadAhead(object):
+
+    @pytest.mark.asyncio
+    async def test_same_result(self):
+        expected = [varbind async for varbind in multiwalk(
+            '::1', 'public', ['1.2.3'], fetcher=FakeFetcher(10))]
+        result = [varbind async for varbind in multiwalk(
+            '::1', 'public', ['1.2.3'], fetcher=FakeFetcher(10),
+            read_ahead=2)]
+        assert result == expected
+        assert len(result) == 10
+
+    @pytest.mark.asyncio
+    async def test_stop_and_wait(self):
+        fetcher = FakeFetcher(10)
+        result = multiwalk('::1', 'public', ['1.2.3'], fetcher=fetcher)
+        await result.__anext__()
+        await asyncio.sleep(0.01)
+        assert fetcher.calls == 1
+        await result.aclose()
+
+    @pytest.mark.asyncio
+    async def test_overlap(self):
+        fetcher = FakeFetcher(10)
+        result = multiwalk('::1', 'public', ['1.2.3'], fetcher=fetcher,
+                           read_ahead=2)
+        await result.__anext__()
+        await asyncio.sleep(0.01)
+        # One response is with the consumer, two more are buffered and the
+        # fourth is waiting for room in the buffer.
+        assert fetcher.calls == 4
+        await result.aclose()
+
+    @pytest.mark.asyncio
+    async def test_error(self):
+        fetcher = FakeFetcher(10, fail_on=3)
+        result = multiwalk('::1', 'public', ['1.2.3'], fetcher=fetcher,
+                           read_ahead=5)
+        assert (await result.__anext__()).value == Integer(1)
+        assert (await result.__anext__()).value == Integer(2)
+        with pytest.raises(Timeout):
+            await result.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_close(self):
+        fetcher = FakeFetcher(100)
+        result = multiwalk('::1', 'public', ['1.2.3'], fetcher=fetcher,
+                           read_ahead=1)
+        await result.__anext__()
+        await result.aclose()
+        # The producer task has ended without waiting for garbage collection
+        assert all(task.done() or task is asyncio.current_task()
+                   for task in asyncio.all_tasks())
+        await asyncio.sleep(0.01)
+        assert fetcher.calls < 5
+
+
+class TestParallelWalk(object):
+
+    @pytest.mark.asyncio
+    async def test_split(self):
+        mib = dict(('1.2.3.%d' % index, Integer(index))
+                   for index in range(1, 101))
+        # Bulk requests past the end of the MIB end the walk early (see
+        # ``multiwalk``).
+        mib.update(('1.3.%d' % index, Integer(0)) for index in range(1, 11))
+        with FakeAgent(mib) as agent:
+            result = [varbind async for varbind in parallel_walk(
+                agent.ip, 'public', ['1.2.3'], port=agent.port,
+                split_points=['25', '50', '75'])]
+        assert result == [
+            VarBind(ObjectIdentifier.from_string('1.2.3.%d' % index),
+                    Integer(index))
+            for index in range(1, 101)]
+        # Three requests of 10 repetitions for each piece
+        assert len(agent.requests) == 12
+
+    @pytest.mark.asyncio
+    async def test_concurrency(self):
+        fetcher = FakeFetcher(20)
+        current = []
+        maximum = []
+
+        async def slow_fetcher(*args):
+            current.append(1)
+            maximum.append(len(current))
+            await asyncio.sleep(0.01)
+            current.pop()
+            return await fetcher(*args)
+        slow_fetcher.__name__ = 'slow_fetcher'
+
+        result = [varbind async for varbind in parallel_walk(
+            '::1', 'public', ['1.2.3'], split_points=['5', '10', '15'],
+            max_workers=2, fetcher=slow_fetcher)]
+        assert result == fetcher.mib[:20]
+        assert max(maximum) == 2
+
+    @pytest.mark.asyncio
+    async def test_error(self):
+        fetcher = FakeFetcher(20, fail_on=3)
+        with pytest.raises(Timeout):
+            async for _ in parallel_walk('::1', 'public', ['1.2.3'],
+                                         split_points=['10'],
+                                         fetcher=fetcher):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_close(self):
+        fetcher = FakeFetcher(20)
+
+        async def slow_fetcher(*args):
+            await asyncio.sleep(0.01)
+            return await fetcher(*args)
+        slow_fetcher.__name__ = 'slow_fetcher'
+
+        result = parallel_walk('::1', 'public', ['1.2.3'],
+                               split_points=['5', '10', '15'],
+                               max_workers=2, fetcher=slow_fetcher)
+        await result.__anext__()
+        await result.aclose()
+        # The pieces have ended without waiting for garbage collection
+        assert all(task.done() or task is asyncio.current_task()
+                   for task in asyncio.all_tasks())
+
+
 class TestMultiSet(object):
 
     @pytest.mark.asyncio
@@ -388,3 +554,21 @@ class TestGetBulkWalk(object):
             ]
         assert result == expected
 
+
+
+class TestColumnarTable(object):
+
+    @pytest.mark.asyncio
+    async def test_columnar_table(self):
+        responses = [readbytes('bulkwalk_response_%d.hex' % num)
+                     for num in (1, 2, 3)]
+        with patch('puresnmp.aio.api.raw.send', new_callable=AsyncMock) as mck:
+            mck.side_effect = responses
+            result = await columnar_table('127.0.0.1', 'private',
+                                          '1.3.6.1.2.1.2.2', bulk_size=20,
+                                          use_numpy=False)
+        assert mck.call_count == 3
+        assert list(result.index) == [1, 10]
+        assert result.columns[2] == [b'lo', b'eth0']
+        assert list(result.columns[10]) == [172, 60558]
+        assert result.columns[10].typecode == 'Q'
@@ -0,0 +1,98 @@
+# pylint: skip-file
+
+"""
+Tests for asyncio SNMP sessions bound to one agent.
+"""
+
+import sys
+
+import pytest
+
+from puresnmp.aio.api import Session
+from puresnmp.const import Version
+from puresnmp.pdu import GetRequest, GetResponse, VarBind
+from puresnmp.x690.types import (Integer, ObjectIdentifier, OctetString,
+                                 Sequence, to_bytes)
+
+from . import readbytes
+from .asyncmock import AsyncMock
+
+try:
+    from unittest.mock import Mock, patch
+except ImportError:
+    from mock import Mock, patch  # type: ignore
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3,5),
+                                reason="requires python3.5")
+
+OID = ObjectIdentifier.from_string
+
+
+def make_response(*varbinds):
+    return to_bytes(Sequence(
+        Integer(Version.V2C),
+        OctetString('public'),
+        GetResponse(123, [VarBind(OID(oid), value)
+                          for oid, value in varbinds])
+    ))
+
+
+def make_session():
+    transport = Mock()
+    transport.send = AsyncMock()
+    session = Session('192.0.2.1', 'public', transport=transport)
+    return session, transport
+
+
+class TestSession(object):
+
+    @pytest.mark.asyncio
+    async def test_get(self):
+        session, transport = make_session()
+        transport.send.return_value = readbytes('get_sysoid_01.hex')
+        with patch('puresnmp.aio.api.session.get_request_id') as mck:
+            mck.return_value = 0
+            result = await session.get('1.2.3')
+        expected_packet = to_bytes(Sequence(
+            Integer(Version.V2C),
+            OctetString('public'),
+            GetRequest(0, ObjectIdentifier(1, 2, 3))
+        ))
+        transport.send.assert_called_with(
+            '192.0.2.1', 161, expected_packet, timeout=6)
+        assert result == OID('1.3.6.1.4.1.8072.3.2.10')
+
+    @pytest.mark.asyncio
+    async def test_walk(self):
+        session, transport = make_session()
+        transport.send.side_effect = [
+            make_response(('1.2.3.1', Integer(1))),
+            make_response(('1.2.4.1', Integer(2))),
+        ]
+        result = []
+        async for varbind in session.walk('1.2.3', timeout=1):
+            result.append(varbind)
+        assert result == [VarBind(OID('1.2.3.1'), Integer(1))]
+        assert transport.send.call_args[1] == {'timeout': 1}
+
+    @pytest.mark.asyncio
+    async def test_bulkwalk(self):
+        session, transport = make_session()
+        transport.send.side_effect = [
+            make_response(('1.2.3.1', Integer(1)), ('1.2.3.2', Integer(2))),
+            make_response(('1.2.4.1', Integer(3)), ('1.2.4.2', Integer(4))),
+        ]
+        result = []
+        async for varbind in session.bulkwalk(['1.2.3'], bulk_size=2):
+            result.append(varbind)
+        assert result == [
+            VarBind(OID('1.2.3.1'), Integer(1)),
+            VarBind(OID('1.2.3.2'), Integer(2)),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_close(self):
+        with patch('puresnmp.aio.api.session.Transport') as mck:
+            async with Session('192.0.2.1', 'public'):
+                pass
+        mck.return_value.close.assert_called_with()
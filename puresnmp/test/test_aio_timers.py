@@ -0,0 +1,89 @@
+# pylint: skip-file
+
+"""
+Tests for the timer wheel of the asyncio transport.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from puresnmp.aio.timers import TimerWheel
+from puresnmp.aio.transport import Transport
+from puresnmp.exc import Timeout
+from puresnmp.pdu import GetRequest, encode_message, message_prefix
+from puresnmp.retransmission import RetransmissionPolicy
+from puresnmp.x690.types import Integer, ObjectIdentifier
+
+from .fakeagent import FakeAgent
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3,5),
+                                reason="requires python3.5")
+
+
+def request(request_id):
+    return encode_message(GetRequest(request_id, ObjectIdentifier(1)),
+                          message_prefix('public'))
+
+
+@pytest.mark.asyncio
+async def test_batches():
+    batches = []
+    wheel = TimerWheel(batches.append, resolution=0.05)
+    now = asyncio.get_event_loop().time()
+    wheel.add(now + 0.001, 'a')
+    wheel.add(now + 0.002, 'b')
+    wheel.add(now + 0.2, 'c')
+    assert len(wheel) == 3
+    await asyncio.sleep(0.1)
+    assert batches == [['a', 'b']]
+    await asyncio.sleep(0.2)
+    assert batches == [['a', 'b'], ['c']]
+    assert len(wheel) == 0
+
+
+@pytest.mark.asyncio
+async def test_earlier_deadline():
+    batches = []
+    wheel = TimerWheel(batches.append, resolution=0.01)
+    now = asyncio.get_event_loop().time()
+    wheel.add(now + 0.5, 'late')
+    wheel.add(now + 0.02, 'early')
+    await asyncio.sleep(0.1)
+    assert batches == [['early']]
+    wheel.close()
+    await asyncio.sleep(0.5)
+    assert batches == [['early']]
+
+
+@pytest.mark.asyncio
+async def test_retransmission():
+    policy = RetransmissionPolicy(retries=3, initial_rto=0.05, min_rto=0.05,
+                                  jitter=0)
+    transport = Transport(policy=policy)
+    with FakeAgent({'1.2.3': Integer(1)}, drop=1) as agent:
+        try:
+            response = await transport.send('127.0.0.1', agent.port,
+                                            request(1), timeout=5)
+        finally:
+            transport.close()
+    assert response
+    assert len(agent.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_timeout_many():
+    policy = RetransmissionPolicy(retries=2, initial_rto=0.05, min_rto=0.05,
+                                  max_rto=0.05, jitter=0)
+    transport = Transport(policy=policy)
+    with FakeAgent({'1.2.3': Integer(1)}, drop=1000) as agent:
+        try:
+            results = await asyncio.gather(*[
+                transport.send('127.0.0.1', agent.port, request(request_id),
+                               timeout=0.2)
+                for request_id in range(1, 101)], return_exceptions=True)
+        finally:
+            transport.close()
+    assert all(isinstance(result, Timeout) for result in results)
+    assert len(transport._timers) == 0
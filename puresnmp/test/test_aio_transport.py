@@ -0,0 +1,141 @@
+# pylint: skip-file
+
+"""
+Tests for the shared asyncio datagram endpoint.
+
+The tests run against a fake agent on the loopback interface.
+"""
+
+import asyncio
+import gc
+import sys
+import weakref
+
+import pytest
+
+from puresnmp.aio.transport import Transport, get_transport, send
+from puresnmp.const import Version
+from puresnmp.exc import Timeout
+from puresnmp.pdu import GetRequest, GetResponse, peek_request_id
+from puresnmp.x690.types import (Integer, ObjectIdentifier, OctetString,
+                                 Sequence, to_bytes)
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3,5),
+                                reason="requires python3.5")
+
+
+def make_message(pdu):
+    return to_bytes(Sequence(Integer(Version.V2C), OctetString('public'),
+                             pdu))
+
+
+class FakeAgent(asyncio.DatagramProtocol):
+    """
+    Collects *batch_size* requests and answers them in reverse order. Before
+    the answers, a response with an unknown request-id is sent.
+    """
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.requests = []
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.requests.append((data, addr))
+        if len(self.requests) < self.batch_size:
+            return
+        self.transport.sendto(make_message(GetResponse(0, [])), addr)
+        for data, addr in reversed(self.requests):
+            request_id = peek_request_id(data)
+            self.transport.sendto(make_message(GetResponse(request_id, [])),
+                                  addr)
+
+
+async def start_agent(batch_size):
+    loop = asyncio.get_event_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: FakeAgent(batch_size), local_addr=('127.0.0.1', 0))
+    return transport, transport.get_extra_info('sockname')[1]
+
+
+def request(request_id):
+    return make_message(GetRequest(request_id, ObjectIdentifier(1)))
+
+
+class TestTransport(object):
+
+    @pytest.mark.asyncio
+    async def test_demultiplex(self):
+        agent, port = await start_agent(3)
+        transport = Transport()
+        responses = await asyncio.gather(*[
+            transport.send('127.0.0.1', port, request(request_id), timeout=5)
+            for request_id in (21, 22, 23)])
+        transport.close()
+        agent.close()
+        assert [peek_request_id(data) for data in responses] == [21, 22, 23]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_request(self):
+        agent, port = await start_agent(2)
+        transport = Transport()
+        first = asyncio.ensure_future(
+            transport.send('127.0.0.1', port, request(1), timeout=5))
+        await asyncio.sleep(0)
+        with pytest.raises(ValueError):
+            await transport.send('127.0.0.1', port, request(1), timeout=5)
+        first.cancel()
+        transport.close()
+        agent.close()
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        agent, port = await start_agent(2)
+        transport = Transport()
+        with pytest.raises(Timeout):
+            await transport.send('127.0.0.1', port, request(1), timeout=0.01)
+        transport.close()
+        agent.close()
+
+    @pytest.mark.asyncio
+    async def test_shared_transport(self):
+        assert get_transport() is get_transport()
+        agent, port = await start_agent(2)
+        responses = await asyncio.gather(
+            send('127.0.0.1', port, request(31)),
+            send('127.0.0.1', port, request(32)),
+        )
+        agent.close()
+        assert [peek_request_id(data) for data in responses] == [31, 32]
+
+
+@pytest.mark.filterwarnings('ignore::ResourceWarning')
+def test_release_after_loop():
+    """
+    The shared transport of a closed loop is released once another loop
+    uses a shared transport.
+    """
+
+    async def request_once(request_id):
+        agent, port = await start_agent(1)
+        try:
+            await send('127.0.0.1', port, request(request_id))
+        finally:
+            agent.close()
+        return weakref.ref(get_transport())
+
+    def run(request_id):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(request_once(request_id))
+        finally:
+            loop.close()
+
+    first = run(41)
+    second = run(42)
+    gc.collect()
+    assert first() is None
+    assert second() is not None
@@ -0,0 +1,174 @@
+# pylint: skip-file
+
+"""
+Tests for the adaptive tuning of concurrency and bulk size.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from puresnmp.aio.api.raw import adaptive_bulkwalk
+from puresnmp.aio.tuning import Tuner
+from puresnmp.exc import TooBig
+from puresnmp.x690.types import Integer, ObjectIdentifier
+
+from .fakeagent import FakeAgent, parse_request
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3,5),
+                                reason="requires python3.5")
+
+AGENT = ('127.0.0.1', 161)
+MIB = dict(('1.2.3.%d' % index, Integer(index)) for index in range(1, 101))
+# Bulk requests past the end of the MIB end the walk early (see
+# ``multiwalk``). These keep the walks away from it.
+MIB.update(('1.3.%d' % index, Integer(0)) for index in range(1, 51))
+
+
+def test_additive_increase():
+    tuner = Tuner(initial_bulk_size=10, initial_concurrency=1)
+    tuner.success(AGENT, 0.01)
+    assert tuner.bulk_size(AGENT) == 11
+    assert tuner.concurrency(AGENT) == 2
+    tuner.success(AGENT, 0.01)
+    tuner.success(AGENT, 0.01)
+    # The concurrency grows by one per "window" of requests
+    assert tuner.concurrency(AGENT) == 2
+    assert tuner.bulk_size(AGENT) == 13
+
+
+def test_bounds():
+    tuner = Tuner(max_bulk_size=12, max_concurrency=3, min_bulk_size=5)
+    for _ in range(50):
+        tuner.success(AGENT, 0.01)
+    assert tuner.bulk_size(AGENT) == 12
+    assert tuner.concurrency(AGENT) == 3
+    for _ in range(10):
+        tuner.timeout(AGENT)
+    assert tuner.bulk_size(AGENT) == 5
+    assert tuner.concurrency(AGENT) == 1
+
+
+def test_multiplicative_decrease():
+    tuner = Tuner(initial_bulk_size=40, initial_concurrency=8)
+    tuner.timeout(AGENT)
+    assert tuner.bulk_size(AGENT) == 20
+    assert tuner.concurrency(AGENT) == 4
+
+
+def test_latency_spike():
+    tuner = Tuner(initial_bulk_size=40, spike_factor=4)
+    tuner.success(AGENT, 0.01)
+    tuner.success(AGENT, 0.03)
+    assert tuner.bulk_size(AGENT) == 42
+    tuner.success(AGENT, 0.06)
+    assert tuner.bulk_size(AGENT) == 21
+
+
+def test_latency_baseline_change():
+    tuner = Tuner(initial_bulk_size=40, spike_factor=4)
+    for _ in range(10):
+        tuner.success(AGENT, 0.01)
+    assert tuner.bulk_size(AGENT) == 50
+    # The device permanently becomes ten times slower. The first responses
+    # are spikes, then the baseline has caught up and the values grow again.
+    for _ in range(20):
+        tuner.success(AGENT, 0.1)
+    assert tuner.bulk_size(AGENT) > 25
+    assert tuner.concurrency(AGENT) > 1
+
+
+def test_too_big():
+    tuner = Tuner(initial_bulk_size=40)
+    tuner.too_big(AGENT)
+    assert tuner.bulk_size(AGENT) == 20
+    for _ in range(50):
+        tuner.success(AGENT, 0.01)
+    # The failed bulk size is never reached again
+    assert tuner.bulk_size(AGENT) == 39
+
+
+def test_devices_are_separate():
+    tuner = Tuner(initial_bulk_size=10)
+    tuner.timeout(AGENT)
+    assert tuner.bulk_size(('127.0.0.1', 1161)) == 10
+
+
+@pytest.mark.asyncio
+async def test_slot():
+    tuner = Tuner(initial_concurrency=2)
+    current = []
+    maximum = []
+
+    async def request():
+        async with tuner.slot(AGENT):
+            current.append(1)
+            maximum.append(len(current))
+            await asyncio.sleep(0.01)
+            current.pop()
+
+    await asyncio.gather(*[request() for _ in range(6)])
+    assert max(maximum) == 2
+
+
+@pytest.mark.asyncio
+async def test_adaptive_bulkwalk():
+    # Response times on the loopback interface vary too much to detect
+    # spikes reliably
+    tuner = Tuner(initial_bulk_size=5, spike_factor=1000)
+    with FakeAgent(MIB) as agent:
+        result = [varbind async for varbind in adaptive_bulkwalk(
+            agent.ip, 'public', ['1.2.3'], port=agent.port, tuner=tuner)]
+    assert result == [(ObjectIdentifier.from_string('1.2.3.%d' % index),
+                       Integer(index)) for index in range(1, 101)]
+    # 5 + 6 + 7 + ... + 15 > 100. The last request (16) only confirms the
+    # end of the tree.
+    assert len(agent.requests) == 12
+    assert tuner.bulk_size((agent.ip, agent.port)) == 17
+
+
+@pytest.mark.asyncio
+async def test_adaptive_bulkwalk_too_big():
+    tuner = Tuner(initial_bulk_size=40, increase=5, spike_factor=1000)
+    with FakeAgent(MIB, max_repetitions=25) as agent:
+        result = [varbind async for varbind in adaptive_bulkwalk(
+            agent.ip, 'public', ['1.2.3'], port=agent.port, tuner=tuner)]
+    assert len(result) == 100
+    sizes = [parse_request(request)[3] for request in agent.requests]
+    # 40 is too big, the bulk size is halved and grows again until it is
+    # too big again.
+    assert sizes[:5] == [40, 20, 25, 30, 15]
+    assert tuner.device((agent.ip, agent.port)).max_bulk_size < 30
+
+
+@pytest.mark.asyncio
+async def test_adaptive_bulkwalk_too_big_minimum():
+    tuner = Tuner(initial_bulk_size=1)
+    with FakeAgent(MIB, max_repetitions=0.5) as agent:
+        with pytest.raises(TooBig):
+            async for _ in adaptive_bulkwalk(agent.ip, 'public', ['1.2.3'],
+                                             port=agent.port, tuner=tuner):
+                pass
+
+
+def test_slot_two_loops():
+    tuner = Tuner(initial_concurrency=1)
+
+    async def request():
+        async with tuner.slot(AGENT):
+            await asyncio.sleep(0.01)
+
+    async def contended():
+        await asyncio.gather(request(), request())
+
+    for _ in range(2):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(contended())
+        finally:
+            loop.close()
+        tuner.success(AGENT, 0.01)
+    # The learned values are kept, the slots of the loops are released
+    assert tuner.bulk_size(AGENT) == 12
+    assert len(tuner.device(AGENT)._slots) == 0
@@ -0,0 +1,150 @@
+# pylint: skip-file
+
+"""
+Tests for the planned collection of scalars, columns and cells.
+"""
+
+import unittest
+
+from puresnmp.api.collect import CollectPlan, CollectSpec, collect
+from puresnmp.exc import TooBig
+from puresnmp.pdu import VarBind
+from puresnmp.transport import send
+from puresnmp.x690.types import Integer, ObjectIdentifier, OctetString
+
+from .fakeagent import FakeAgent, parse_request
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch  # type: ignore
+
+OID = ObjectIdentifier.from_string
+
+MIB = {
+    '1.2.1.3.0': Integer(1234),
+    '1.2.1.5.0': OctetString(b'router-1'),
+    '1.2.9.1.5': Integer(0),
+    '1.2.9.2': Integer(7),
+}
+MIB.update(('1.2.2.1.2.%d' % index, OctetString(b'if%d' % index))
+           for index in range(1, 21))
+MIB.update(('1.2.2.1.8.%d' % index, Integer(1)) for index in range(1, 21))
+MIB.update(('1.2.2.1.10.%d' % index, Integer(index * 100))
+           for index in range(1, 21))
+
+SPEC = CollectSpec(scalars=['1.2.1.3.0', '1.2.1.5.0'],
+                   columns=['1.2.2.1.2', '1.2.2.1.10'],
+                   cells=['1.2.2.1.8.5'])
+
+
+class TestCollectPlan(unittest.TestCase):
+
+    def test_first_round(self):
+        plan = CollectPlan(SPEC, max_varbinds=20)
+        request = plan.next_round()
+        self.assertEqual(request.scalar_oids,
+                         [OID('1.2.1.3'), OID('1.2.1.5'), OID('1.2.2.1.8.4')])
+        self.assertEqual(request.repeating_oids,
+                         [OID('1.2.2.1.2'), OID('1.2.2.1.10')])
+        self.assertEqual(request.max_repetitions, 8)
+
+    def test_feed(self):
+        spec = CollectSpec(scalars=['1.2.1.3.0', '1.2.1.5.0'],
+                           columns=['1.2.2.1.2', '1.2.2.1.10'])
+        plan = CollectPlan(spec, max_varbinds=6)
+        request = plan.next_round()
+        self.assertEqual(request.max_repetitions, 2)
+        plan.feed(request, [
+            VarBind(OID('1.2.1.3.0'), Integer(1)),
+            VarBind(OID('1.2.1.6.0'), Integer(2)),
+        ], [
+            VarBind(OID('1.2.2.1.2.1'), Integer(3)),
+            VarBind(OID('1.2.2.1.10.1'), Integer(4)),
+            VarBind(OID('1.2.2.1.3.1'), Integer(5)),
+            VarBind(OID('1.2.2.1.10.2'), Integer(6)),
+        ])
+        request = plan.next_round()
+        self.assertEqual(request.values, [])
+        self.assertEqual(request.repeating_oids, [OID('1.2.2.1.10.2')])
+        self.assertEqual(request.max_repetitions, 6)
+        plan.feed(request, [], [VarBind(OID('1.2.3'), Integer(7))])
+        self.assertIsNone(plan.next_round())
+        self.assertEqual(plan.fallback(), [[OID('1.2.1.5.0')]])
+        plan.feed_fallback([OID('1.2.1.5.0')], [Integer(8)])
+        result = plan.result()
+        self.assertEqual(result.scalars, {'1.2.1.3.0': Integer(1),
+                                          '1.2.1.5.0': Integer(8)})
+        self.assertEqual(result.columns, {
+            '1.2.2.1.2': {'1.2.2.1.2.1': Integer(3)},
+            '1.2.2.1.10': {'1.2.2.1.10.1': Integer(4),
+                           '1.2.2.1.10.2': Integer(6)},
+        })
+        self.assertEqual(result.cells, {})
+
+    def test_too_big(self):
+        plan = CollectPlan(SPEC, max_varbinds=2)
+        plan.too_big()
+        self.assertEqual(plan.max_varbinds, 1)
+        with self.assertRaises(TooBig):
+            plan.too_big()
+
+
+class TestCollect(unittest.TestCase):
+
+    def expected_columns(self):
+        return {
+            '1.2.2.1.2': dict(('1.2.2.1.2.%d' % index,
+                               OctetString(b'if%d' % index))
+                              for index in range(1, 21)),
+            '1.2.2.1.10': dict(('1.2.2.1.10.%d' % index, Integer(index * 100))
+                               for index in range(1, 21)),
+        }
+
+    def test_one_request(self):
+        with FakeAgent(MIB) as agent, patch('puresnmp.api.raw.send', send):
+            result = collect(agent.ip, 'public', SPEC, port=agent.port)
+        self.assertEqual(result.scalars, {
+            '1.2.1.3.0': Integer(1234),
+            '1.2.1.5.0': OctetString(b'router-1'),
+        })
+        self.assertEqual(result.cells, {'1.2.2.1.8.5': Integer(1)})
+        self.assertEqual(result.columns, self.expected_columns())
+        self.assertEqual(len(agent.requests), 1)
+
+    def test_fallback(self):
+        spec = CollectSpec(cells=['1.2.9.2'])
+        with FakeAgent(MIB) as agent, patch('puresnmp.api.raw.send', send):
+            result = collect(agent.ip, 'public', spec, port=agent.port)
+        self.assertEqual(result.cells, {'1.2.9.2': Integer(7)})
+        self.assertEqual(len(agent.requests), 2)
+
+    def test_missing_values(self):
+        spec = CollectSpec(scalars=['1.2.1.4.0', '1.2.1.5.0'],
+                           cells=['1.2.2.1.8.21'])
+        with FakeAgent(MIB) as agent, patch('puresnmp.api.raw.send', send):
+            result = collect(agent.ip, 'public', spec, port=agent.port)
+        self.assertEqual(result.scalars,
+                         {'1.2.1.5.0': OctetString(b'router-1')})
+        self.assertEqual(result.cells, {})
+        self.assertEqual(len(agent.requests), 2)
+
+    def test_end_of_mib(self):
+        spec = CollectSpec(scalars=['1.2.1.3.0'], columns=['1.2.9'])
+        with FakeAgent(MIB) as agent, patch('puresnmp.api.raw.send', send):
+            result = collect(agent.ip, 'public', spec, port=agent.port)
+        self.assertEqual(result.scalars, {'1.2.1.3.0': Integer(1234)})
+        self.assertEqual(result.columns, {'1.2.9': {
+            '1.2.9.1.5': Integer(0),
+            '1.2.9.2': Integer(7),
+        }})
+        self.assertEqual(len(agent.requests), 1)
+
+    def test_too_big(self):
+        with FakeAgent(MIB, max_repetitions=5) as agent, \
+                patch('puresnmp.api.raw.send', send):
+            result = collect(agent.ip, 'public', SPEC, port=agent.port)
+        self.assertEqual(result.columns, self.expected_columns())
+        sizes = [parse_request(request)[3] for request in agent.requests]
+        # 23 and 11 repetitions are too big
+        self.assertEqual(sizes[:3], [23, 11, 4])
@@ -0,0 +1,151 @@
+# pylint: skip-file
+
+"""
+Tests for the columnar table decoder.
+"""
+
+from array import array
+from unittest import skipUnless
+
+from puresnmp.columnar import TableDecoder, numpy
+from puresnmp.const import Version
+from puresnmp.pdu import GetResponse, VarBind
+from puresnmp.types import Counter64
+from puresnmp.x690.types import (
+    Integer,
+    ObjectIdentifier,
+    OctetString,
+    Sequence,
+    UnknownType,
+    to_bytes
+)
+
+from . import ByteTester
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch  # type: ignore
+
+
+OID = ObjectIdentifier.from_string
+
+
+def make_response(*varbinds):
+    return to_bytes(Sequence(
+        Integer(Version.V2C),
+        OctetString('public'),
+        GetResponse(123, [VarBind(OID(oid), value)
+                          for oid, value in varbinds])
+    ))
+
+
+class TestTableDecoder(ByteTester):
+
+    def test_numeric_columns(self):
+        decoder = TableDecoder(OID('1.3.6.1.2.1.31.1.1.1'))
+        next_oid = decoder.feed(make_response(
+            ('1.3.6.1.2.1.31.1.1.1.1.1', OctetString(b'lo')),
+            ('1.3.6.1.2.1.31.1.1.1.1.200', OctetString(b'eth0')),
+            ('1.3.6.1.2.1.31.1.1.1.6.1', Counter64(2**64 - 1)),
+            ('1.3.6.1.2.1.31.1.1.1.6.200', Counter64(10)),
+        ))
+        self.assertEqual(next_oid, OID('1.3.6.1.2.1.31.1.1.1.6.200'))
+        result = decoder.result(use_numpy=False)
+        self.assertEqual(result.index, array('Q', [1, 200]))
+        self.assertEqual(result.columns[1], [b'lo', b'eth0'])
+        self.assertEqual(result.columns[6], array('Q', [2**64 - 1, 10]))
+
+    def test_signed_column(self):
+        decoder = TableDecoder(OID('1.2.3'))
+        decoder.feed(make_response(
+            ('1.2.3.1.1', Integer(-5)),
+            ('1.2.3.1.2', Integer(5)),
+        ))
+        result = decoder.result(use_numpy=False)
+        self.assertEqual(result.columns[1], array('q', [-5, 5]))
+
+    def test_missing_cells(self):
+        decoder = TableDecoder(OID('1.2.3'))
+        decoder.feed(make_response(
+            ('1.2.3.1.1', Counter64(1)),
+            ('1.2.3.1.2', Counter64(2)),
+            ('1.2.3.1.3', Counter64(3)),
+            ('1.2.3.2.2', Counter64(20)),
+            ('1.2.3.3.1', OctetString(b'a')),
+        ))
+        result = decoder.result(use_numpy=False)
+        self.assertEqual(result.columns[2], array('Q', [0, 20, 0]))
+        self.assertEqual(result.columns[3], [b'a', None, None])
+
+    def test_end_of_table(self):
+        decoder = TableDecoder(OID('1.2.3'))
+        next_oid = decoder.feed(make_response(
+            ('1.2.3.1.1', Counter64(1)),
+            ('1.2.4.1.1', Counter64(2)),
+        ))
+        self.assertIsNone(next_oid)
+        result = decoder.result(use_numpy=False)
+        self.assertEqual(result.index, array('Q', [1]))
+
+    def test_end_of_mib_view(self):
+        decoder = TableDecoder(OID('1.2.3'))
+        next_oid = decoder.feed(make_response(
+            ('1.2.3.1.1', Counter64(1)),
+            ('1.2.3.1.1', UnknownType(0x82, b'')),
+        ))
+        self.assertIsNone(next_oid)
+
+    def test_no_progress(self):
+        decoder = TableDecoder(OID('1.2.3'))
+        response = make_response(('1.2.3.1.1', Counter64(1)))
+        self.assertIsNotNone(decoder.feed(response))
+        self.assertIsNone(decoder.feed(response))
+
+    @skipUnless(numpy, 'NumPy is not installed')
+    def test_numpy(self):
+        decoder = TableDecoder(OID('1.2.3'))
+        decoder.feed(make_response(
+            ('1.2.3.1.1', Counter64(1)),
+            ('1.2.3.1.2', Counter64(2)),
+        ))
+        result = decoder.result()
+        self.assertEqual(result.columns[1].dtype, numpy.uint64)
+        self.assertEqual(result.columns[1].tolist(), [1, 2])
+        self.assertEqual(result.index.tolist(), [1, 2])
+
+    def test_base_nodes(self):
+        decoder = TableDecoder(OID('1.2.3'), num_base_nodes=3)
+        decoder.feed(make_response(
+            ('1.2.3.1.5.10', Counter64(1)),
+            ('1.2.3.1.6.300', Counter64(2)),
+            ('1.2.3.2.5.10', Integer(3)),
+        ))
+        result = decoder.result(use_numpy=False)
+        self.assertEqual(result.index, ['5.10', '6.300'])
+        self.assertEqual(result.columns[1], array('Q', [1, 2]))
+        self.assertEqual(result.columns[2], array('q', [3, 0]))
+
+
+class TestColumnarTable(ByteTester):
+
+    def test_columnar_table(self):
+        from puresnmp.api.raw import columnar_table
+        responses = [
+            make_response(('1.2.3.1.1', Counter64(1)),
+                          ('1.2.3.1.2', Counter64(2))),
+            make_response(('1.2.3.2.1', Counter64(3)),
+                          ('1.2.4.1.1', Counter64(4))),
+        ]
+        with patch('puresnmp.api.raw.send') as mck, \
+                patch('puresnmp.api.raw.get_request_id') as mck2:
+            mck2.return_value = 123
+            mck.side_effect = responses
+            result = columnar_table('::1', 'public', '1.2.3', bulk_size=2,
+                                    use_numpy=False)
+        self.assertEqual(mck.call_count, 2)
+        self.assertEqual(result.index, array('Q', [1, 2]))
+        self.assertEqual(result.columns, {
+            1: array('Q', [1, 2]),
+            2: array('Q', [3, 0]),
+        })
@@ -0,0 +1,155 @@
+# pylint: skip-file
+
+"""
+Tests for the single-threaded fan-out engine.
+
+The operations are executed against fake agents on the loopback interface.
+"""
+
+import unittest
+from collections import OrderedDict
+
+from puresnmp.api.fanout import BulkGet, FanOut, Get, GetNext, Walk
+from puresnmp.exc import Timeout
+from puresnmp.retransmission import RetransmissionPolicy
+from puresnmp.util import BulkResult
+from puresnmp.x690.types import Integer, ObjectIdentifier, OctetString
+
+from .fakeagent import FakeAgent
+
+OID = ObjectIdentifier.from_string
+
+MIB = {
+    '1.2.3.1': OctetString(b'a'),
+    '1.2.3.2': OctetString(b'b'),
+    '1.2.3.3': OctetString(b'c'),
+    '1.2.4.1': Integer(1),
+    '1.2.4.2': Integer(2),
+    '1.2.5.1': Integer(3),
+    # Bulk requests past the end of the MIB end the walk early (see
+    # ``multiwalk``). These keep the walks above away from it.
+    '1.3.1': Integer(4),
+    '1.3.2': Integer(5),
+}
+
+
+class TestOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.agent = FakeAgent(MIB)
+        self.engine = FanOut()
+
+    def tearDown(self):
+        self.engine.close()
+        self.agent.close()
+
+    def run_operation(self, operation):
+        self.engine.run([operation])
+        self.assertTrue(operation.done)
+        if operation.error:
+            raise operation.error
+        return operation.result
+
+    def test_get(self):
+        result = self.run_operation(Get(
+            '127.0.0.1', 'public', ['1.2.3.2', '1.2.4.1'],
+            port=self.agent.port))
+        self.assertEqual(result, [OctetString(b'b'), Integer(1)])
+
+    def test_getnext(self):
+        result = self.run_operation(GetNext(
+            '127.0.0.1', 'public', ['1.2.3.3'], port=self.agent.port))
+        self.assertEqual(result, [(OID('1.2.4.1'), Integer(1))])
+
+    def test_bulkget(self):
+        result = self.run_operation(BulkGet(
+            '127.0.0.1', 'public', ['1.2.3'], ['1.2.4'], max_list_size=2,
+            port=self.agent.port))
+        self.assertEqual(result, BulkResult(
+            {'1.2.3.1': OctetString(b'a')},
+            OrderedDict([('1.2.4.1', Integer(1)), ('1.2.4.2', Integer(2))])))
+
+    def test_walk(self):
+        result = self.run_operation(Walk(
+            '127.0.0.1', 'public', ['1.2.3', '1.2.4'],
+            port=self.agent.port))
+        self.assertEqual(result, [
+            (OID('1.2.3.1'), OctetString(b'a')),
+            (OID('1.2.4.1'), Integer(1)),
+            (OID('1.2.3.2'), OctetString(b'b')),
+            (OID('1.2.4.2'), Integer(2)),
+            (OID('1.2.3.3'), OctetString(b'c')),
+        ])
+
+    def test_bulkwalk(self):
+        result = self.run_operation(Walk(
+            '127.0.0.1', 'public', ['1.2.3', '1.2.4'], bulk_size=2,
+            port=self.agent.port))
+        # The varbinds are generated in the order of the responses (like
+        # ``raw.bulkwalk``)
+        self.assertEqual([str(oid) for oid, _ in result], [
+            '1.2.3.1', '1.2.3.2', '1.2.4.1', '1.2.4.2', '1.2.3.3'])
+
+    def test_error(self):
+        operation = Get('not-an-ip', 'public', ['1.2.3.1'])
+        self.engine.run([operation])
+        self.assertTrue(operation.done)
+        self.assertIsInstance(operation.error, ValueError)
+
+
+class TestFanOut(unittest.TestCase):
+
+    def test_as_completed(self):
+        slow = FakeAgent(MIB, delay=0.2)
+        fast = FakeAgent(MIB)
+        operations = [
+            Walk('127.0.0.1', 'public', ['1.2.3'], port=slow.port),
+            Walk('127.0.0.1', 'public', ['1.2.3'], port=fast.port),
+        ]
+        with FanOut() as engine:
+            completed = list(engine.as_completed(operations))
+        slow.close()
+        fast.close()
+        self.assertEqual(completed, operations[::-1])
+        self.assertEqual(operations[0].result, operations[1].result)
+
+    def test_concurrent(self):
+        agents = [FakeAgent(MIB, delay=0.1) for _ in range(5)]
+        operations = [Get('127.0.0.1', 'public', ['1.2.5.1'],
+                          port=agent.port) for agent in agents]
+        with FanOut() as engine:
+            engine.run(operations)
+        for agent in agents:
+            agent.close()
+        self.assertEqual([operation.result for operation in operations],
+                         [[Integer(3)]] * 5)
+        # One request to each agent (no retransmissions) means they were
+        # sent at the same time.
+        self.assertEqual([len(agent.requests) for agent in agents], [1] * 5)
+
+    def test_retransmission(self):
+        agent = FakeAgent(MIB, drop=1)
+        policy = RetransmissionPolicy(retries=3, initial_rto=0.05)
+        operation = Get('127.0.0.1', 'public', ['1.2.5.1'], port=agent.port)
+        with FanOut(policy) as engine:
+            engine.run([operation])
+        agent.close()
+        self.assertEqual(operation.result, [Integer(3)])
+        self.assertEqual(agent.requests[0], agent.requests[1])
+
+    def test_timeout(self):
+        dead = FakeAgent(MIB, drop=100)
+        alive = FakeAgent(MIB)
+        policy = RetransmissionPolicy(retries=2, initial_rto=0.05)
+        operations = [
+            Get('127.0.0.1', 'public', ['1.2.5.1'], port=dead.port,
+                timeout=0.2),
+            Get('127.0.0.1', 'public', ['1.2.5.1'], port=alive.port),
+        ]
+        with FanOut(policy) as engine:
+            engine.run(operations)
+        dead.close()
+        alive.close()
+        self.assertIsInstance(operations[0].error, Timeout)
+        self.assertEqual(len(dead.requests), 2)
+        self.assertEqual(operations[1].result, [Integer(3)])
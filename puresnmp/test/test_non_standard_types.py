@@ -61,6 +61,11 @@ class TestTimeTicks(ByteTester):
                              microseconds=410000)
         self.assertEqual(result, expected)
 
+    def test_decode_python(self):
+        result = t.TimeTicks.decode_python(b'\x01\x20\x3d\x39')
+        expected = t.TimeTicks(18890041).pythonize()
+        self.assertEqual(result, expected)
+
     def test_conversion_from_python(self):
         # NOTE: 41 centiseconds = 410000 microseconds
         input = timedelta(days=2, hours=4, minutes=28, seconds=20,
@@ -14,8 +14,13 @@ from ..pdu import (
     GetNextRequest,
     GetRequest,
     GetResponse,
+    MessageTemplate,
     SetRequest,
     VarBind,
+    decode_known_values,
+    decode_python_varbinds,
+    encode_message,
+    message_prefix,
 )
 
 from ..const import Version
@@ -92,6 +97,40 @@ class TestGet(ByteTester):
         )
         self.assertEqual(result, expected)
 
+    def test_get_response_lazy(self):
+        data = (b"\x30\x33\x02\x01\x01\x04\x06\x70\x75\x62\x6c\x69\x63"
+                b"\xa2\x26"
+                b"\x02\x04\x72\x0b\x8c\x3f"
+                b"\x02\x01\x00\x02\x01\x00"
+                b"\x30\x18"
+                b"\x30\x16"
+                b"\x06\x08\x2b\x06\x01\x02\x01\x01\x02\x00"
+                b"\x06\x0a\x2b\x06\x01\x04\x01\xbf\x08\x03\x02\x0a")
+        result = Sequence.from_bytes(data, lazy=True)
+        self.assertEqual(len(result[2].varbinds), 1)
+        self.assertEqual(result[2].varbinds, [VarBind(
+            ObjectIdentifier(1, 3, 6, 1, 2, 1, 1, 2, 0),
+            ObjectIdentifier(1, 3, 6, 1, 4, 1, 8072, 3, 2, 10)
+        )])
+        self.assertEqual(result, Sequence.from_bytes(data))
+
+    def test_get_response_lazy_error(self):
+        """
+        Errors in the PDU header must be raised on decoding, even when
+        decoding lazily.
+        """
+        data = (b"\x30\x33\x02\x01\x01\x04\x06\x70\x75\x62\x6c\x69\x63"
+                b"\xa2\x26"
+                b"\x02\x04\x72\x0b\x8c\x3f"
+                b"\x02\x01\x01\x02\x01\x02"
+                b"\x30\x18"
+                b"\x30\x16"
+                b"\x06\x08\x2b\x06\x01\x02\x01\x01\x02\x00"
+                b"\x06\x0a\x2b\x06\x01\x04\x01\xbf\x08\x03\x02\x0a")
+        result = Sequence.from_bytes(data, lazy=True)
+        with six.assertRaisesRegex(self, SnmpError, 'tooBig'):
+            result[2]
+
     def test_get_response_error(self):
         data = (b"\x30\x33\x02\x01\x01\x04\x06\x70\x75\x62\x6c\x69\x63"
                 b"\xa2\x26"
@@ -104,6 +143,46 @@ class TestGet(ByteTester):
         with six.assertRaisesRegex(self, SnmpError, 'tooBig'):
             Sequence.from_bytes(data)
 
+    def test_get_response_python(self):
+        data = (b"\x30\x33\x02\x01\x01\x04\x06\x70\x75\x62\x6c\x69\x63"
+                b"\xa2\x26"
+                b"\x02\x04\x72\x0b\x8c\x3f"
+                b"\x02\x01\x00\x02\x01\x00"
+                b"\x30\x18"
+                b"\x30\x16"
+                b"\x06\x08\x2b\x06\x01\x02\x01\x01\x02\x00"
+                b"\x06\x0a\x2b\x06\x01\x04\x01\xbf\x08\x03\x02\x0a")
+        result = decode_python_varbinds(data)
+        self.assertEqual(result, [VarBind(
+            ObjectIdentifier(1, 3, 6, 1, 2, 1, 1, 2, 0),
+            '1.3.6.1.4.1.8072.3.2.10'
+        )])
+
+    def test_get_response_python_error(self):
+        data = (b"\x30\x33\x02\x01\x01\x04\x06\x70\x75\x62\x6c\x69\x63"
+                b"\xa2\x26"
+                b"\x02\x04\x72\x0b\x8c\x3f"
+                b"\x02\x01\x01\x02\x01\x02"
+                b"\x30\x18"
+                b"\x30\x16"
+                b"\x06\x08\x2b\x06\x01\x02\x01\x01\x02\x00"
+                b"\x06\x0a\x2b\x06\x01\x04\x01\xbf\x08\x03\x02\x0a")
+        with six.assertRaisesRegex(self, SnmpError, 'tooBig'):
+            decode_python_varbinds(data)
+
+    def test_decode_python_consistent(self):
+        """
+        Decoding directly into Python values must return the same values as
+        pythonizing the decoded types.
+        """
+        for filename in ['bulk_get_response.hex', 'multiget_response.hex',
+                         'walk_response_1.hex', 'multiwalk_response_2.hex']:
+            data = readbytes(filename)
+            expected = [(oid, value.pythonize()) for oid, value
+                        in Sequence.from_bytes(data)[2].varbinds]
+            result = decode_python_varbinds(data)
+            self.assertEqual(result, expected, filename)
+
     def test_get_repr(self):
         oid = ObjectIdentifier(1, 3, 6, 1, 2, 1, 1, 2, 0)
         request = GetRequest(
@@ -156,6 +235,28 @@ class TestGet(ByteTester):
         )
         self.assertEqual(result, expected)
 
+    def test_known_values(self):
+        data = readbytes('multiget_response.hex')
+        oids = [ObjectIdentifier.from_string('1.3.6.1.2.1.1.2.0'),
+                ObjectIdentifier.from_string('1.3.6.1.2.1.1.1.0')]
+        expected = [
+            ObjectIdentifier.from_string('1.3.6.1.4.1.8072.3.2.10'),
+            OctetString("Linux 7fbf2f0c363d 4.4.0-28-generic "
+                        "#47-Ubuntu SMP Fri Jun 24 10:09:13 UTC "
+                        "2016 x86_64"),
+        ]
+        self.assertEqual(decode_known_values(data, oids), expected)
+        self.assertEqual(decode_known_values(data, oids, pythonize=True),
+                         [value.pythonize() for value in expected])
+
+    def test_known_values_mismatch(self):
+        data = readbytes('multiget_response.hex')
+        oids = [ObjectIdentifier.from_string('1.3.6.1.2.1.1.2.0'),
+                ObjectIdentifier.from_string('1.3.6.1.2.1.1.1.1')]
+        self.assertIsNone(decode_known_values(data, oids))
+        self.assertIsNone(decode_known_values(data, oids[:1]))
+        self.assertIsNone(decode_known_values(data, oids + oids))
+
 
 class TestWalk(ByteTester):
     """
@@ -230,3 +331,49 @@ class TestBulkGet(ByteTester):
         result = repr(request)
         expected = 'BulkGetRequest(1234, 1, 2, ObjectIdentifier((1, 2, 3)))'
         self.assertEqual(result, expected)
+
+
+class TestMessage(ByteTester):
+
+    def test_encode_message(self):
+        expected = readbytes('bulk_get_request.hex')
+        request = BulkGetRequest(
+            437387882, 0, 5,
+            ObjectIdentifier.from_string('1.3.6.1.2.1.2.2.0'),
+            ObjectIdentifier.from_string('1.3.6.1.2.1.2.3.0')
+        )
+        result = encode_message(request, message_prefix('public'))
+        self.assertBytesEqual(result, expected)
+
+    def test_long_message(self):
+        request = GetRequest(
+            1, *[ObjectIdentifier(1, 3, 6, 1, 2, 1, 2, 2, 1, 10, i)
+                 for i in range(20)])
+        packet = Sequence(Integer(Version.V1), OctetString('public'), request)
+        result = encode_message(request, message_prefix('public', Version.V1))
+        self.assertBytesEqual(result, to_bytes(packet))
+
+
+class TestMessageTemplate(ByteTester):
+
+    def test_render(self):
+        oids = [ObjectIdentifier(1, 3, 6, 1, 2, 1, 2, 2, 1, 10, i)
+                for i in range(20)]
+        prefix = message_prefix('public')
+        template = MessageTemplate(GetRequest(0, *oids), prefix)
+        for request_id in (1, 127, 128, 2**23 - 1, 2**23, 437387882,
+                           2**31 - 1):
+            expected = encode_message(GetRequest(request_id, *oids), prefix)
+            self.assertBytesEqual(template.render(request_id), expected)
+
+    def test_bulk(self):
+        expected = readbytes('bulk_get_request.hex')
+        request = BulkGetRequest(
+            1, 0, 5,
+            ObjectIdentifier.from_string('1.3.6.1.2.1.2.2.0'),
+            ObjectIdentifier.from_string('1.3.6.1.2.1.2.3.0')
+        )
+        template = MessageTemplate(request, message_prefix('public'))
+        self.assertBytesEqual(template.render(437387882), expected)
+        # The request is copied
+        self.assertEqual(request.request_id, 1)
@@ -0,0 +1,116 @@
+# pylint: skip-file
+
+"""
+Tests for the thread pool API.
+
+The requests are sent to fake agents on the loopback interface.
+"""
+
+import threading
+import unittest
+from concurrent.futures import as_completed
+
+from puresnmp.api import pool as pool_module
+from puresnmp.api.pool import Pool
+from puresnmp.pdu import peek_request_id
+from puresnmp.x690.types import Integer, ObjectIdentifier
+
+from .fakeagent import FakeAgent
+
+OID = ObjectIdentifier.from_string
+
+MIB = dict(('1.2.3.%d' % index, Integer(index)) for index in range(1, 21))
+MIB['1.3.1'] = Integer(0)
+MIB['1.3.2'] = Integer(0)
+
+
+class TestPool(unittest.TestCase):
+
+    def setUp(self):
+        self.agent = FakeAgent(MIB)
+        self.addCleanup(self.agent.close)
+
+    def test_get(self):
+        with Pool(max_workers=2) as pool:
+            future = pool.submit_get('127.0.0.1', 'public', '1.2.3.5',
+                                     port=self.agent.port)
+            self.assertEqual(future.result(5), Integer(5))
+
+    def test_walk(self):
+        with Pool(max_workers=2) as pool:
+            future = pool.submit_walk('127.0.0.1', 'public', '1.2.3',
+                                      port=self.agent.port)
+            result = future.result(5)
+        self.assertEqual([value for _, value in result],
+                         [Integer(index) for index in range(1, 21)])
+
+    def test_bulkwalk(self):
+        with Pool(max_workers=2) as pool:
+            future = pool.submit_bulkwalk('127.0.0.1', 'public', ['1.2.3'],
+                                          bulk_size=5, port=self.agent.port)
+            result = future.result(5)
+        self.assertEqual(len(result), 20)
+        self.assertEqual(len(self.agent.requests), 5)
+
+    def test_error(self):
+        with Pool(max_workers=2) as pool:
+            future = pool.submit_bulkwalk('127.0.0.1', 'public', '1.2.3',
+                                          port=self.agent.port)
+            with self.assertRaises(TypeError):
+                future.result(5)
+
+    def test_sessions_are_shared(self):
+        with Pool(max_workers=2) as pool:
+            self.assertIs(pool.session('127.0.0.1', 'public'),
+                          pool.session('127.0.0.1', 'public'))
+            self.assertIsNot(pool.session('127.0.0.1', 'public'),
+                             pool.session('127.0.0.1', 'private'))
+
+    def test_bounded_queue(self):
+        release = threading.Event()
+        with Pool(max_workers=1, max_queued=2) as pool:
+            first = pool.submit(release.wait)
+            second = pool.submit(release.wait)
+            submitted = threading.Event()
+
+            def submit_third():
+                pool.submit(lambda: None)
+                submitted.set()
+            thread = threading.Thread(target=submit_third)
+            thread.start()
+            self.assertFalse(submitted.wait(0.1))
+            release.set()
+            self.assertTrue(submitted.wait(5))
+            thread.join(5)
+        self.assertTrue(first.result() and second.result())
+
+    def test_threads(self):
+        """
+        Many concurrent walks to multiple agents over the shared socket
+        return the correct results and never reuse a request-id.
+        """
+        agents = [self.agent, FakeAgent(MIB), FakeAgent(MIB)]
+        self.addCleanup(agents[1].close)
+        self.addCleanup(agents[2].close)
+        with Pool(max_workers=16) as pool:
+            futures = [pool.submit_walk('127.0.0.1', 'public', '1.2.3',
+                                        port=agent.port, timeout=10)
+                       for _ in range(10) for agent in agents]
+            results = [future.result(30) for future in as_completed(futures)]
+        expected = [(OID('1.2.3.%d' % index), Integer(index))
+                    for index in range(1, 21)]
+        self.assertEqual(results, [expected] * 30)
+        request_ids = [peek_request_id(request)
+                       for agent in agents for request in agent.requests]
+        self.assertEqual(len(request_ids), 30 * 21)
+        self.assertEqual(len(set(request_ids)), len(request_ids))
+
+
+class TestDefaultPool(unittest.TestCase):
+
+    def test_submit_get(self):
+        with FakeAgent(MIB) as agent:
+            future = pool_module.submit_get('127.0.0.1', 'public', '1.2.3.1',
+                                            port=agent.port)
+            self.assertEqual(future.result(5), Integer(1))
+        self.assertIs(pool_module.get_pool(), pool_module.get_pool())
@@ -12,6 +12,8 @@ from __future__ import print_function
 from logging import Handler, getLevelName, getLogger, WARNING
 import re
 import sys
+import threading
+import time
 import unittest
 from datetime import timedelta
 from unittest import skipUnless
@@ -21,23 +23,33 @@ import six
 from puresnmp.api.raw import (
     bulkget,
     bulkwalk,
+    compile_get,
     get,
     getnext,
     multiget,
+    multiget_compiled,
     multiset,
     multiwalk,
+    parallel_walk,
     set,
     table,
     walk
 )
 from puresnmp.const import Version
-from puresnmp.exc import FaultySNMPImplementation, NoSuchOID, SnmpError
+from puresnmp.exc import (
+    FaultySNMPImplementation,
+    NoSuchOID,
+    SnmpError,
+    Timeout
+)
 from puresnmp.pdu import (
     BulkGetRequest,
     GetNextRequest,
     GetRequest,
     GetResponse,
-    VarBind
+    VarBind,
+    encode_message,
+    message_prefix
 )
 from puresnmp.types import Counter, Gauge, IpAddress, TimeTicks
 from puresnmp.util import BulkResult
@@ -176,6 +188,41 @@ class TestMultiGet(unittest.TestCase):
             ])
         self.assertEqual(result, expected)
 
+    def test_multiget_other_oids(self):
+        # The agent returned other OIDs than requested. The values are
+        # still returned in order.
+        data = readbytes('multiget_response.hex')
+        with patch('puresnmp.api.raw.send') as mck:
+            mck.return_value = data
+            result = multiget('::1', 'private', ['1.2.3', '1.2.4'])
+        self.assertEqual(result[0], ObjectIdentifier.from_string(
+            '1.3.6.1.4.1.8072.3.2.10'))
+        self.assertEqual(len(result), 2)
+
+    def test_multiget_compiled(self):
+        data = readbytes('multiget_response.hex')
+        expected = [
+            ObjectIdentifier.from_string('1.3.6.1.4.1.8072.3.2.10'),
+            OctetString(b"Linux 7fbf2f0c363d 4.4.0-28-generic "
+                        b"#47-Ubuntu SMP Fri Jun 24 10:09:13 "
+                        b"UTC 2016 x86_64")
+        ]
+        template = compile_get('private', [
+            '1.3.6.1.2.1.1.2.0',
+            '1.3.6.1.2.1.1.1.0',
+        ])
+        with patch('puresnmp.api.raw.send') as mck, \
+                patch('puresnmp.api.raw.get_request_id') as get_request_id:
+            mck.return_value = data
+            get_request_id.return_value = 123456789
+            result = multiget_compiled('::1', template)
+        self.assertEqual(result, expected)
+        packet = mck.call_args[0][2]
+        self.assertEqual(packet, encode_message(
+            GetRequest(123456789, ObjectIdentifier.from_string(
+                '1.3.6.1.2.1.1.2.0'), ObjectIdentifier.from_string(
+                '1.3.6.1.2.1.1.1.0')), message_prefix('private')))
+
 
 class TestMultiWalk(unittest.TestCase):
 
@@ -254,6 +301,157 @@ class TestMultiWalk(unittest.TestCase):
                 ]))
 
 
+class FakeFetcher(object):
+    """
+    A walk fetcher answering GETNEXT requests from a static MIB.
+    """
+
+    def __init__(self, size, fail_on=None, delay=0):
+        OID = ObjectIdentifier.from_string
+        self.mib = [VarBind(OID('1.2.3.%d' % index), Integer(index))
+                    for index in range(1, size + 1)]
+        self.mib.append(VarBind(OID('1.3'), Integer(0)))
+        self.fail_on = fail_on
+        self.delay = delay
+        self.calls = 0
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self.lock = threading.Lock()
+        self.__name__ = 'FakeFetcher'
+
+    def __call__(self, ip, community, oids, port, timeout):
+        with self.lock:
+            self.calls += 1
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+            calls = self.calls
+        time.sleep(self.delay)
+        with self.lock:
+            self.concurrent -= 1
+        if calls == self.fail_on:
+            raise Timeout('Simulated timeout')
+        output = []
+        for oid in oids:
+            oid = ObjectIdentifier.from_string(six.text_type(oid))
+            output.append(next(varbind for varbind in self.mib
+                               if varbind.oid > oid))
+        return output
+
+
+class TestReadAhead(unittest.TestCase):
+
+    def wait_for_calls(self, fetcher, calls):
+        deadline = time.time() + 2
+        while fetcher.calls < calls and time.time() < deadline:
+            time.sleep(0.001)
+
+    def test_same_result(self):
+        expected = list(multiwalk('::1', 'public', ['1.2.3'],
+                                  fetcher=FakeFetcher(10)))
+        result = list(multiwalk('::1', 'public', ['1.2.3'],
+                                fetcher=FakeFetcher(10), read_ahead=2))
+        self.assertEqual(result, expected)
+        self.assertEqual(len(result), 10)
+
+    def test_stop_and_wait(self):
+        fetcher = FakeFetcher(10)
+        result = multiwalk('::1', 'public', ['1.2.3'], fetcher=fetcher)
+        next(result)
+        time.sleep(0.05)
+        self.assertEqual(fetcher.calls, 1)
+
+    def test_overlap(self):
+        fetcher = FakeFetcher(10)
+        result = multiwalk('::1', 'public', ['1.2.3'], fetcher=fetcher,
+                           read_ahead=2)
+        next(result)
+        # One response is with the consumer, two more are buffered and the
+        # fourth is waiting for room in the buffer.
+        self.wait_for_calls(fetcher, 4)
+        time.sleep(0.05)
+        self.assertEqual(fetcher.calls, 4)
+        result.close()
+
+    def test_error(self):
+        fetcher = FakeFetcher(10, fail_on=3)
+        result = multiwalk('::1', 'public', ['1.2.3'], fetcher=fetcher,
+                           read_ahead=5)
+        self.assertEqual(next(result).value, Integer(1))
+        self.assertEqual(next(result).value, Integer(2))
+        with self.assertRaises(Timeout):
+            next(result)
+
+    def test_close(self):
+        fetcher = FakeFetcher(100)
+        before = threading.active_count()
+        result = multiwalk('::1', 'public', ['1.2.3'], fetcher=fetcher,
+                           read_ahead=1)
+        next(result)
+        result.close()
+        deadline = time.time() + 2
+        while threading.active_count() > before and time.time() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(threading.active_count(), before)
+        self.assertLess(fetcher.calls, 5)
+
+    def test_close_then_error(self):
+        fetcher = FakeFetcher(100, fail_on=4, delay=0.01)
+        before = threading.active_count()
+        result = multiwalk('::1', 'public', ['1.2.3'], fetcher=fetcher,
+                           read_ahead=1)
+        next(result)
+        time.sleep(0.05)
+        result.close()
+        deadline = time.time() + 2
+        while threading.active_count() > before and time.time() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(threading.active_count(), before)
+
+
+class TestParallelWalk(unittest.TestCase):
+
+    def test_split(self):
+        fetcher = FakeFetcher(100)
+        result = list(parallel_walk('::1', 'public', ['1.2.3'],
+                                    split_points=['25', '50', '75'],
+                                    fetcher=fetcher))
+        self.assertEqual(result, fetcher.mib[:100])
+        # One extra request at the end of each piece
+        self.assertEqual(fetcher.calls, 104)
+
+    def test_no_duplicates(self):
+        fetcher = FakeFetcher(10)
+        result = list(parallel_walk('::1', 'public', ['1.2.3', '1.2'],
+                                    fetcher=fetcher))
+        self.assertEqual(result, fetcher.mib[:10])
+
+    def test_concurrency(self):
+        fetcher = FakeFetcher(20, delay=0.01)
+        result = list(parallel_walk('::1', 'public', ['1.2.3'],
+                                    split_points=['5', '10', '15'],
+                                    max_workers=2, fetcher=fetcher))
+        self.assertEqual(len(result), 20)
+        self.assertEqual(fetcher.max_concurrent, 2)
+
+    def test_error(self):
+        fetcher = FakeFetcher(20, fail_on=3)
+        with self.assertRaises(Timeout):
+            list(parallel_walk('::1', 'public', ['1.2.3'],
+                               split_points=['10'], fetcher=fetcher))
+
+    def test_close(self):
+        fetcher = FakeFetcher(100, delay=0.01)
+        result = parallel_walk('::1', 'public', ['1.2.3'],
+                               split_points=['25', '50', '75'],
+                               max_workers=2, fetcher=fetcher)
+        next(result)
+        result.close()
+        time.sleep(0.02)
+        calls = fetcher.calls
+        time.sleep(0.1)
+        self.assertEqual(fetcher.calls, calls)
+
+
 class TestMultiSet(unittest.TestCase):
 
     def test_multiset(self):
@@ -0,0 +1,89 @@
+# pylint: skip-file
+
+"""
+Tests for the adaptive retransmission policy.
+"""
+
+import unittest
+
+from puresnmp.retransmission import RetransmissionPolicy, RttEstimator
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch  # type: ignore
+
+
+class TestRttEstimator(unittest.TestCase):
+
+    def test_first_sample(self):
+        estimator = RttEstimator(initial_rto=1.0, min_rto=0.01)
+        self.assertEqual(estimator.rto, 1.0)
+        estimator.update(0.1)
+        self.assertEqual(estimator.srtt, 0.1)
+        self.assertEqual(estimator.rttvar, 0.05)
+        self.assertAlmostEqual(estimator.rto, 0.3)
+
+    def test_smoothing(self):
+        estimator = RttEstimator(min_rto=0.01)
+        estimator.update(0.1)
+        estimator.update(0.2)
+        self.assertAlmostEqual(estimator.rttvar, 0.75 * 0.05 + 0.25 * 0.1)
+        self.assertAlmostEqual(estimator.srtt, 0.875 * 0.1 + 0.125 * 0.2)
+        self.assertAlmostEqual(estimator.rto,
+                               estimator.srtt + 4 * estimator.rttvar)
+
+    def test_bounds(self):
+        estimator = RttEstimator(min_rto=0.5, max_rto=4)
+        estimator.update(0.001)
+        self.assertEqual(estimator.rto, 0.5)
+        for _ in range(5):
+            estimator.backoff()
+        self.assertEqual(estimator.rto, 4)
+
+
+class TestRetransmissionPolicy(unittest.TestCase):
+
+    def test_attempts(self):
+        policy = RetransmissionPolicy(retries=3, initial_rto=1.0, jitter=0)
+        with patch('puresnmp.retransmission.monotonic') as mck:
+            mck.return_value = 100
+            attempts = list(policy.attempts('agent', 10))
+        # The last attempt waits for the rest of the deadline
+        self.assertEqual(attempts, [(0, 1.0), (1, 1.0), (2, 10)])
+
+    def test_deadline(self):
+        policy = RetransmissionPolicy(retries=3, initial_rto=1.0, jitter=0)
+        with patch('puresnmp.retransmission.monotonic') as mck:
+            mck.side_effect = [100, 100, 100.5, 101]
+            attempts = list(policy.attempts('agent', 1))
+        self.assertEqual(attempts, [(0, 1.0), (1, 0.5)])
+
+    def test_backoff_between_attempts(self):
+        policy = RetransmissionPolicy(retries=3, initial_rto=1.0, jitter=0)
+        with patch('puresnmp.retransmission.monotonic') as mck:
+            mck.return_value = 100
+            waits = []
+            for _, wait in policy.attempts('agent', 10):
+                waits.append(wait)
+                policy.failure('agent')
+        self.assertEqual(waits, [1.0, 2.0, 10])
+
+    def test_jitter(self):
+        policy = RetransmissionPolicy(initial_rto=1.0, jitter=0.1)
+        for _ in range(20):
+            _, wait = next(policy.attempts('agent', 10))
+            self.assertTrue(0.9 <= wait <= 1.1)
+
+    def test_karn(self):
+        policy = RetransmissionPolicy(initial_rto=1.0)
+        policy.success('agent', 1, 0.01)
+        self.assertEqual(policy.estimator('agent').rto, 1.0)
+        policy.success('agent', 0, 0.01)
+        self.assertEqual(policy.estimator('agent').srtt, 0.01)
+
+    def test_agents_are_separate(self):
+        policy = RetransmissionPolicy(initial_rto=1.0)
+        policy.failure('a')
+        self.assertEqual(policy.estimator('a').rto, 2.0)
+        self.assertEqual(policy.estimator('b').rto, 1.0)
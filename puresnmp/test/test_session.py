@@ -0,0 +1,156 @@
+# pylint: skip-file
+
+"""
+Tests for SNMP sessions bound to one agent.
+"""
+
+from array import array
+from unittest import TestCase
+
+from puresnmp.api import Session
+from puresnmp.const import Version
+from puresnmp.pdu import (
+    BulkGetRequest,
+    GetRequest,
+    GetResponse,
+    VarBind,
+)
+from puresnmp.types import Counter64, Gauge
+from puresnmp.util import BulkResult
+from puresnmp.x690.types import (
+    Integer,
+    ObjectIdentifier,
+    OctetString,
+    Sequence,
+    to_bytes
+)
+
+from . import readbytes
+
+try:
+    from unittest.mock import Mock, call, patch
+except ImportError:
+    from mock import Mock, call, patch  # type: ignore
+
+
+OID = ObjectIdentifier.from_string
+
+
+def make_response(*varbinds):
+    return to_bytes(Sequence(
+        Integer(Version.V2C),
+        OctetString('public'),
+        GetResponse(123, [VarBind(OID(oid), value)
+                          for oid, value in varbinds])
+    ))
+
+
+class TestSession(TestCase):
+
+    def setUp(self):
+        self.transport = Mock()
+        self.session = Session('192.0.2.1', 'public', port=1161,
+                               transport=self.transport)
+        patcher = patch('puresnmp.api.session.get_request_id')
+        self.addCleanup(patcher.stop)
+        patcher.start().return_value = 0
+
+    def test_get(self):
+        self.transport.send.return_value = readbytes('get_sysoid_01.hex')
+        result = self.session.get('1.2.3')
+        expected_packet = to_bytes(Sequence(
+            Integer(Version.V2C),
+            OctetString('public'),
+            GetRequest(0, ObjectIdentifier(1, 2, 3))
+        ))
+        self.transport.send.assert_called_with(
+            '192.0.2.1', 1161, expected_packet, timeout=2)
+        self.assertEqual(result, OID('1.3.6.1.4.1.8072.3.2.10'))
+
+    def test_version(self):
+        self.transport.send.return_value = readbytes('get_sysoid_01.hex')
+        session = Session('192.0.2.1', 'public', version=Version.V1,
+                          transport=self.transport)
+        session.get('1.2.3', timeout=5)
+        expected_packet = to_bytes(Sequence(
+            Integer(Version.V1),
+            OctetString('public'),
+            GetRequest(0, ObjectIdentifier(1, 2, 3))
+        ))
+        self.transport.send.assert_called_with(
+            '192.0.2.1', 161, expected_packet, timeout=5)
+
+    def test_walk(self):
+        self.transport.send.side_effect = [
+            readbytes('walk_response_1.hex'),
+            readbytes('walk_response_2.hex'),
+            readbytes('walk_response_3.hex'),
+        ]
+        result = list(self.session.walk('1.3.6.1.2.1.2.2.1.5'))
+        self.assertEqual(result, [
+            VarBind(OID('1.3.6.1.2.1.2.2.1.5.1'), Gauge(10000000)),
+            VarBind(OID('1.3.6.1.2.1.2.2.1.5.13'), Gauge(4294967295)),
+        ])
+        self.assertEqual(self.transport.send.call_count, 3)
+
+    def test_bulkget(self):
+        self.transport.send.return_value = make_response(
+            ('1.2.3.0', Integer(1)),
+            ('1.2.4.1', Integer(2)),
+            ('1.2.4.2', Integer(3)),
+        )
+        result = self.session.bulkget(['1.2.3'], ['1.2.4'], 2)
+        self.assertEqual(result, BulkResult(
+            {'1.2.3.0': Integer(1)},
+            {'1.2.4.1': Integer(2), '1.2.4.2': Integer(3)},
+        ))
+        self.assertIn(to_bytes(BulkGetRequest(0, 1, 2, OID('1.2.3'),
+                                              OID('1.2.4'))),
+                      self.transport.send.call_args[0][2])
+
+    def test_bulkwalk(self):
+        self.transport.send.side_effect = [
+            make_response(('1.2.3.1', Integer(1)), ('1.2.3.2', Integer(2))),
+            make_response(('1.2.4.1', Integer(3)), ('1.2.4.2', Integer(4))),
+        ]
+        result = list(self.session.bulkwalk(['1.2.3'], bulk_size=2))
+        self.assertEqual(result, [
+            VarBind(OID('1.2.3.1'), Integer(1)),
+            VarBind(OID('1.2.3.2'), Integer(2)),
+        ])
+
+    def test_multiset(self):
+        self.transport.send.return_value = readbytes('multiset_response.hex')
+        result = self.session.multiset([
+            ('1.3.6.1.2.1.1.4.0', OctetString(b'hello@world.com')),
+            ('1.3.6.1.2.1.1.5.0', OctetString(b'hello@world.com')),
+        ])
+        self.assertEqual(result, {
+            '1.3.6.1.2.1.1.4.0': OctetString(b'hello@world.com'),
+            '1.3.6.1.2.1.1.5.0': OctetString(b'hello@world.com'),
+        })
+
+    def test_set_requires_type(self):
+        with self.assertRaises(TypeError):
+            self.session.set('1.2.3', 1)
+        self.assertFalse(self.transport.send.called)
+
+    def test_columnar_table(self):
+        self.transport.send.side_effect = [
+            make_response(('1.2.3.1.1', Counter64(1)),
+                          ('1.2.4.1.1', Counter64(2))),
+        ]
+        result = self.session.columnar_table('1.2.3', use_numpy=False)
+        self.assertEqual(result.index, array('Q', [1]))
+        self.assertEqual(result.columns, {1: array('Q', [1])})
+
+    def test_shared_transport(self):
+        with self.session:
+            pass
+        self.assertFalse(self.transport.close.called)
+
+    def test_own_transport(self):
+        with patch('puresnmp.api.session.Transport') as mck:
+            with Session('192.0.2.1', 'public') as session:
+                pass
+        self.assertEqual(mck.return_value.close.mock_calls, [call()])
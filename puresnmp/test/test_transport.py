@@ -0,0 +1,215 @@
+# pylint: skip-file
+
+"""
+Tests for the request-id allocator and the demultiplexing transport.
+
+The transport tests run against a fake agent on the loopback interface.
+"""
+
+import os
+import socket
+import threading
+import time
+import unittest
+
+from puresnmp.exc import Timeout
+from puresnmp.pdu import GetRequest, GetResponse, VarBind, peek_request_id
+from puresnmp.retransmission import RetransmissionPolicy
+from puresnmp.transport import (
+    MAX_REQUEST_ID,
+    REQUEST_IDS,
+    RequestIdAllocator,
+    Transport,
+    send
+)
+from puresnmp.x690.types import ObjectIdentifier, OctetString
+
+from . import readbytes
+from .fakeagent import FakeAgent, make_message
+
+
+class LargeResponseAgent(object):
+    """
+    Answers one request with a stale response followed by a response larger
+    than 4096 bytes.
+    """
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run(self):
+        data, addr = self.sock.recvfrom(65535)
+        request_id = peek_request_id(data)
+        self.sock.sendto(make_message(GetResponse(request_id + 1, [])), addr)
+        self.sock.sendto(self.response(request_id), addr)
+
+    @staticmethod
+    def response(request_id):
+        return make_message(GetResponse(request_id, [
+            VarBind(ObjectIdentifier(1, 2, 3), OctetString(b'x' * 10000))]))
+
+    def close(self):
+        self.thread.join(5)
+        self.sock.close()
+
+
+class TestPeekRequestId(unittest.TestCase):
+
+    def test_response(self):
+        data = readbytes('bulkwalk_response_2.hex')
+        self.assertEqual(peek_request_id(data), 1001613223)
+
+    def test_request(self):
+        data = make_message(GetRequest(-5, ObjectIdentifier(1, 2)))
+        self.assertEqual(peek_request_id(data), -5)
+
+    def test_garbage(self):
+        self.assertIsNone(peek_request_id(b''))
+        self.assertIsNone(peek_request_id(b'foo'))
+        self.assertIsNone(peek_request_id(b'\x30\x03\x02\x01'))
+
+
+class TestRequestIdAllocator(unittest.TestCase):
+
+    def test_sequential(self):
+        allocator = RequestIdAllocator(10)
+        self.assertEqual([allocator.allocate() for _ in range(3)],
+                         [10, 11, 12])
+
+    def test_wrap_around(self):
+        allocator = RequestIdAllocator(MAX_REQUEST_ID)
+        self.assertEqual([allocator.allocate() for _ in range(2)],
+                         [MAX_REQUEST_ID, 1])
+
+    def test_random_start(self):
+        allocator = RequestIdAllocator()
+        self.assertTrue(1 <= allocator.allocate() <= MAX_REQUEST_ID)
+
+    def test_threads(self):
+        allocator = RequestIdAllocator()
+        result = []
+
+        def allocate():
+            ids = [allocator.allocate() for _ in range(1000)]
+            result.extend(ids)
+
+        threads = [threading.Thread(target=allocate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(result)), 4000)
+
+    @unittest.skipUnless(hasattr(os, 'register_at_fork'),
+                         'requires os.register_at_fork')
+    def test_fork_while_locked(self):
+        # The lock is held by "another thread" while forking
+        with REQUEST_IDS._lock:
+            pid = os.fork()
+            if pid == 0:
+                REQUEST_IDS.allocate()
+                os._exit(0)
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            time.sleep(0.01)
+        else:
+            os.kill(pid, 9)
+            os.waitpid(pid, 0)
+            self.fail('The child process is deadlocked')
+        self.assertEqual(status, 0)
+
+
+class TestTransport(unittest.TestCase):
+
+    def test_demultiplex(self):
+        agent = FakeAgent({}, batch=4)
+        transport = Transport()
+        results = {}
+
+        def request(request_id):
+            packet = make_message(GetRequest(request_id, ObjectIdentifier(1)))
+            response = transport.send('127.0.0.1', agent.port, packet,
+                                      timeout=5)
+            results[request_id] = peek_request_id(response)
+
+        threads = [threading.Thread(target=request, args=(request_id,))
+                   for request_id in (11, 12, 13, 14)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        agent.close()
+        transport.close()
+        self.assertEqual(results, {11: 11, 12: 12, 13: 13, 14: 14})
+
+    def test_timeout(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(('127.0.0.1', 0))
+        packet = make_message(GetRequest(1, ObjectIdentifier(1)))
+        policy = RetransmissionPolicy(retries=2, initial_rto=0.01, jitter=0)
+        with Transport(policy) as transport:
+            with self.assertRaises(Timeout):
+                transport.send('127.0.0.1', sock.getsockname()[1], packet,
+                               timeout=0.1)
+        # The request was retransmitted once
+        self.assertEqual(sock.recvfrom(65535)[0], packet)
+        self.assertEqual(sock.recvfrom(65535)[0], packet)
+        agent = ('127.0.0.1', sock.getsockname()[1])
+        self.assertEqual(policy.estimator(agent).rto, 0.04)
+        sock.close()
+
+    def test_close_while_reading(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(('127.0.0.1', 0))
+        packet = make_message(GetRequest(1, ObjectIdentifier(1)))
+        policy = RetransmissionPolicy(retries=2, initial_rto=0.1, jitter=0)
+        transport = Transport(policy)
+        closer = threading.Timer(0.05, transport.close)
+        closer.start()
+        with self.assertRaises(Timeout):
+            transport.send('127.0.0.1', sock.getsockname()[1], packet,
+                           timeout=1)
+        closer.join()
+        transport.close()
+        # The retransmission was sent from a new socket
+        _, first = sock.recvfrom(65535)
+        _, second = sock.recvfrom(65535)
+        self.assertNotEqual(first, second)
+        sock.close()
+
+    def test_large_response(self):
+        agent = LargeResponseAgent()
+        packet = make_message(GetRequest(42, ObjectIdentifier(1)))
+        with Transport() as transport:
+            response = transport.send('127.0.0.1', agent.port, packet,
+                                      timeout=5)
+        agent.close()
+        self.assertEqual(response, LargeResponseAgent.response(42))
+
+    def test_receive_buffer_size(self):
+        with Transport() as transport:
+            default = transport._socket(socket.AF_INET).getsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF)
+        with Transport(receive_buffer_size=4096) as transport:
+            size = transport._socket(socket.AF_INET).getsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF)
+        # The OS may round the value (Linux doubles it)
+        self.assertLess(size, default)
+
+
+class TestSend(unittest.TestCase):
+
+    def test_large_response(self):
+        agent = LargeResponseAgent()
+        packet = make_message(GetRequest(42, ObjectIdentifier(1)))
+        response = send('127.0.0.1', agent.port, packet, timeout=5)
+        agent.close()
+        self.assertEqual(response, LargeResponseAgent.response(42))
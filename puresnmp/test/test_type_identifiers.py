@@ -106,3 +106,27 @@ add_class_detector(TestClassDetector, apptype.TimeTicks, APPLICATION, 0x03)
 add_class_detector(TestClassDetector, apptype.Opaque, APPLICATION, 0x04)
 add_class_detector(TestClassDetector, apptype.NsapAddress, APPLICATION, 0x05)
 add_class_detector(TestClassDetector, apptype.Counter64, APPLICATION, 0x06)
+
+
+class TestOctetLookup(ByteTester):
+
+    def test_primitive(self):
+        self.assertIs(t.Registry.lookup(0x02), t.Integer)
+
+    def test_constructed(self):
+        self.assertIs(t.Registry.lookup(0x30), t.Sequence)
+
+    def test_application(self):
+        self.assertIs(t.Registry.lookup(0x46), apptype.Counter64)
+
+    def test_unknown(self):
+        self.assertIsNone(t.Registry.lookup(0xfe))
+
+    def test_consistent_with_get(self):
+        for octet in range(0xff):
+            tinfo = TypeInfo.from_bytes(octet)
+            try:
+                expected = t.Registry.get(tinfo.cls, tinfo.tag)
+            except KeyError:
+                expected = None
+            self.assertIs(t.Registry.lookup(octet), expected)
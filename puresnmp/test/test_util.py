@@ -1,5 +1,14 @@
+import pytest
+
 from puresnmp.pdu import VarBind
-from puresnmp.util import WalkRow, get_unfinished_walk_oids, group_varbinds
+from puresnmp.util import (
+    OIDTrie,
+    WalkRow,
+    get_unfinished_walk_oids,
+    group_varbinds,
+    split_walk_ranges,
+    to_oid
+)
 from puresnmp.x690.types import Null, ObjectIdentifier
 
 OID = ObjectIdentifier.from_string
@@ -61,3 +70,39 @@ def test_get_unfinished_walk_oids():
         (OID('2.2'), WalkRow(VarBind(OID('2.2.2'), Null()), unfinished=True)),
     ]
     assert result == expected
+
+
+def test_to_oid():
+    oid = OID('1.2.3')
+    assert to_oid(oid) is oid
+    assert to_oid('1.2.3') == oid
+
+
+def test_group_varbinds_nested_roots():
+    varbinds = [VarBind(OID('1.1.1'), Null())]
+    with pytest.raises(RuntimeError):
+        group_varbinds(varbinds, [OID('1.1'), OID('1.1.1')])
+
+
+def test_oid_trie():
+    trie = OIDTrie([OID('1.2'), OID('1.2.3'), OID('1.3')])
+    assert trie.prefixes(OID('1.2.3.4')) == [OID('1.2'), OID('1.2.3')]
+    assert trie.prefixes(OID('1.2')) == [OID('1.2')]
+    assert trie.prefixes(OID('1.4.1')) == []
+    assert trie.prefixes(OID('1')) == []
+
+
+def test_split_walk_ranges():
+    result = split_walk_ranges(['1.2', '1.3'], ['128', '64'])
+    assert result == [
+        (OID('1.2'), OID('1.2'), OID('1.2.64')),
+        (OID('1.2'), OID('1.2.64'), OID('1.2.128')),
+        (OID('1.2'), OID('1.2.128'), None),
+        (OID('1.3'), OID('1.3'), OID('1.3.64')),
+        (OID('1.3'), OID('1.3.64'), OID('1.3.128')),
+        (OID('1.3'), OID('1.3.128'), None),
+    ]
+
+
+def test_split_walk_ranges_unsplit():
+    assert split_walk_ranges(['1.2'], None) == [(OID('1.2'), OID('1.2'), None)]
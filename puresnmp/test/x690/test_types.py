@@ -2,6 +2,7 @@
 
 import six
 import sys
+import unittest
 
 try:
     unicode
@@ -17,7 +18,10 @@ from ...x690.types import (
     OctetString,
     Sequence,
     Type,
+    decode_python_tlv,
+    decode_tlv,
     pop_tlv,
+    tlv_offsets,
     to_bytes
 )
 
@@ -152,6 +156,23 @@ class TestObjectIdentifier(ByteTester):
         expected = ObjectIdentifier(1, 2, 3)
         self.assertEqual(result, expected)
 
+    @unittest.skipIf(six.PY2, 'OID caching requires functools.lru_cache')
+    def test_fromstring_interned(self):
+        """
+        Parsing the same string (with or without leading dot) should return
+        the same instance.
+        """
+        result_a = ObjectIdentifier.from_string('1.3.6.1.2.1.1.5.0')
+        result_b = ObjectIdentifier.from_string('.1.3.6.1.2.1.1.5.0')
+        self.assertIs(result_a, result_b)
+
+    def test_encoding_repeatable(self):
+        oid = ObjectIdentifier(1, 3, 6, 1, 4, 1, 8072)
+        buffer = bytearray()
+        oid.encode_into(buffer)
+        self.assertBytesEqual(to_bytes(oid), bytes(buffer))
+        self.assertBytesEqual(to_bytes(oid), b'\x06\x07+\x06\x01\x04\x01\xbf\x08')
+
     def test_pythonize(self):
         result = ObjectIdentifier(1, 2, 3).pythonize()
         expected = '1.2.3'
@@ -215,6 +236,36 @@ class TestObjectIdentifier(ByteTester):
         b = ObjectIdentifier.from_string('1.3.6.1.2.1')
         self.assertFalse(a in b)
 
+    def test_startswith(self):
+        oid = ObjectIdentifier(1, 2, 3, 4)
+        self.assertTrue(oid.startswith(ObjectIdentifier(1, 2)))
+        self.assertTrue(oid.startswith(ObjectIdentifier(1, 2, 3, 4)))
+        self.assertFalse(oid.startswith(ObjectIdentifier(1, 3)))
+        self.assertFalse(oid.startswith(ObjectIdentifier(1, 2, 3, 4, 5)))
+
+    def test_startswith_decoded(self):
+        oid = ObjectIdentifier.from_bytes(b'\x06\x05\x2a\x03\x84\x00\x05')
+        self.assertTrue(oid.startswith(ObjectIdentifier(1, 2, 3, 512)))
+        self.assertFalse(oid.startswith(ObjectIdentifier(1, 2, 3, 4)))
+        self.assertTrue(oid.startswith(ObjectIdentifier(1)))
+
+    def test_decode_nodes_lazily(self):
+        oid = ObjectIdentifier.from_bytes(b'\x06\x03\x2b\x06\x01')
+        self.assertIsNone(oid._nodes)
+        self.assertEqual(oid, ObjectIdentifier(1, 3, 6, 1))
+        self.assertIsNone(oid._nodes)
+        self.assertEqual(oid.identifiers, (1, 3, 6, 1))
+
+    def test_from_content(self):
+        result = ObjectIdentifier.from_content(b'\x2b\x06\x81\x00')
+        expected = ObjectIdentifier(1, 3, 6, 128)
+        self.assertEqual(result, expected)
+        self.assertEqual(hash(result), hash(expected))
+        self.assertEqual(str(result), '1.3.6.128')
+
+    def test_slots(self):
+        self.assertFalse(hasattr(ObjectIdentifier(1, 3), '__dict__'))
+
     def test_create_by_iterable(self):
         result = ObjectIdentifier(['1', '2', '3'])
         expected = ObjectIdentifier(1, 2, 3)
@@ -412,6 +463,21 @@ class TestIntegerValues(ByteTester):
         expected = b'\x02\x05\x00\xff\xff\xff\xff'
         self.assertBytesEqual(result, expected)
 
+    def test_decode_small_value_shared(self):
+        first = Integer.from_bytes(b'\x02\x01\x02')
+        second = Integer.from_bytes(b'\x02\x01\x02')
+        self.assertIs(first, second)
+        self.assertEqual(first, Integer(2))
+
+    def test_decode_large_value_not_shared(self):
+        first = Integer.from_bytes(b'\x02\x02\x01\x00')
+        second = Integer.from_bytes(b'\x02\x02\x01\x00')
+        self.assertIsNot(first, second)
+        self.assertEqual(first, Integer(256))
+
+    def test_slots(self):
+        self.assertFalse(hasattr(Integer(1), '__dict__'))
+
 
 class TestString(ByteTester):
 
@@ -452,6 +518,26 @@ class TestSequence(ByteTester):
         )
         self.assertBytesEqual(result, expected)
 
+    def test_encoding_long(self):
+        value = Sequence(
+            Sequence(OctetString(b'x' * 200)),
+            Integer(1),
+        )
+        result = to_bytes(value)
+        expected = (
+            b'\x30\x81\xd1'
+            b'\x30\x81\xcb'
+            b'\x04\x81\xc8' + b'x' * 200 +
+            b'\x02\x01\x01'
+        )
+        self.assertBytesEqual(result, expected)
+
+    def test_encode_into(self):
+        buffer = bytearray(b'prefix')
+        Sequence(Integer(1), Null()).encode_into(buffer)
+        self.assertBytesEqual(buffer, bytearray(b'prefix\x30\x05'
+                                                b'\x02\x01\x01\x05\x00'))
+
     def test_decoding_simple(self):
         result = Sequence.from_bytes(
             b'\x30\x0b'
@@ -487,6 +573,31 @@ class TestSequence(ByteTester):
         )
         self.assertEqual(result, expected)
 
+    def test_decoding_lazy(self):
+        data = (
+            b'\x30\x13'
+            b'\x02\x01\x01'
+            b'\x02\x01\x02'
+            b'\x04\x03foo'
+            b'\x30\x06'
+            b'\x02\x01\x01'
+            b'\x02\x01\x02'
+        )
+        result = Sequence.from_bytes(data, lazy=True)
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result[-1], Sequence(Integer(1), Integer(2)))
+        self.assertEqual(result[1:3], (Integer(2), OctetString(b'foo')))
+        self.assertEqual(result, Sequence.from_bytes(data))
+
+    def test_tlv_offsets(self):
+        result = tlv_offsets(b'\x02\x01\x05\x04\x03foo\x05\x00')
+        expected = [0, 3, 8]
+        self.assertEqual(result, expected)
+
+    def test_tlv_offsets_corrupt(self):
+        with six.assertRaisesRegex(self, ValueError, 'Corrupt'):
+            tlv_offsets(b'\x02\x01\x05\x04\x03fo')
+
     def test_pythonize(self):
         result = Sequence(Integer(1), Sequence(OctetString('123'))).pythonize()
         expected = [1, [b"123"]]
@@ -551,6 +662,10 @@ class TestNull(ByteTester):
         result = repr(Null())
         self.assertEqual(result, expected)
 
+    def test_singleton(self):
+        self.assertIs(Null(), Null())
+        self.assertIs(Null.from_bytes(b'\x05\x00'), Null())
+
 
 class TestUnknownType(ByteTester):
 
@@ -605,6 +720,34 @@ class TestAllTypes(ByteTester):
         self.assertEqual(result[0].length, 1)
         self.assertEqual(result[0].value, b'\x00')
 
+    def test_decode_tlv_offsets(self):
+        data = memoryview(b'\x02\x01\x05\x04\x03foo')
+        first, offset = decode_tlv(data)
+        second, offset2 = decode_tlv(data, offset)
+        self.assertEqual((first, offset), (Integer(5), 3))
+        self.assertEqual((second, offset2), (OctetString(b'foo'), 8))
+        self.assertIsInstance(second.value, bytes)
+
+    def test_decode_python_tlv(self):
+        data = memoryview(b'\x02\x01\xfb\x04\x03foo\x05\x00\xfe\x01\x00')
+        first, offset = decode_python_tlv(data)
+        second, offset = decode_python_tlv(data, offset)
+        third, offset = decode_python_tlv(data, offset)
+        fourth, offset = decode_python_tlv(data, offset)
+        self.assertEqual((first, second, third, fourth),
+                         (-5, b'foo', None, b'\x00'))
+        self.assertIsInstance(second, bytes)
+        self.assertEqual(offset, 13)
+
+    def test_decode_tlv_end(self):
+        result = decode_tlv(memoryview(b'\x02\x01\x05'), 3)
+        expected = (Null(), 3)
+        self.assertEqual(result, expected)
+
+    def test_decode_tlv_corrupt_length(self):
+        with six.assertRaisesRegex(self, ValueError, 'length'):
+            decode_tlv(memoryview(b'\x04\x05foo'))
+
     def test_validation_wrong_typeclass(self):
         with self.assertRaises(ValueError):
             Integer.validate(to_bytes([0b00111110]))
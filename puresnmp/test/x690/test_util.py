@@ -10,7 +10,10 @@ from ...x690.util import (
     Length,
     TypeInfo,
     decode_length,
+    decode_length_at,
     encode_length,
+    patch_length,
+    reserve_length,
     tablify,
     to_bytes,
     visible_octets
@@ -213,6 +216,21 @@ class TestLengthOctets(ByteTester):
             TypeInfo.from_bytes(0b11111111)
         self.skipTest('Not yet implemented')  # TODO implement
 
+    def test_patch_length_short(self):
+        buffer = bytearray(b'\x30')
+        position = reserve_length(buffer)
+        buffer.extend(b'\x05\x00')
+        patch_length(buffer, position)
+        self.assertBytesEqual(buffer, bytearray(b'\x30\x02\x05\x00'))
+
+    def test_patch_length_long(self):
+        buffer = bytearray(b'\x30')
+        position = reserve_length(buffer)
+        buffer.extend(b'x' * 200)
+        patch_length(buffer, position)
+        expected = bytearray(b'\x30\x81\xc8' + b'x' * 200)
+        self.assertBytesEqual(buffer, expected)
+
     def test_decode_length_short(self):
         data = b'\x05'
         expected = 5
@@ -234,6 +252,16 @@ class TestLengthOctets(ByteTester):
         self.assertEqual(result, expected)
         self.assertEqual(data, b'')
 
+    def test_decode_length_at_short(self):
+        data = b'\x30\x05\x02'
+        result = decode_length_at(data, 1)
+        self.assertEqual(result, (5, 2))
+
+    def test_decode_length_at_long(self):
+        data = memoryview(to_bytes([0x30, 0x82, 0x01, 0xb3, 0x02]))
+        result = decode_length_at(data, 1)
+        self.assertEqual(result, (435, 4))
+
     def test_decode_length_indefinite(self):
         with self.assertRaises(NotImplementedError):
             decode_length(to_bytes([0b10000000]))
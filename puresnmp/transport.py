@@ -12,42 +12,157 @@ hard to test.
 #                          "pragma: no cover" to each function.
 
 import logging
+import os
+import random
 import socket
+import threading
 from ipaddress import ip_address
+from typing import TYPE_CHECKING
 
 from .exc import Timeout
+from .pdu import peek_request_id
+from .retransmission import RetransmissionPolicy
 from .x690.util import visible_octets
 
+try:
+    from time import monotonic
+except ImportError:  # pragma: no cover
+    from time import time as monotonic  # type: ignore
+
+if TYPE_CHECKING:  # pragma: no cover
+    # pylint: disable=unused-import
+    from typing import Any, Callable, Dict, Optional, Set, Tuple
+
 LOG = logging.getLogger(__name__)
 RETRIES = 3
 
+#: The retransmission policy shared by :py:func:`~.send`, the
+#: :py:class:`~.Transport` instances and the asyncio transports. It keeps the
+#: round-trip time estimates of all agents.
+RETRANSMISSION = RetransmissionPolicy(RETRIES)
+
+#: The largest request-id. Request IDs are encoded as signed 32 bit integer.
+MAX_REQUEST_ID = 2**31 - 1
+
+#: The largest possible payload of one UDP datagram. This is the size of the
+#: receive buffers.
+MAX_DATAGRAM_SIZE = 65535
+
+#: The receive buffers of :py:func:`~.send` (one per thread).
+_BUFFERS = threading.local()
+
+
+def _receive_buffer():
+    # type: () -> memoryview
+    '''
+    Returns the preallocated receive buffer of the current thread. It is
+    large enough for any UDP datagram.
+    '''
+    buffer = getattr(_BUFFERS, 'buffer', None)
+    if buffer is None:
+        buffer = memoryview(bytearray(MAX_DATAGRAM_SIZE))
+        _BUFFERS.buffer = buffer
+    return buffer
+
 
 def recv_all(sock):
     '''
-    Read data from socket using ``sock.recv`` until no bytes are left to read.
+    Reads one datagram from *sock* and returns it.
 
-    Unfortunately, decoding the byte-length is non-trivial according to the
-    X690 standard (see :py:func:`puresnmp.x690.types.pop_tlv` and
-    :py:func:`puresnmp.x690.util.decode_length` for more details.
+    A UDP datagram is always read as a whole (whatever does not fit into the
+    buffer is discarded by the operating system). The datagram is read with
+    ``sock.recv_into`` into a preallocated buffer which can hold the largest
+    possible datagram (see :py:data:`~.MAX_DATAGRAM_SIZE`) and then copied
+    out.
+    '''
+    buffer = _receive_buffer()
+    nbytes = sock.recv_into(buffer)
+    return buffer[:nbytes].tobytes()
 
-    This means a simple call to ``recv`` does not have length-information and
-    detecting the end of the stream is more error-prone.
 
-    This could be refactored in the future to meld the x690 and "transport"
-    layers together.
+def address_family(ip):
+    # type: ( str ) -> int
+    """
+    Returns the socket address family (``AF_INET`` or ``AF_INET6``) for the
+    IP address *ip*.
+    """
+    checked_ip = ip_address(ip)
+    if checked_ip.version == 4:
+        return socket.AF_INET
+    return socket.AF_INET6
 
-    See https://stackoverflow.com/a/17697651/160665
-    '''
-    buffer_size = 4096 # 4 KiB
-    chunks = []
+
+def _receive(sock, request_id, deadline):  # pragma: no cover
+    # type: ( socket.socket, Optional[int], float ) -> Optional[bytes]
+    """
+    Receives the response with the request-id *request_id* from *sock*.
+    Other datagrams (f.ex. late responses to earlier requests) are dropped.
+    Returns ``None`` if no matching response arrived before *deadline*.
+    """
     while True:
-        chunk = sock.recv(buffer_size)
-        chunks.append(chunk)
-        if len(chunk) < buffer_size:
-            # either 0 or end of data
-            break
-    data = b''.join(chunks)
-    return data
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            return None
+        sock.settimeout(remaining)
+        buffer = _receive_buffer()
+        try:
+            nbytes = sock.recv_into(buffer)
+        except socket.timeout:
+            return None
+        # Only the header is decoded to check the request-id. The datagram
+        # is not copied out of the buffer unless it is the expected one.
+        if peek_request_id(buffer[:nbytes]) == request_id:
+            return buffer[:nbytes].tobytes()
+        LOG.debug('Dropping packet with unexpected request-id (expected '
+                  '%r)', request_id)
+
+
+def _retransmit(policy, ip, port, packet, timeout, transmit, receive):
+    # type: ( RetransmissionPolicy, str, int, bytes, float, Callable[[], Any], Callable[[float], Optional[bytes]] ) -> bytes
+    """
+    Runs the attempts of one request as decided by *policy*. *transmit* sends
+    the packet and *receive* waits up to the given number of seconds for the
+    response (returning ``None`` on timeout).
+
+    If no response arrives within *timeout* seconds, a
+    :py:exc:`~puresnmp.exc.Timeout` exception is raised.
+    """
+    agent = (ip, port)
+    num_attempts = 0
+    for attempt, wait in policy.attempts(agent, timeout):
+        num_attempts += 1
+        if LOG.isEnabledFor(logging.DEBUG):
+            hexdump = visible_octets(packet)
+            LOG.debug('Sending packet to %s:%s (attempt %d/%d, waiting '
+                      '%.3fs)\n%s', ip, port, (attempt+1), policy.retries,
+                      wait, hexdump)
+        sent = monotonic()
+        transmit()
+        response = receive(wait)
+        if response is not None:
+            policy.success(agent, attempt, monotonic() - sent)
+            if LOG.isEnabledFor(logging.DEBUG):
+                hexdump = visible_octets(response)
+                LOG.debug('Received packet:\n%s', hexdump)
+            return response
+        policy.failure(agent)
+        LOG.debug('Timeout during attempt #%d', (attempt+1))
+    raise Timeout('No response from %s:%s after %d attempts within %s '
+                  'seconds' % (ip, port, num_attempts, timeout))
+
+
+def _exchange(sock, ip, port, packet, timeout):  # pragma: no cover
+    # type: ( socket.socket, str, int, bytes, int ) -> bytes
+    """
+    Sends *packet* to *ip:port* using the UDP socket *sock* and returns the
+    response with the same request-id. Retransmissions are handled by
+    :py:data:`~.RETRANSMISSION`.
+    """
+    request_id = peek_request_id(packet)
+    return _retransmit(
+        RETRANSMISSION, str(ip_address(ip)), port, packet, timeout,
+        lambda: sock.sendto(packet, (ip, port)),
+        lambda wait: _receive(sock, request_id, monotonic() + wait))
 
 
 def send(ip, port, packet, timeout=2):  # pragma: no cover
@@ -56,48 +171,252 @@ def send(ip, port, packet, timeout=2):  # pragma: no cover
     Opens a TCP connection to *ip:port*, sends a packet with *bytes* and
     returns the raw bytes as returned from the remote host.
 
-    If the connection fails due to a timeout, the connection is retried 3
-    times.  If it still failed, a Timeout exception is raised.
+    If no response arrives, the request is retransmitted (see
+    :py:mod:`puresnmp.retransmission`). If no response arrived within
+    *timeout* seconds, a Timeout exception is raised.
     """
-    checked_ip = ip_address(ip)
-    if checked_ip.version == 4:
-        address_family = socket.AF_INET
-    else:
-        address_family = socket.AF_INET6
+    sock = socket.socket(address_family(ip), socket.SOCK_DGRAM)
+    try:
+        return _exchange(sock, ip, port, packet, timeout)
+    finally:
+        sock.close()
 
-    sock = socket.socket(address_family, socket.SOCK_DGRAM)
-    sock.settimeout(timeout)
 
-    for num_retry in range(RETRIES):
+class Transport(object):
+    """
+    A UDP transport which keeps its sockets open between requests and
+    demultiplexes the responses.
+
+    :py:func:`~.send` opens and closes one socket for each request. This
+    class instead keeps one (unconnected) socket per address family and
+    reuses it. Its :py:meth:`~.send` method has the same signature as the
+    module-level :py:func:`~.send` function.
+
+    The transport is thread-safe. Many requests (to the same or to different
+    agents) can be outstanding on the same socket at the same time. Each
+    response is routed to the waiting request by the address of the sender
+    and the request-id. Datagrams which do not match an outstanding request
+    (f.ex. late or duplicate responses to earlier attempts) are dropped.
+
+    Retransmissions are handled by *policy* (by default the shared
+    :py:data:`~.RETRANSMISSION` policy).
+
+    Only one thread reads from a socket at a time. All other threads wait
+    until the reading thread has dispatched a datagram, and one of them
+    takes over reading if the response for the reading thread has arrived.
+    Each datagram is read into a preallocated buffer and only its header is
+    decoded to find the waiting request.
+
+    *receive_buffer_size* sets the size of the socket receive buffer
+    (``SO_RCVBUF``) of the operating system. Increase it if many responses
+    arrive at the same time (f.ex. when polling many agents) to avoid
+    dropped datagrams.
+
+    Example::
+
+        >>> transport = Transport()
+        >>> response = transport.send('192.168.1.1', 161, packet)
+        >>> transport.close()
+    """
+
+    def __init__(self, policy=None, receive_buffer_size=None):
+        # type: (Optional[RetransmissionPolicy], Optional[int]) -> None
+        self.policy = policy or RETRANSMISSION
+        self.receive_buffer_size = receive_buffer_size
+        self._sockets = {}  # type: Dict[int, socket.socket]
+        self._buffers = {}  # type: Dict[int, memoryview]
+        self._condition = threading.Condition()
+        self._waiters = {}  # type: Dict[Tuple[str, int, Optional[int]], Optional[bytes]]
+        self._reading = set()  # type: Set[int]
+
+    def _socket(self, family):
+        # type: (int) -> socket.socket
+        sock = self._sockets.get(family)
+        if sock is None:
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            if self.receive_buffer_size:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                                self.receive_buffer_size)
+            self._sockets[family] = sock
+            self._buffers[family] = memoryview(bytearray(MAX_DATAGRAM_SIZE))
+        return sock
+
+    def _dispatch(self, data, addr):
+        # type: (memoryview, Tuple[str, int]) -> None
+        """
+        Hands the datagram *data* received from *addr* to the waiting
+        request. Must be called while holding the lock of the condition.
+
+        *data* is a view on the receive buffer. Only the header is decoded
+        to find the request. The datagram is copied only if a request is
+        waiting for it.
+        """
+        key = (addr[0], addr[1], peek_request_id(data))
+        if key in self._waiters and self._waiters[key] is None:
+            self._waiters[key] = data.tobytes()
+            self._condition.notify_all()
+        else:
+            LOG.debug('Dropping unexpected packet from %s:%s (request-id '
+                      '%r)', *key)
+
+    def _wait(self, family, key, deadline):
+        # type: (int, Tuple[str, int, Optional[int]], float) -> Optional[bytes]
+        """
+        Waits for the response to the request identified by *key*. Returns
+        ``None`` if it did not arrive before *deadline*.
+        """
+        with self._condition:
+            while True:
+                response = self._waiters.get(key)
+                if response is not None:
+                    return response
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    return None
+                if family in self._reading:
+                    self._condition.wait(remaining)
+                    continue
+
+                self._reading.add(family)
+                sock = self._socket(family)
+                buffer = self._buffers[family]
+                self._condition.release()
+                try:
+                    sock.settimeout(remaining)
+                    nbytes, addr = sock.recvfrom_into(buffer)
+                except socket.timeout:
+                    nbytes = None
+                except socket.error:
+                    if self._sockets.get(family) is sock:
+                        raise
+                    # The socket was closed by another thread. The next
+                    # reader uses a new socket and retransmissions are sent
+                    # from it.
+                    nbytes = None
+                finally:
+                    self._condition.acquire()
+                    self._reading.discard(family)
+                    self._condition.notify_all()
+                if nbytes is not None:
+                    # The buffer is only reused by the next reading thread
+                    # after the lock is released again.
+                    self._dispatch(buffer[:nbytes], addr)
+
+    def _sendto(self, family, packet, address):
+        # type: (int, bytes, Tuple[str, int]) -> None
+        with self._condition:
+            self._socket(family).sendto(packet, address)
+
+    def send(self, ip, port, packet, timeout=2):
+        # type: ( str, int, bytes, int ) -> bytes
+        """
+        Sends *packet* to *ip:port* and returns the response. See
+        :py:func:`~.send`.
+        """
+        family = address_family(ip)
+        key = (str(ip_address(ip)), port, peek_request_id(packet))
+        with self._condition:
+            if key in self._waiters:
+                raise ValueError('A request with the ID %r to %s:%s is '
+                                 'already in progress!' % (key[2], ip, port))
+            self._waiters[key] = None
+
         try:
-            if LOG.isEnabledFor(logging.DEBUG):
-                hexdump = visible_octets(packet)
-                LOG.debug('Sending packet to %s:%s (attempt %d/%d)\n%s',
-                          ip, port, (num_retry+1), RETRIES, hexdump)
-            sock.sendto(packet, (ip, port))
-            response = recv_all(sock)
-            break
-        except socket.timeout:
-            LOG.debug('Timeout during attempt #%d',
-                      (num_retry+1))  # TODO add detail
-            continue
-    else:
-        raise Timeout("Max of %d retries reached" % RETRIES)
-    sock.close()
+            return _retransmit(
+                self.policy, key[0], port, packet, timeout,
+                lambda: self._sendto(family, packet, (ip, port)),
+                lambda wait: self._wait(family, key, monotonic() + wait))
+        finally:
+            with self._condition:
+                del self._waiters[key]
+
+    def close(self):
+        # type: () -> None
+        """
+        Closes all sockets. They are reopened on the next request.
+        """
+        with self._condition:
+            for sock in self._sockets.values():
+                sock.close()
+            self._sockets.clear()
+            self._buffers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class RequestIdAllocator(object):
+    """
+    Hands out SNMP request IDs.
+
+    The IDs are sequential, starting at a random value, and wrap around at
+    :py:data:`~.MAX_REQUEST_ID`. This makes collisions between concurrent
+    requests of one process impossible (until 2**31 requests are in flight)
+    and unlikely between different processes. The allocator is thread-safe.
+
+    Example::
+
+        >>> allocator = RequestIdAllocator(10)
+        >>> allocator.allocate(), allocator.allocate()
+        (10, 11)
+    """
+
+    def __init__(self, start=None):
+        # type: (Optional[int]) -> None
+        self._lock = threading.Lock()
+        self._next = 0
+        self.reset(start)
+
+    def reset(self, start=None):
+        # type: (Optional[int]) -> None
+        """
+        Restarts the sequence at *start* (or at a random value if *start* is
+        ``None``).
+        """
+        if start is None:
+            start = random.randint(1, MAX_REQUEST_ID)
+        with self._lock:
+            self._next = start
+
+    def after_fork(self):
+        # type: () -> None
+        """
+        Restarts the sequence at a random value in a forked child process.
+
+        Another thread of the parent may have held the lock while forking and
+        will never release it in the child, so the lock is replaced instead
+        of acquired.
+        """
+        self._lock = threading.Lock()
+        self._next = random.randint(1, MAX_REQUEST_ID)
+
+    def allocate(self):
+        # type: () -> int
+        """
+        Returns the next request ID.
+        """
+        with self._lock:
+            request_id = self._next
+            self._next = request_id % MAX_REQUEST_ID + 1
+        return request_id
+
 
-    if LOG.isEnabledFor(logging.DEBUG):
-        hexdump = visible_octets(response)
-        LOG.debug('Received packet:\n%s', hexdump)
+#: The allocator used by :py:func:`~.get_request_id`.
+REQUEST_IDS = RequestIdAllocator()
 
-    return response
+if hasattr(os, 'register_at_fork'):
+    # Forked processes should not hand out the same IDs as their parent.
+    os.register_at_fork(  # pylint: disable=no-member
+        after_in_child=REQUEST_IDS.after_fork)
 
 
 def get_request_id():  # pragma: no cover
+    # type: () -> int
     """
-    Generates a SNMP request ID. This value should be unique for each request.
+    Generates a SNMP request ID. This value is unique for each request of
+    this process (see :py:class:`~.RequestIdAllocator`).
     """
-    # TODO check if this is good enough. My gut tells me "no"! Depends if it
-    # has to be unique across all clients, or just one client. If it's just
-    # one client it *may* be enough.
-    from time import time
-    return int(time())
+    return REQUEST_IDS.allocate()
@@ -25,6 +25,7 @@ class IpAddress(OctetString):
     """
     SNMP Type for IPv4 Addresses
     """
+    __slots__ = ()
     TYPECLASS = TypeInfo.APPLICATION
     TAG = 0x00
 
@@ -57,41 +58,54 @@ class Counter(Integer):
     """
     SNMP type for counters.
     """
+    __slots__ = ()
     TYPECLASS = TypeInfo.APPLICATION
     TAG = 0x01
+    ARRAY_TYPECODE = 'Q'
 
 
 class Gauge(Integer):
     """
     SNMP type for gauges.
     """
+    __slots__ = ()
     TYPECLASS = TypeInfo.APPLICATION
     TAG = 0x02
+    ARRAY_TYPECODE = 'Q'
 
 
 class TimeTicks(Integer):
     """
     SNMP type for time ticks.
     """
+    __slots__ = ()
     TYPECLASS = TypeInfo.APPLICATION
     TAG = 0x03
+    ARRAY_TYPECODE = 'Q'
 
     def __init__(self, value):
         if isinstance(value, timedelta):
             value = int(value.total_seconds() * 100)
         super(TimeTicks, self).__init__(value)
 
+    @classmethod
+    def decode_python(cls, data):
+        seconds = super(TimeTicks, cls).decode_python(data) / 100.0
+        return timedelta(seconds=seconds)
+
     def pythonize(self):
         seconds = self.value / 100.0  # see rfc2578#section-7.1.8
         return timedelta(seconds=seconds)
 
 
 class Opaque(OctetString):
+    __slots__ = ()
     TYPECLASS = TypeInfo.APPLICATION
     TAG = 0x04
 
 
 class NsapAddress(Integer):
+    __slots__ = ()
     TYPECLASS = TypeInfo.APPLICATION
     TAG = 0x05
 
@@ -100,8 +114,10 @@ class Counter64(Integer):
     """
     As defined in RFC 2578
     """
+    __slots__ = ()
     TYPECLASS = TypeInfo.APPLICATION
     TAG = 0x06
+    ARRAY_TYPECODE = 'Q'
 
 
 def _walk_subclasses(cls, indent=0):  # pragma: no cover
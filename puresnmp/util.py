@@ -4,17 +4,81 @@ Colleciton of utility functions for the puresnmp package.
 from collections import namedtuple
 from typing import TYPE_CHECKING
 
+from .x690.types import ObjectIdentifier
+
 if TYPE_CHECKING:
     # pylint: disable=unused-import
-    from typing import Dict, List, Optional, Tuple
+    from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
     from .pdu import VarBind
-    from .x690.types import ObjectIdentifier
 
 
 WalkRow = namedtuple('WalkRow', 'value unfinished')
 BulkResult = namedtuple('BulkResult', 'scalars listing')
 
 
+def to_oid(value):
+    # type: (Union[str, ObjectIdentifier]) -> ObjectIdentifier
+    """
+    Returns *value* unmodified if it already is an
+    :py:class:`~puresnmp.x690.types.ObjectIdentifier` and parses it using the
+    (cached) :py:meth:`~puresnmp.x690.types.ObjectIdentifier.from_string`
+    otherwise.
+
+    This avoids converting OIDs to strings and back when they are passed
+    between API functions.
+    """
+    if isinstance(value, ObjectIdentifier):
+        return value
+    return ObjectIdentifier.from_string(value)
+
+
+class OIDTrie(object):
+    """
+    A prefix tree over :py:class:`~puresnmp.x690.types.ObjectIdentifier`
+    instances.
+
+    Finding all registered OIDs which contain a given OID takes
+    ``O(len(oid))`` time, independent of the number of registered OIDs::
+
+        >>> trie = OIDTrie([OID('1.2'), OID('1.3')])
+        >>> trie.prefixes(OID('1.2.3.4'))
+        [ObjectIdentifier((1, 2))]
+    """
+
+    def __init__(self, oids=()):
+        # type: (Iterable[ObjectIdentifier]) -> None
+        self._root = {}  # type: Dict[Any, Any]
+        for oid in oids:
+            self.add(oid)
+
+    def add(self, oid):
+        # type: (ObjectIdentifier) -> None
+        """
+        Adds *oid* to the tree.
+        """
+        node = self._root
+        for identifier in oid.identifiers:
+            node = node.setdefault(identifier, {})
+        # ``None`` can never be an OID node and marks the end of an OID.
+        node[None] = oid
+
+    def prefixes(self, oid):
+        # type: (ObjectIdentifier) -> List[ObjectIdentifier]
+        """
+        Returns all registered OIDs which contain *oid* (or are equal to it),
+        ordered from the shortest to the longest one.
+        """
+        output = []
+        node = self._root
+        for identifier in oid.identifiers:
+            node = node.get(identifier)
+            if node is None:
+                break
+            if None in node:
+                output.append(node[None])
+        return output
+
+
 def group_varbinds(varbinds, effective_roots, user_roots=None):
     # type: (List[VarBind], List[ObjectIdentifier], Optional[List[ObjectIdentifier]]) -> Dict[ObjectIdentifier, List[VarBind]]
     """
@@ -30,11 +94,11 @@ def group_varbinds(varbinds, effective_roots, user_roots=None):
         requested by the user. This list will keep track of the original OIDs
         to determine when the walk needs to terminate.
     """
-    roots = user_roots or effective_roots
+    roots = OIDTrie(user_roots or effective_roots)
 
-    results = {}
+    results = {}  # type: Dict[ObjectIdentifier, List[VarBind]]
     for varbind in varbinds:
-        containment = [base for base in roots if varbind.oid in base]
+        containment = roots.prefixes(varbind.oid)
         if len(containment) > 1:
             raise RuntimeError('Unexpected OID result. A value was '
                                'contained in more than one base than '
@@ -68,9 +132,28 @@ def get_unfinished_walk_oids(grouped_oids):
 
     # Build a mapping from the originally requested OID to the last fetched OID
     # from that tree.
-    last_received_oids = {k: WalkRow(v[-1], v[-1].oid in k)
+    last_received_oids = {k: WalkRow(v[-1], v[-1].oid.startswith(k))
                           for k, v in grouped_oids.items()}
 
     output = [item for item in sorted(last_received_oids.items())
               if item[1].unfinished]
     return output
+
+
+def split_walk_ranges(oids, split_points):
+    # type: (List[str], Optional[List[str]]) -> List[Tuple[ObjectIdentifier, ObjectIdentifier, Optional[ObjectIdentifier]]]
+    """
+    Splits the trees below *oids* at *split_points* (relative to each OID).
+    Returns a ``(root, start, stop)`` tuple for each piece. A piece contains
+    the OIDs below *root* which are greater than *start* and not greater
+    than *stop* (``None`` for the end of the tree), so the pieces of one
+    tree neither overlap nor leave gaps.
+    """
+    suffixes = sorted(to_oid(point) for point in split_points or [])
+    ranges = []
+    for oid in oids:
+        root = to_oid(oid)
+        bounds = [root] + [root + suffix for suffix in suffixes] + [None]
+        for start, stop in zip(bounds, bounds[1:]):
+            ranges.append((root, start, stop))
+    return ranges
@@ -43,15 +43,15 @@ import warnings
 from typing import Union, TYPE_CHECKING
 
 import six
-from six.moves import zip_longest
 
-from .util import (TypeInfo, decode_length, encode_length, int_from_bytes,
-                   to_bytes)
+from .util import (TypeInfo, decode_length_at, encode_length,
+                   int_from_bytes, int_to_bytes, patch_length,
+                   reserve_length, to_bytes)
 
 
 if TYPE_CHECKING:  # pragma: no cover
     # pylint: disable=unused-import
-    from typing import Any, Callable, Dict, Tuple
+    from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:
     unicode  # type: Callable[[Any], str]
@@ -59,21 +59,168 @@ except NameError:
     # pylint: disable=invalid-name
     unicode = str  # type: Callable[[Any], str]
 
+try:
+    from functools import lru_cache
+except ImportError:  # pragma: no cover (Python 2)
+    lru_cache = None  # type: ignore
+
+#: The maximum number of OID strings kept in the cache of
+#: :py:meth:`~.ObjectIdentifier.from_string`.
+OID_CACHE_SIZE = 16384
+
+#: Decoded integers below this value are shared instances (see
+#: :py:class:`~.Integer`).
+SMALL_INTEGER_LIMIT = 256
+
+_SMALL_INTEGERS = {}  # type: Dict[type, List[Integer]]
+
 
 class Registry(type):
+    """
+    Keeps track of all :py:class:`~.Type` subclasses.
+
+    Classes can be looked up either by typeclass and tag using
+    :py:meth:`~.get`, or directly by the raw identifier octet using
+    :py:meth:`~.lookup`. The latter is backed by a 256-entry table which is
+    updated each time a new type is defined, so decoding never needs to
+    build a :py:class:`~puresnmp.x690.util.TypeInfo` instance.
+    """
 
     __registry = {}  # type: Dict[Tuple[str, int], type]
+    __octets = [None] * 256  # type: List[Optional[type]]
 
     def __new__(mcs, name, parents, dict_):
         new_cls = super(Registry, mcs).__new__(mcs, name, parents, dict_)
         if hasattr(new_cls, 'TAG'):
             Registry.__registry[(new_cls.TYPECLASS, new_cls.TAG)] = new_cls
+            octet = six.byte2int(to_bytes(TypeInfo(
+                new_cls.TYPECLASS, TypeInfo.PRIMITIVE, new_cls.TAG)))
+            new_cls._identifier = octet
+            if new_cls.TAG < 0b11111:
+                # Both the primitive and constructed variant map to the same
+                # class (the 6th bit is the primitive/constructed flag).
+                Registry.__octets[octet] = new_cls
+                Registry.__octets[octet | 0b00100000] = new_cls
         return new_cls
 
     @staticmethod
     def get(typeclass, typeid):
         return Registry.__registry[(typeclass, typeid)]
 
+    @staticmethod
+    def lookup(octet):
+        # type: (int) -> Optional[type]
+        """
+        Returns the class registered for the identifier octet *octet* (as
+        integer), or ``None`` if no class is registered for it.
+        """
+        return Registry.__octets[octet]
+
+
+def decode_tlv(data, offset=0, lazy=False):
+    # type: (Union[bytes, memoryview], int, bool) -> Tuple[Type, int]
+    """
+    Decodes the TLV value starting at position *offset* in *data* and returns
+    a tuple containing the typed instance and the offset of the first octet
+    *following* that value.
+
+    Contrary to :py:func:`~.pop_tlv`, the data is never copied. Pass in a
+    :py:class:`memoryview` to walk over a large packet without generating
+    intermediate bytes objects. The content octets are handed to the
+    ``decode`` method of the detected type as a slice of *data* (so a
+    :py:class:`memoryview` stays a :py:class:`memoryview`).
+
+    If *lazy* is true, the value is decoded using
+    :py:meth:`~.Type.decode_lazy` instead of :py:meth:`~.Type.decode`.
+
+    Example::
+
+        >>> data = memoryview(b'\\x02\\x01\\x05\\x02\\x01\\x06')
+        >>> decode_tlv(data)
+        (Integer(5), 3)
+        >>> decode_tlv(data, 3)
+        (Integer(6), 6)
+    """
+    if offset >= len(data):
+        return Null(), offset
+    identifier = six.indexbytes(data, offset)
+    if identifier == 0b11111111:
+        raise NotImplementedError('Long identifier types are not yet '
+                                  'implemented')
+    length, start = decode_length_at(data, offset + 1)
+    end = start + length
+    cls = Registry.lookup(identifier) or UnknownType
+    if end > len(data):
+        raise ValueError('Corrupt packet: Unexpected length for {0} '
+                         'Expected {1} (0x{1:02x}) '
+                         'but got {2} (0x{2:02x})'.format(
+                             cls, length, len(data) - start))
+    if cls is UnknownType:
+        return UnknownType(identifier, bytes(data[start:end])), end
+    cls.validate(data[offset:end])
+    if lazy:
+        return cls.decode_lazy(data[start:end]), end
+    return cls.decode(data[start:end]), end
+
+
+def decode_python_tlv(data, offset=0):
+    # type: (Union[bytes, memoryview], int) -> Tuple[Any, int]
+    """
+    Same as :py:func:`~.decode_tlv` but returns the value as pure Python
+    object (the same value as returned by :py:meth:`~.Type.pythonize`).
+
+    The value is converted using :py:meth:`~.Type.decode_python`. For most
+    types this skips the creation of :py:class:`~.Type` instances entirely.
+    Values of unknown types are returned as :py:class:`bytes`.
+
+    Example::
+
+        >>> decode_python_tlv(b'\\x02\\x01\\x05\\x04\\x03foo', 3)
+        (b'foo', 8)
+    """
+    identifier = six.indexbytes(data, offset)
+    if identifier == 0b11111111:
+        raise NotImplementedError('Long identifier types are not yet '
+                                  'implemented')
+    length, start = decode_length_at(data, offset + 1)
+    end = start + length
+    if end > len(data):
+        raise ValueError('Corrupt packet: Unexpected length for {0} '
+                         'Expected {1} (0x{1:02x}) '
+                         'but got {2} (0x{2:02x})'.format(
+                             Registry.lookup(identifier), length,
+                             len(data) - start))
+    cls = Registry.lookup(identifier)
+    if cls is None:
+        return bytes(data[start:end]), end
+    return cls.decode_python(data[start:end]), end
+
+
+def tlv_offsets(data):
+    # type: (Union[bytes, memoryview]) -> List[int]
+    """
+    Scans over the consecutive TLV values in *data* and returns the offsets at
+    which each value starts. Only the type and length octets are inspected,
+    the values themselves are not decoded.
+
+    Example::
+
+        >>> tlv_offsets(b'\\x02\\x01\\x05\\x04\\x03foo\\x05\\x00')
+        [0, 3, 8]
+    """
+    output = []
+    offset = 0
+    total = len(data)
+    while offset < total:
+        output.append(offset)
+        length, start = decode_length_at(data, offset + 1)
+        offset = start + length
+    if offset > total:
+        raise ValueError('Corrupt packet: The last value in the sequence '
+                         'expects %d more octets than available!' % (
+                             offset - total))
+    return output
+
 
 def pop_tlv(data):
     """
@@ -92,23 +239,15 @@ def pop_tlv(data):
 
     Note that in the example above, ``\\x11`` is the remainder of the bytes
     object after popping of the integer object.
+
+    This is a thin wrapper around :py:func:`~.decode_tlv` which should be
+    preferred when decoding multiple consecutive values from one buffer.
     """
     # TODO: This function should be moved to another module (util maybe?).
     if not data:
         return Null(), b''
-    type_ = TypeInfo.from_bytes(data[0])
-    length, remainder = decode_length(data[1:])
-
-    # determine how many octets are used to encode the length!
-    offset = len(data) - len(remainder)
-    chunk = data[:length+offset]
-    try:
-        cls = Registry.get(type_.cls, type_.tag)
-        value = cls.from_bytes(chunk)
-    except KeyError:
-        # Add context information
-        value = UnknownType.from_bytes(chunk)
-    return value, remainder[length:]
+    value, offset = decode_tlv(memoryview(data))
+    return value, data[offset:]
 
 
 @six.add_metaclass(Registry)
@@ -116,8 +255,13 @@ class Type(object):
     """
     The superclass for all supported types.
     """
+    __slots__ = ('value',)
     TYPECLASS = TypeInfo.UNIVERSAL
     TAG = 0
+    #: The :py:mod:`array` type code used to store values of this type in
+    #: columns (see :py:mod:`puresnmp.columnar`). ``None`` for non-numeric
+    #: types.
+    ARRAY_TYPECODE = None  # type: Optional[str]
 
     @classmethod
     def validate(cls, data):
@@ -126,8 +270,9 @@ class Type(object):
         this object. If not, raises a ValueError.
         """
         # TODO: Making this function return a boolean instead of raising an exception would make the code potentially more readable.
-        tinfo = TypeInfo.from_bytes(data[0])
-        if tinfo.cls != cls.TYPECLASS or tinfo.tag != cls.TAG:
+        # Compare the raw octet, ignoring the primitive/constructed flag
+        if six.byte2int(data) & 0b11011111 != cls._identifier:
+            tinfo = TypeInfo.from_bytes(six.byte2int(data))
             raise ValueError('Invalid type header! '
                              'Expected a %s class with tag '
                              'ID 0x%02x, but got a %s class with '
@@ -136,22 +281,28 @@ class Type(object):
                                  six.byte2int(data)))
 
     @classmethod
-    def from_bytes(cls, data):
+    def from_bytes(cls, data, lazy=False):
         """
         Given a bytes object, this method reads the type information and length
         and uses it to convert the bytes representation into a python object.
+
+        If *lazy* is true, nested values are only decoded when accessed. See
+        :py:meth:`~.decode_lazy`.
         """
 
         if not data:
             return Null()
         cls.validate(data)
-        expected_length, data = decode_length(data[1:])
-        if len(data) != expected_length:
+        data = memoryview(data)
+        expected_length, offset = decode_length_at(data, 1)
+        if len(data) - offset != expected_length:
             raise ValueError('Corrupt packet: Unexpected length for {0} '
                              'Expected {1} (0x{1:02x}) '
                              'but got {2} (0x{2:02x})'.format(
-                                 cls, expected_length, len(data)))
-        return cls.decode(data)
+                                 cls, expected_length, len(data) - offset))
+        if lazy:
+            return cls.decode_lazy(data[offset:])
+        return cls.decode(data[offset:])
 
     @classmethod
     def decode(cls, data):  # pragma: no cover
@@ -160,11 +311,37 @@ class Type(object):
         of the object. That means, the octets *without* the type information
         and length.
 
+        *data* may be a :py:class:`memoryview` into a larger packet (see
+        :py:func:`~.decode_tlv`). Implementations which need to keep the
+        octets around must convert them to :py:class:`bytes` first.
+
         This function must be overridden by the concrete subclasses.
         """
         raise NotImplementedError(
             'Decoding is not yet implemented on %s' % cls)
 
+    @classmethod
+    def decode_lazy(cls, data):
+        """
+        Same as :py:meth:`~.decode`, but types containing nested values may
+        defer decoding those values until they are accessed.
+
+        By default this simply delegates to :py:meth:`~.decode`.
+        """
+        return cls.decode(data)
+
+    @classmethod
+    def decode_python(cls, data):
+        """
+        Converts the raw content octets *data* directly into a pure Python
+        object. This must return the same value as calling
+        :py:meth:`~.pythonize` on the result of :py:meth:`~.decode`.
+
+        By default this does exactly that. Simple types override this to avoid
+        creating an intermediate instance.
+        """
+        return cls.decode(data).pythonize()
+
     def __bytes__(self):  # pragma: no cover
         """
         Convert this instance into a bytes object. This must be implemented by
@@ -172,6 +349,18 @@ class Type(object):
         """
         raise NotImplementedError('Not yet implemented')
 
+    def encode_into(self, buffer):
+        # type: (bytearray) -> None
+        """
+        Appends the encoded representation of this instance to *buffer*.
+
+        By default this appends the output of :py:meth:`~.__bytes__`.
+        Subclasses may override this to write directly into the buffer. This
+        allows a complete message to be encoded into one (reusable)
+        :py:class:`bytearray` without intermediate bytes objects.
+        """
+        buffer.extend(to_bytes(self))
+
     def __repr__(self):
         # pylint: disable=no-member
         return '%s(%r)' % (self.__class__.__name__, self.value)
@@ -213,6 +402,7 @@ class UnknownType(Type):
       details.
     * ``length``: The length of the value.
     """
+    __slots__ = ('tag', 'length')
 
     def __init__(self, tag, value):
         self.value = value
@@ -241,13 +431,14 @@ class UnknownType(Type):
         if not data:
             return Null()
         tag = six.byte2int(data)
-        expected_length, data = decode_length(data[1:])
-        if len(data) != expected_length:
+        expected_length, offset = decode_length_at(data, 1)
+        if len(data) - offset != expected_length:
             raise ValueError('Corrupt packet: Unexpected length for {0} '
                              'Expected {1} (0x{1:02x}) '
                              'but got {2} (0x{2:02x})'.format(
-                                 UnknownType, expected_length, len(data)))
-        return UnknownType(tag, data)
+                                 UnknownType, expected_length,
+                                 len(data) - offset))
+        return UnknownType(tag, bytes(data[offset:]))
 
 
 class NonASN1Type(UnknownType):  # pragma: no cover
@@ -258,6 +449,7 @@ class NonASN1Type(UnknownType):  # pragma: no cover
 
 
 class Boolean(Type):
+    __slots__ = ()
     TAG = 0x01
 
     @staticmethod
@@ -283,7 +475,20 @@ class Boolean(Type):
 
 
 class Null(Type):
+    """
+    The X.690 NULL type. There is only ever one instance of this class, so
+    ``Null()`` is cheap.
+    """
+    __slots__ = ()
     TAG = 0x05
+    __instance = None  # type: Optional[Null]
+
+    def __new__(cls):
+        if cls is not Null:
+            return super(Null, cls).__new__(cls)
+        if Null.__instance is None:
+            Null.__instance = super(Null, cls).__new__(cls)
+        return Null.__instance
 
     def __init__(self):
         self.value = None
@@ -299,9 +504,16 @@ class Null(Type):
     def decode(cls, data):
         return Null()
 
+    @classmethod
+    def decode_python(cls, data):
+        return None
+
     def __bytes__(self):
         return b'\x05\x00'
 
+    def encode_into(self, buffer):
+        buffer.extend(b'\x05\x00')
+
     def __eq__(self, other):
         # pylint: disable=unidiomatic-typecheck
         return type(self) == type(other)
@@ -317,22 +529,38 @@ class Null(Type):
 
 
 class OctetString(Type):
+    __slots__ = ()
     TAG = 0x04
 
     @classmethod
     def decode(cls, data):
-        return cls(data)
+        return cls(bytes(data))
+
+    @classmethod
+    def decode_python(cls, data):
+        return bytes(data)
 
     def __init__(self, value):
         if isinstance(value, unicode):
             self.value = value.encode('ascii')
         else:
             self.value = value
-        self.length = encode_length(len(self.value))
+
+    @property
+    def length(self):
+        # type: () -> bytes
+        """
+        The encoded length of the value.
+        """
+        return encode_length(len(self.value))
 
     def __bytes__(self):
-        tinfo = TypeInfo(self.TYPECLASS, TypeInfo.PRIMITIVE, self.TAG)
-        return to_bytes(tinfo) + self.length + self.value
+        return to_bytes([self._identifier]) + self.length + self.value
+
+    def encode_into(self, buffer):
+        buffer.append(self._identifier)
+        buffer.extend(self.length)
+        buffer.extend(self.value)
 
     def __eq__(self, other):
         # pylint: disable=unidiomatic-typecheck
@@ -349,27 +577,64 @@ class Sequence(Type):
     """
     Represents an X.690 sequence type. Instances of this class are iterable and
     indexable.
+
+    Sequences created via :py:meth:`~.decode_lazy` only know where their
+    values are located in the original packet. Each value is decoded on first
+    access and cached afterwards.
     """
+    __slots__ = ('_items', '_data', '_offsets')
     TAG = 0x10
 
     @classmethod
     def decode(cls, data):
+        data = memoryview(data)
+        end = len(data)
+        offset = 0
         output = []
-        while data:
-            value, data = pop_tlv(data)
+        while offset < end:
+            value, offset = decode_tlv(data, offset)
             output.append(value)
         return Sequence(*output)
 
+    @classmethod
+    def decode_lazy(cls, data):
+        """
+        Overrides :py:meth:`.Type.decode_lazy`.
+        """
+        # pylint: disable=protected-access
+        data = memoryview(data)
+        output = Sequence()
+        output._data = data
+        output._offsets = tlv_offsets(data)
+        output._items = [None] * len(output._offsets)
+        return output
+
     def __init__(self, *items):
-        self.items = items
+        self._items = items
+        self._data = None  # type: Union[memoryview, None]
+        self._offsets = None  # type: Union[List[int], None]
+
+    @property
+    def items(self):
+        # type: () -> Tuple[Type, ...]
+        """
+        A tuple of all values in this sequence.
+        """
+        if self._offsets is None:
+            return self._items
+        return tuple(self)
 
     def __bytes__(self):
-        output = [to_bytes(item) for item in self]
-        output = b''.join(output)
-        length = encode_length(len(output))
-        tinfo = TypeInfo(TypeInfo.UNIVERSAL, TypeInfo.CONSTRUCTED,
-                         Sequence.TAG)
-        return to_bytes(tinfo) + length + output
+        buffer = bytearray()
+        self.encode_into(buffer)
+        return bytes(buffer)
+
+    def encode_into(self, buffer):
+        buffer.append(Sequence._identifier | 0b00100000)
+        position = reserve_length(buffer)
+        for item in self:
+            item.encode_into(buffer)
+        patch_length(buffer, position)
 
     def __eq__(self, other):
         # pylint: disable=unidiomatic-typecheck
@@ -379,11 +644,24 @@ class Sequence(Type):
         item_repr = [repr(item) for item in self]
         return 'Sequence(%s)' % ', '.join(item_repr)
 
+    def __len__(self):
+        return len(self._items)
+
     def __iter__(self):
-        return iter(self.items)
+        if self._offsets is None:
+            return iter(self._items)
+        return (self[idx] for idx in range(len(self._items)))
 
     def __getitem__(self, idx):
-        return self.items[idx]
+        if self._offsets is None:
+            return self._items[idx]
+        if isinstance(idx, slice):
+            return tuple(self[i] for i in range(*idx.indices(len(self))))
+        item = self._items[idx]
+        if item is None:
+            item, _ = decode_tlv(self._data, self._offsets[idx], lazy=True)
+            self._items[idx] = item
+        return item
 
     def pythonize(self):
         return [obj.pythonize() for obj in self]
@@ -399,36 +677,53 @@ class Sequence(Type):
 
 
 class Integer(Type):
+    """
+    Represents an X.690 integer.
+
+    Decoded values between ``0`` and :py:data:`~.SMALL_INTEGER_LIMIT`
+    (exclusive) are shared instances if ``CACHE_SMALL_VALUES`` is true on the
+    class. Those values are mostly enumerations (f.ex. ifOperStatus) or
+    counters at zero. Shared instances must not be modified.
+    """
+    __slots__ = ()
     TAG = 0x02
+    CACHE_SMALL_VALUES = True
+    ARRAY_TYPECODE = 'q'
 
     @classmethod
     def decode(cls, data):
-        return cls(int_from_bytes(data, 'big', signed=True))
+        value = int_from_bytes(data, 'big', signed=True)
+        if 0 <= value < SMALL_INTEGER_LIMIT and cls.CACHE_SMALL_VALUES:
+            try:
+                return _SMALL_INTEGERS[cls][value]
+            except KeyError:
+                cache = [cls(i) for i in range(SMALL_INTEGER_LIMIT)]
+                _SMALL_INTEGERS[cls] = cache
+                return cache[value]
+        return cls(value)
+
+    @classmethod
+    def decode_python(cls, data):
+        return int_from_bytes(data, 'big', signed=True)
 
     def __init__(self, value):
         self.value = value
 
     def __bytes__(self):
-        octets = [self.value & 0b11111111]
-
-        # Append remaining octets for long integers.
-        remainder = self.value
-        while remainder not in (0, -1):
-            remainder = remainder >> 8
-            octets.append(remainder & 0b11111111)
-
-        if remainder == 0 and octets[-1] == 0b10000000:
-            octets.append(0)
-        octets.reverse()
-
-        # remove leading octet if there is a string of 9 zeros or ones
-        while (len(octets) > 1 and
-               ((octets[0] == 0 and octets[1] & 0b10000000 == 0) or
-                (octets[0] == 0b11111111 and octets[1] & 0b10000000 != 0))):
-            del octets[0]
-
-        tinfo = TypeInfo(self.TYPECLASS, TypeInfo.PRIMITIVE, self.TAG)
-        return to_bytes(tinfo) + to_bytes([len(octets)]) + to_bytes(octets)
+        buffer = bytearray()
+        self.encode_into(buffer)
+        return bytes(buffer)
+
+    def encode_into(self, buffer):
+        value = self.value
+        # Minimal two's complement length (including the sign bit)
+        if value < 0:
+            length = (~value).bit_length() // 8 + 1
+        else:
+            length = value.bit_length() // 8 + 1
+        buffer.append(self._identifier)
+        buffer.append(length)
+        buffer.extend(int_to_bytes(value, length, 'big', signed=True))
 
     def __eq__(self, other):
         # pylint: disable=unidiomatic-typecheck
@@ -447,7 +742,13 @@ class ObjectIdentifier(Type):
 
         >>> ObjectIdentifier(1, 2, 4, 5, 6) in ObjectIdentifier(1, 2, 3)
         False
+
+    Internally, an OID only stores its BER encoded content octets. The tuple of
+    nodes (see :py:attr:`~.identifiers`) is computed on first access. OIDs
+    decoded from the network which are only compared, hashed or re-encoded
+    never need to be split into their nodes.
     """
+    __slots__ = ('_content', '_nodes')
     TAG = 0x06
 
     @staticmethod
@@ -484,36 +785,42 @@ class ObjectIdentifier(Type):
 
     @classmethod
     def decode(cls, data):
+        # "0.0" and "0" share the same encoding. Keep returning both nodes
+        # for backwards compatibility.
+        if data == b'\x00':
+            return ObjectIdentifier(0, 0)
+        if data and six.indexbytes(data, len(data)-1) > 127:
+            raise ValueError('Corrupt OID: The last sub-identifier in %r is '
+                             'not terminated!' % bytes(data))
+        return ObjectIdentifier.from_content(bytes(data))
 
-        # Special case for "empty" object identifiers which should be returned
-        # as "0"
-        if not data:
-            return ObjectIdentifier(0)
-
-        # unpack the first byte into first and second sub-identifiers.
-        data0 = six.byte2int(data)
-        first, second = data0 // 40, data0 % 40
-        output = [first, second]
+    @staticmethod
+    def from_content(content):
+        # type: (bytes) -> ObjectIdentifier
+        """
+        Creates a new OID directly from the BER content octets *content* (the
+        encoded value *without* type and length information). The nodes are
+        only decoded when needed.
 
-        remaining = six.iterbytes(data[1:])
+        Example::
 
-        for char in remaining:
-            # Each node can only contain values from 0-127. Other values need
-            # to be combined.
-            if char > 127:
-                collapsed_value = ObjectIdentifier.decode_large_value(
-                    char, remaining)
-                output.append(collapsed_value)
-                continue
-            output.append(char)
-
-        return ObjectIdentifier(*output)
+            >>> ObjectIdentifier.from_content(b'\\x2b\\x06\\x01')
+            ObjectIdentifier((1, 3, 6, 1))
+        """
+        output = ObjectIdentifier.__new__(ObjectIdentifier)
+        output._content = content
+        output._nodes = None
+        return output
 
     @staticmethod
     def from_string(value):
         # type: (str) -> ObjectIdentifier
         """
         Create an OID from a string
+
+        Parsed values are kept in a bounded cache (see
+        :py:data:`~.OID_CACHE_SIZE`). Parsing the same string again returns
+        the *same* instance, so OIDs must be treated as immutable.
         """
 
         if not isinstance(value, six.string_types):
@@ -525,8 +832,7 @@ class ObjectIdentifier(Type):
         if isinstance(value, str) and value.startswith('.'):
             value = value[1:]
 
-        identifiers = [int(ident, 10) for ident in value.split('.')]
-        return ObjectIdentifier(*identifiers)
+        return _parse_oid(value)
 
     def __init__(self, *identifiers):
         # pylint: disable=line-too-long
@@ -547,21 +853,62 @@ class ObjectIdentifier(Type):
 
         # Values above 127 need a special encoding. They get split up into
         # multiple positions.
-        exploded_high_values = []
-        for char in rest:
-            if char > 127:
-                exploded_high_values.extend(
-                    ObjectIdentifier.encode_large_value(char))
-            else:
-                exploded_high_values.append(char)
-
-        self.identifiers = tuple(identifiers)
-        collapsed_identifiers = [first_output]
+        collapsed_identifiers = ObjectIdentifier.encode_large_value(
+            first_output)
         for subidentifier in rest:
             collapsed_identifiers.extend(
                 ObjectIdentifier.encode_large_value(subidentifier))
-        self.__collapsed_identifiers = tuple(collapsed_identifiers)
-        self.length = encode_length(len(self.__collapsed_identifiers))
+
+        self._nodes = tuple(identifiers)
+        if collapsed_identifiers == [0]:
+            # "0" and "0.0" are encoded without content octets
+            self._content = b''
+        else:
+            self._content = to_bytes(collapsed_identifiers)
+
+    @property
+    def identifiers(self):
+        # type: () -> Tuple[int, ...]
+        """
+        The nodes of this OID as tuple of integers.
+        """
+        if self._nodes is None:
+            self._nodes = self.__decode_nodes(self._content)
+        return self._nodes
+
+    @property
+    def length(self):
+        # type: () -> bytes
+        """
+        The encoded length of the content octets.
+        """
+        return encode_length(len(self._content))
+
+    @staticmethod
+    def __decode_nodes(content):
+        # type: (bytes) -> Tuple[int, ...]
+        # Special case for "empty" object identifiers which should be returned
+        # as "0"
+        if not content:
+            return (0,)
+
+        output = []
+        remaining = six.iterbytes(content)
+        for char in remaining:
+            # Each node can only contain values from 0-127. Other values need
+            # to be combined.
+            if char > 127:
+                char = ObjectIdentifier.decode_large_value(char, remaining)
+            output.append(char)
+
+        # unpack the first value into first and second sub-identifiers.
+        data0 = output[0]
+        if data0 > 127:
+            # Only the "2" arc can contain a large second node
+            output[0:1] = [2, data0 - 80]
+        else:
+            output[0:1] = [data0 // 40, data0 % 40]
+        return tuple(output)
 
     def __int__(self):
         if len(self.identifiers) != 1:
@@ -571,12 +918,7 @@ class ObjectIdentifier(Type):
 
     if six.PY2:  # pragma: no cover
         def __str__(self):
-            output = to_bytes([self.TAG])
-            if self.__collapsed_identifiers == (0,):
-                output += b'\x00'
-            else:
-                output += self.length + to_bytes(self.__collapsed_identifiers)
-            return output
+            return to_bytes([self.TAG]) + self.length + self._content
 
         def __unicode__(self):
             return '.'.join([unicode(_) for _ in self.identifiers])
@@ -585,12 +927,12 @@ class ObjectIdentifier(Type):
             return '.'.join([unicode(_) for _ in self.identifiers])
 
         def __bytes__(self):
-            output = to_bytes([self.TAG])
-            if self.__collapsed_identifiers == (0,):
-                output += b'\x00'
-            else:
-                output += self.length + to_bytes(self.__collapsed_identifiers)
-            return output
+            return to_bytes([self.TAG]) + self.length + self._content
+
+    def encode_into(self, buffer):
+        buffer.append(self._identifier)
+        buffer.extend(self.length)
+        buffer.extend(self._content)
 
     def __repr__(self):
         return 'ObjectIdentifier(%r)' % (self.identifiers, )
@@ -598,56 +940,42 @@ class ObjectIdentifier(Type):
     def __eq__(self, other):
         # pylint: disable=unidiomatic-typecheck, protected-access
         return (type(self) == type(other) and
-                self.__collapsed_identifiers == other.__collapsed_identifiers)
+                self._content == other._content)
 
     def __len__(self):
         return len(self.identifiers)
 
-    def __contains__(self, other):
+    def startswith(self, prefix):
+        # type: (ObjectIdentifier) -> bool
         """
-        Check if one OID is a child of another.
+        Returns ``True`` if this OID starts with all the nodes of *prefix*
+        (or is equal to it)::
 
-        TODO: This has been written in the middle of the night! It's messy...
+            >>> ObjectIdentifier(1, 2, 3, 4).startswith(ObjectIdentifier(1, 2))
+            True
         """
-        # pylint: disable=invalid-name
-
-        a, b = other.identifiers, self.identifiers
-
-        # if both have the same amount of identifiers, check for equality
-        if len(a) == len(b):
-            return a == b
-
-        # if "self" is longer than "other", self cannot be "in" other
-        if len(b) > len(a):
-            return False
-
-        # For all other cases:
-        #   1. zero-fill
-        #   2. drop identical items from the front (leaving us with "tail")
-        #   3. compare both tails
-        zipped = zip_longest(a, b, fillvalue=None)
-        tail = []
-        for tmp_a, tmp_b in zipped:
-            if tmp_a == tmp_b and not tail:
-                continue
-            tail.append((tmp_a, tmp_b))
+        # pylint: disable=protected-access
+        # Sub-identifiers are self-delimiting, so as long as the first octet
+        # (containing the first *two* nodes) is present in both OIDs, the
+        # encoded content can be compared directly.
+        if (prefix._content and self._content and
+                (prefix._nodes is None or len(prefix._nodes) > 1) and
+                (self._nodes is None or len(self._nodes) > 1)):
+            return self._content.startswith(prefix._content)
+        prefix_nodes = prefix.identifiers
+        return self.identifiers[:len(prefix_nodes)] == prefix_nodes
 
-        # if we only have Nones in "b", we know that "a" was longer and that it
-        # is a direct subtree of "b" (no diverging nodes). Otherwise we would
-        # have te divergence in "b", and we can say that "b is contained in a"
-        _, unzipped_b = zip(*tail)
-        if all([x is None for x in unzipped_b]):
-            return True
-
-        # In all other cases we end up with an unmatching tail and know that "b
-        # is not contained in a".
-        return False
+    def __contains__(self, other):
+        """
+        Check if one OID is a child of another.
+        """
+        return other.startswith(self)
 
     def __lt__(self, other):
         return self.identifiers < other.identifiers
 
     def __hash__(self):
-        return hash(self.identifiers)
+        return hash(self._content)
 
     def __add__(self, other):
         nodes = self.identifiers + other.identifiers
@@ -660,6 +988,22 @@ class ObjectIdentifier(Type):
         return '.'.join([unicode(_) for _ in self.identifiers])
 
 
+def _parse_oid(value):
+    # type: (str) -> ObjectIdentifier
+    """
+    Converts a dotted OID string (without leading dot) into an
+    :py:class:`~.ObjectIdentifier`.
+
+    This is wrapped in a thread-safe LRU cache below.
+    """
+    identifiers = [int(ident, 10) for ident in value.split('.')]
+    return ObjectIdentifier(*identifiers)
+
+
+if lru_cache is not None:
+    _parse_oid = lru_cache(maxsize=OID_CACHE_SIZE)(_parse_oid)
+
+
 class ObjectDescriptor(Type):
     TAG = 0x07
 
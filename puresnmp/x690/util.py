@@ -35,10 +35,22 @@ if six.PY2:  # pragma: no cover
             n -= 1 << 8*len(little_ordered)
         return n
 
+    def int_to_bytes(value, length, byteorder, signed=False):
+        if signed and value < 0:
+            value += 1 << 8*length
+        output = bytearray(length)
+        for i in range(length):
+            output[length-1-i] = value & 0xff
+            value >>= 8
+        if byteorder == 'little':
+            output.reverse()
+        return bytes(output)
+
 else:
     # pylint: disable=invalid-name
     unicode = str
     int_from_bytes = int.from_bytes
+    int_to_bytes = int.to_bytes
 
     def to_bytes(x):
         try:
@@ -189,6 +201,40 @@ def encode_length(value):
     return to_bytes(output)
 
 
+def reserve_length(buffer):
+    # type: ( bytearray ) -> int
+    """
+    Appends a placeholder for a length octet to *buffer* and returns its
+    position. Once the content octets have been appended, the placeholder is
+    replaced with the real length by calling :py:func:`~.patch_length`.
+
+    This makes it possible to encode nested values directly into one buffer
+    without knowing their length up-front::
+
+        >>> buffer = bytearray(b'\\x30')
+        >>> position = reserve_length(buffer)
+        >>> buffer.extend(b'\\x05\\x00')
+        >>> patch_length(buffer, position)
+        >>> buffer
+        bytearray(b'0\\x02\\x05\\x00')
+    """
+    buffer.append(0)
+    return len(buffer) - 1
+
+
+def patch_length(buffer, position):
+    # type: ( bytearray, int ) -> None
+    """
+    Replaces the placeholder written by :py:func:`~.reserve_length` at
+    *position* with the encoded length of all octets following it.
+    """
+    length = len(buffer) - position - 1
+    if length < 127:
+        buffer[position] = length
+    else:
+        buffer[position:position+1] = encode_length(length)
+
+
 def decode_length(data):
     # type: ( bytes ) -> LengthValue
     """
@@ -217,25 +263,42 @@ def decode_length(data):
     TODO: Upon rereading this, I wonder if it would not make more sense to take
           the complete TLV content as input.
     """
-    data0 = six.byte2int(data)
+    length, offset = decode_length_at(data)
+    return LengthValue(length, data[offset:])
+
+
+def decode_length_at(data, offset=0):
+    # type: ( Union[bytes, memoryview], int ) -> Tuple[int, int]
+    """
+    Offset-based variant of :py:func:`~.decode_length`. Parses the length
+    octets starting at position *offset* in *data* and returns a tuple
+    containing the decoded length and the offset of the first content octet.
+
+    Contrary to :py:func:`~.decode_length`, *data* is never sliced, so this can
+    be used to walk over a large buffer (for example a :py:class:`memoryview`)
+    without copying it.
+
+    Example::
+
+        >>> decode_length_at(b'\\x30\\x81\\xc8...', 1)
+        (200, 3)
+    """
+    data0 = six.indexbytes(data, offset)
     if data0 == 0b11111111:
         # reserved
         raise NotImplementedError('This is a reserved case in X690')
     elif data0 & 0b10000000 == 0:
         # definite short form
-        output = int_from_bytes([data0], 'big')
-        data = data[1:]
+        return data0, offset + 1
     elif data0 ^ 0b10000000 == 0:
         # indefinite form
         raise NotImplementedError('Indefinite lenghts are '
                                   'not yet implemented!')
-    else:
-        # definite long form
-        num_octets = int_from_bytes([data0 ^ 0b10000000], 'big')
-        value_octets = data[1:1+num_octets]
-        output = int_from_bytes(value_octets, 'big')
-        data = data[num_octets + 1:]
-    return LengthValue(output, data)
+    # definite long form
+    num_octets = data0 ^ 0b10000000
+    start = offset + 1
+    output = int_from_bytes(data[start:start+num_octets], 'big')
+    return output, start + num_octets
 
 
 def visible_octets(data):
@@ -24,7 +24,10 @@ DEPENDENCIES = [
 ]
 if version_info < (3, 5):
     DEPENDENCIES.append('typing')
+if version_info < (3, 4):
+    DEPENDENCIES.append('selectors34')
 if version_info < (3, 3):
+    DEPENDENCIES.append('futures')
     DEPENDENCIES.append('ipaddress')
     DEPENDENCIES.append('mock')
 